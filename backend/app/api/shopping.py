@@ -224,6 +224,8 @@ async def search_by_image(
         # Boost scores based on prototype similarity
         if prototype_service.prototypes:
             print("  [PROTOTYPE] Applying prototype-based boosting...")
+            # Closest prototype depends only on the query: compute it once
+            closest = prototype_service.find_closest_prototype(image_embedding, top_k=1)
             for result in market_results:
                 payload = result["payload"]
                 base_score = result.get("final_score", result.get("score", 0))
@@ -233,7 +235,8 @@ async def search_by_image(
                     query_embedding=image_embedding,
                     product_category=payload.get("category", "unknown"),
                     product_brand=payload.get("brand", "unknown"),
-                    base_score=base_score
+                    base_score=base_score,
+                    closest=closest
                 )
                 
                 result["final_score"] = boosted_score
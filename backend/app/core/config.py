@@ -25,6 +25,7 @@ class Settings(BaseSettings):
     
     # Embedding (SigLIP for images only)
     CLIP_DIMENSION: int = 768  # SigLIP base produces 768-dimensional embeddings
+    SIGLIP_COMPILE: bool = False  # torch.compile the vision forward (CUDA only, slow first call)
     
     # MMR Configuration
     MMR_DIVERSITY_SCORE: float = 0.5
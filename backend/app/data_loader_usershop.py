@@ -1,6 +1,6 @@
 import pandas as pd
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 from .models_usershop import Product
 from .utils_usershop import normalize_price_display
 import os
@@ -8,9 +8,78 @@ import glob
 
 logger = logging.getLogger(__name__)
 
+REQUIRED_COLUMNS = ['url', 'name', 'category', 'brand', 'img', 'description', 'price']
+# Lignes lues par bloc : seul un bloc de DataFrame est en mémoire à la fois
+CSV_CHUNK_ROWS = 5000
+
 class DataLoader:
     """Classe pour charger et traiter les données CSV avec optimisation"""
     
+    @staticmethod
+    def iter_product_batches(file_path: str, stats: Dict[str, Any] = None, chunk_rows: int = CSV_CHUNK_ROWS) -> Iterator[List[Product]]:
+        """
+        Lit le CSV par blocs de chunk_rows lignes et produit des listes de Product
+        (nettoyage et dédoublonnage sur tout le fichier, mémoire O(bloc))
+        """
+        if stats is None:
+            stats = {"total_rows": 0, "invalid_rows": 0, "duplicates_removed": 0}
+        seen = set()  # (name, brand) déjà rencontrés dans les blocs précédents
+        
+        # Lecteur fermé avec le générateur (close() ou fin) : le fichier est libéré
+        with pd.read_csv(file_path, sep=',', chunksize=chunk_rows) as reader:
+            for chunk in reader:
+                # Validation des colonnes
+                missing_columns = [col for col in REQUIRED_COLUMNS if col not in chunk.columns]
+                if missing_columns:
+                    raise ValueError(f"Colonnes manquantes: {missing_columns}")
+                stats["total_rows"] += len(chunk)
+            
+                # Supprimer les lignes avec des valeurs manquantes dans les colonnes critiques
+                initial_count = len(chunk)
+                chunk = chunk.dropna(subset=['name', 'category', 'description'])
+                stats["invalid_rows"] += initial_count - len(chunk)
+            
+                # Remplir les valeurs manquantes non critiques
+                chunk = chunk.fillna({
+                    'url': '',
+                    'brand': 'Non spécifié',
+                    'img': '',
+                    'price': 'Prix non disponible'
+                })
+            
+                # Doublons dans le bloc, puis avec les blocs précédents
+                before_dedup = len(chunk)
+                chunk = chunk.drop_duplicates(subset=['name', 'brand'], keep='first')
+                keys = list(zip(chunk['name'], chunk['brand']))
+                chunk = chunk[[key not in seen for key in keys]]
+                seen.update(keys)
+                stats["duplicates_removed"] += before_dedup - len(chunk)
+            
+                # Descriptions limitées à 500 caractères
+                chunk = chunk.assign(description=chunk['description'].str.strip().str[:500])
+            
+                # Conversion en objets Product (itertuples : pas de Series par ligne)
+                products = []
+                for row in chunk[REQUIRED_COLUMNS].itertuples():
+                    try:
+                        product = Product(
+                            url=str(row.url).strip(),
+                            name=str(row.name).strip(),
+                            category=str(row.category).strip(),
+                            brand=str(row.brand).strip(),
+                            img=str(row.img).strip(),
+                            description=str(row.description).strip(),
+                            # Normaliser le prix pour affichage en TND
+                            price=normalize_price_display(str(row.price).strip())
+                        )
+                        products.append(product)
+                    except Exception as e:
+                        logger.warning(f"Erreur ligne {row.Index}: {e}")
+                        continue
+            
+                if products:
+                    yield products
+    
     @staticmethod
     def load_products_from_csv(file_path: str) -> tuple[List[Product], Dict[str, Any]]:
         """
@@ -26,78 +95,17 @@ class DataLoader:
         }
         
         try:
-            # Étape 1: Lecture du fichier
-            stats["steps"].append("📖 Lecture du fichier CSV...")
+            stats["steps"].append(f"📖 Lecture du fichier CSV (blocs de {CSV_CHUNK_ROWS} lignes)...")
             logger.info(f"Lecture du fichier: {file_path}")
             
-            df = pd.read_csv(file_path, sep=',')
-            stats["total_rows"] = len(df)
-            stats["steps"].append(f"✅ {stats['total_rows']} lignes lues")
-            
-            # Étape 2: Validation des colonnes
-            stats["steps"].append("🔍 Validation des colonnes...")
-            required_columns = ['url', 'name', 'category', 'brand', 'img', 'description', 'price']
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            
-            if missing_columns:
-                raise ValueError(f"Colonnes manquantes: {missing_columns}")
-            
-            stats["steps"].append(f"✅ Toutes les colonnes requises présentes")
-            
-            # Étape 3: Nettoyage des données
-            stats["steps"].append("🧹 Nettoyage des données...")
-            initial_count = len(df)
-            
-            # Supprimer les lignes avec des valeurs manquantes dans les colonnes critiques
-            df = df.dropna(subset=['name', 'category', 'description'])
-            stats["invalid_rows"] = initial_count - len(df)
-            
-            # Remplir les valeurs manquantes non critiques
-            df = df.fillna({
-                'url': '',
-                'brand': 'Non spécifié',
-                'img': '',
-                'price': 'Prix non disponible'
-            })
+            products = []
+            for batch in DataLoader.iter_product_batches(file_path, stats):
+                products.extend(batch)
             
+            stats["steps"].append(f"✅ {stats['total_rows']} lignes lues, colonnes requises présentes")
             stats["steps"].append(f"✅ {stats['invalid_rows']} lignes invalides supprimées")
-            
-            # Étape 4: Suppression des doublons
-            stats["steps"].append("🔄 Suppression des doublons...")
-            before_dedup = len(df)
-            df = df.drop_duplicates(subset=['name', 'brand'], keep='first')
-            stats["duplicates_removed"] = before_dedup - len(df)
             stats["steps"].append(f"✅ {stats['duplicates_removed']} doublons supprimés")
             
-            # Étape 5: Optimisation des descriptions
-            stats["steps"].append("⚡ Optimisation des descriptions...")
-            df['description'] = df['description'].str.strip()
-            df['description'] = df['description'].str[:500]  # Limiter à 500 caractères
-            stats["steps"].append("✅ Descriptions optimisées")
-            
-            # Étape 6: Conversion en objets Product
-            stats["steps"].append("📦 Création des objets produits...")
-            products = []
-            
-            for _, row in df.iterrows():
-                try:
-                    # Normaliser le prix pour affichage en TND
-                    price_display = normalize_price_display(str(row['price']).strip())
-                    
-                    product = Product(
-                        url=str(row['url']).strip(),
-                        name=str(row['name']).strip(),
-                        category=str(row['category']).strip(),
-                        brand=str(row['brand']).strip(),
-                        img=str(row['img']).strip(),
-                        description=str(row['description']).strip(),
-                        price=price_display  # Prix normalisé en TND
-                    )
-                    products.append(product)
-                except Exception as e:
-                    logger.warning(f"Erreur ligne {row.name}: {e}")
-                    continue
-            
             stats["valid_products"] = len(products)
             stats["steps"].append(f"✅ {stats['valid_products']} produits créés avec succès")
             
@@ -168,13 +176,24 @@ class DataLoader:
             global_stats["steps"].append(f"❌ Erreur: {str(e)}")
             raise
     
+    @staticmethod
+    def iter_directory_batches(directory: str = "data") -> Iterator[List[Product]]:
+        """
+        Parcourt les CSV d'un dossier bloc par bloc (chargement au démarrage
+        sans matérialiser tout le catalogue en mémoire)
+        """
+        for csv_file in sorted(glob.glob(os.path.join(directory, "*.csv"))):
+            try:
+                yield from DataLoader.iter_product_batches(csv_file)
+            except Exception as e:
+                logger.error(f"Erreur avec {os.path.basename(csv_file)}: {e}")
+    
     @staticmethod
     def validate_csv_format(file_path: str) -> bool:
         """Valide le format du fichier CSV"""
         try:
             df = pd.read_csv(file_path, sep=',', nrows=1)
-            required_columns = ['url', 'name', 'category', 'brand', 'img', 'description', 'price']
-            return all(col in df.columns for col in required_columns)
+            return all(col in df.columns for col in REQUIRED_COLUMNS)
         except Exception as e:
             logger.error(f"Erreur lors de la validation du CSV: {e}")
             return False
@@ -1,5 +1,5 @@
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
+from qdrant_client.models import Distance, VectorParams, PointStruct, OptimizersConfigDiff
 from fastembed import TextEmbedding
 import pandas as pd
 import uuid
@@ -8,10 +8,20 @@ from .config_usershop import settings
 from .models_usershop import Product
 import logging
 from functools import lru_cache
+from contextlib import asynccontextmanager
 import asyncio
 
 logger = logging.getLogger(__name__)
 
+# Upload Qdrant : lots moyens envoyés à la suite (parallel > 1 lancerait un
+# pool de processus à chaque appel)
+UPLOAD_BATCH_SIZE = 256
+UPLOAD_PARALLEL = 1
+UPLOAD_MAX_RETRIES = 3
+# Seuil d'indexation HNSW par défaut de Qdrant (Ko), utilisé si la collection
+# n'en déclare pas (ou est restée à 0 après un chargement interrompu)
+DEFAULT_INDEXING_THRESHOLD = 20000
+
 class QdrantDatabase:
     def __init__(self):
         # Connexion à Qdrant Cloud
@@ -28,6 +38,11 @@ class QdrantDatabase:
         self.embedding_model = None
         self.collection_name = settings.QDRANT_COLLECTION_NAME
         
+        # Chargements en cours : l'indexation est coupée au premier, rétablie au dernier
+        self._bulk_loads = 0
+        self._bulk_lock = asyncio.Lock()
+        self._saved_indexing_threshold = None
+        
         logger.info(f"Connexion à Qdrant Cloud établie: {settings.QDRANT_URL}")
     
     def _get_embedding_model(self):
@@ -61,6 +76,40 @@ class QdrantDatabase:
             logger.error(f"❌ Erreur lors de l'initialisation de la collection: {e}")
             raise
     
+    def _get_indexing_threshold(self) -> int:
+        """Seuil d'indexation actuellement configuré sur la collection"""
+        info = self.client.get_collection(collection_name=self.collection_name)
+        return info.config.optimizer_config.indexing_threshold or DEFAULT_INDEXING_THRESHOLD
+    
+    def _set_indexing_threshold(self, threshold: int) -> None:
+        self.client.update_collection(
+            collection_name=self.collection_name,
+            optimizer_config=OptimizersConfigDiff(indexing_threshold=threshold)
+        )
+    
+    @asynccontextmanager
+    async def bulk_load(self):
+        """
+        Suspend l'indexation HNSW le temps d'un chargement complet
+        
+        Imbriquable et partagé entre chargements simultanés : seul le premier
+        coupe l'indexation, seul le dernier rétablit le seuil d'origine.
+        """
+        async with self._bulk_lock:
+            if self._bulk_loads == 0:
+                self._saved_indexing_threshold = await asyncio.to_thread(self._get_indexing_threshold)
+                await asyncio.to_thread(self._set_indexing_threshold, 0)
+                logger.info("⏸️ Indexation HNSW suspendue pendant le chargement")
+            self._bulk_loads += 1
+        try:
+            yield
+        finally:
+            async with self._bulk_lock:
+                self._bulk_loads -= 1
+                if self._bulk_loads == 0:
+                    await asyncio.to_thread(self._set_indexing_threshold, self._saved_indexing_threshold)
+                    logger.info(f"▶️ Indexation HNSW rétablie (seuil {self._saved_indexing_threshold})")
+    
     def create_embedding(self, text: str) -> List[float]:
         """Crée un embedding pour un texte donné avec FastEmbed"""
         model = self._get_embedding_model()
@@ -81,10 +130,19 @@ class QdrantDatabase:
         # Texte optimisé pour la recherche sémantique
         return f"{product.name} {product.brand} {product.category} {product.description[:200]}"
     
-    async def add_products(self, products: List[Product]) -> Dict[str, Any]:
+    async def add_products(
+        self,
+        products: List[Product],
+        max_retries: int = UPLOAD_MAX_RETRIES,
+        wait: bool = False
+    ) -> Dict[str, Any]:
         """
         Ajoute des produits à la base vectorielle avec optimisation batch
         Retourne des statistiques détaillées
+        
+        max_retries : essais par lot côté upload_points (qui attend aussi le
+        délai retry_after des réponses 429) ; wait=True attend que Qdrant ait
+        appliqué les points (comptage fiable juste après)
         """
         stats = {
             "total": len(products),
@@ -103,7 +161,8 @@ class QdrantDatabase:
             
             # Étape 2: Créer les embeddings en batch (optimisé)
             stats["steps"].append("🧠 Génération des embeddings (batch processing)...")
-            embeddings = self.create_embedding_batch(texts)
+            # FastEmbed (ONNX) dans un thread : la boucle continue de servir les requêtes
+            embeddings = await asyncio.to_thread(self.create_embedding_batch, texts)
             stats["steps"].append(f"✅ {len(embeddings)} embeddings générés")
             
             # Étape 3: Préparer les points pour Qdrant
@@ -122,35 +181,22 @@ class QdrantDatabase:
             
             stats["steps"].append(f"✅ {len(points)} points préparés")
             
-            # Étape 4: Upload vers Qdrant en batch avec retry
+            # Étape 4: Upload vers Qdrant, indexation HNSW suspendue pendant le chargement
+            # (sans effet si l'appelant a déjà ouvert un bulk_load pour tout le flux)
             stats["steps"].append("☁️ Upload vers Qdrant Cloud...")
-            batch_size = 50  # Réduire la taille des batches pour éviter les timeouts
-            total_batches = (len(points) - 1) // batch_size + 1
-            
-            for i in range(0, len(points), batch_size):
-                batch = points[i:i + batch_size]
-                batch_num = i // batch_size + 1
-                
-                # Retry logic
-                max_retries = 3
-                for attempt in range(max_retries):
-                    try:
-                        self.client.upsert(
-                            collection_name=self.collection_name,
-                            points=batch,
-                            wait=True  # Attendre la confirmation
-                        )
-                        stats["steps"].append(f"  ↗️ Batch {batch_num}/{total_batches} uploadé ({len(batch)} produits)")
-                        break
-                    except Exception as e:
-                        if attempt < max_retries - 1:
-                            logger.warning(f"⚠️ Erreur batch {batch_num}, tentative {attempt + 1}/{max_retries}: {e}")
-                            stats["steps"].append(f"  ⚠️ Retry batch {batch_num}...")
-                            import time
-                            time.sleep(2)  # Attendre 2 secondes avant de réessayer
-                        else:
-                            logger.error(f"❌ Échec batch {batch_num} après {max_retries} tentatives")
-                            raise
+            async with self.bulk_load():
+                # upload_points découpe en lots et réessaie lui-même chaque lot avec
+                # les mêmes ids : pas de doublons, contrairement à un nouvel add_products
+                await asyncio.to_thread(
+                    self.client.upload_points,
+                    collection_name=self.collection_name,
+                    points=points,
+                    batch_size=UPLOAD_BATCH_SIZE,
+                    parallel=UPLOAD_PARALLEL,
+                    max_retries=max_retries,
+                    wait=wait  # Par défaut, ne pas attendre l'indexation côté serveur
+                )
+            stats["steps"].append(f"  ↗️ {len(points)} produits uploadés (lots de {UPLOAD_BATCH_SIZE})")
             
             stats["success"] = len(products)
             stats["steps"].append(f"✅ {stats['success']} produits ajoutés à Qdrant Cloud")
@@ -196,7 +242,10 @@ class QdrantDatabase:
     async def get_product_by_id(self, product_id: str) -> Dict[str, Any]:
         """Récupère un produit par son ID"""
         try:
-            result = self.client.retrieve(
+            # Client Qdrant synchrone : appel dans un thread pour ne pas bloquer
+            # la boucle (et permettre plusieurs lectures simultanées)
+            result = await asyncio.to_thread(
+                self.client.retrieve,
                 collection_name=self.collection_name,
                 ids=[product_id]
             )
@@ -1,6 +1,9 @@
+import copy
+import hashlib
 import json
 import logging
 import re
+from collections import OrderedDict
 from typing import List, Dict, Any, Set
 from groq import Groq
 from .models_usershop import Product, ProductRecommendation, RecommendationResponse
@@ -8,6 +11,11 @@ from .config_usershop import settings
 
 logger = logging.getLogger(__name__)
 
+# Réponses Groq déjà générées (descriptions et comparaisons), par contenu produit
+LLM_CACHE_SIZE = 2048
+# Champs produit utilisés dans les prompts : une mise à jour invalide l'entrée
+PROMPT_FIELDS = ('id', 'name', 'brand', 'category', 'price', 'description')
+
 class AdvancedLLMService:
     """Service avancé pour recommandations ultra-précises"""
     
@@ -17,8 +25,28 @@ class AdvancedLLMService:
         
         self.client = Groq(api_key=settings.GROQ_API_KEY)
         self.model = settings.GROQ_MODEL
+        # LRU des réponses LLM (boucle asyncio unique : pas de verrou)
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
         logger.info(f"🚀 Service LLM Avancé initialisé avec {self.model}")
     
+    @staticmethod
+    def _cache_key(kind: str, *products: Dict[str, Any]) -> str:
+        """Empreinte des champs produit qui entrent dans le prompt"""
+        fields = [[product.get(field) for field in PROMPT_FIELDS] for product in products]
+        raw = json.dumps([kind, fields], sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _cache_get(self, key: str) -> Any:
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+        return cached
+    
+    def _cache_put(self, key: str, value: Any) -> None:
+        self._cache[key] = value
+        if len(self._cache) > LLM_CACHE_SIZE:
+            self._cache.popitem(last=False)
+    
     def extract_price_value(self, price_str: str) -> float:
         """Extrait la valeur numérique d'un prix avec précision"""
         try:
@@ -338,6 +366,12 @@ class AdvancedLLMService:
     
     async def generate_product_description(self, product: Dict[str, Any]) -> str:
         """Génère une description enrichie et concise"""
+        cache_key = self._cache_key('description', product)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.info(f"♻️ Description en cache: {product.get('name')}")
+            return cached
+        
         try:
             name = product.get('name', '')
             category = product.get('category', '')
@@ -383,6 +417,7 @@ class AdvancedLLMService:
             if len(words) > 100:
                 description = ' '.join(words[:100]) + '...'
             
+            self._cache_put(cache_key, description)
             return description
             
         except Exception as e:
@@ -467,6 +502,13 @@ class AdvancedLLMService:
         product_2: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Compare deux produits avec focus sur guide monétaire et technique"""
+        # Clé ordonnée : la réponse désigne "Produit 1" / "Produit 2"
+        cache_key = self._cache_key('comparison', product_1, product_2)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.info(f"♻️ Comparaison en cache: {product_1.get('name')} vs {product_2.get('name')}")
+            return copy.deepcopy(cached)
+        
         try:
             logger.info(f"🔄 Comparaison: {product_1.get('name')} vs {product_2.get('name')}")
             
@@ -565,6 +607,7 @@ RÈGLES CRITIQUES:
             comparison_data = json.loads(comparison_text.strip())
             
             logger.info(f"✅ Comparaison générée avec focus monétaire")
+            self._cache_put(cache_key, copy.deepcopy(comparison_data))
             return comparison_data
             
         except json.JSONDecodeError as e:
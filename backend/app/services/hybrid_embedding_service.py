@@ -5,9 +5,10 @@ This service creates embeddings using:
 1. Visual embeddings from SigLIP (primary signal)
 2. OCR text extraction for keywords (brand, product type)
 """
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
 from app.services.siglip_service import get_siglip_service
-from app.services.siglip_service import siglip_service
 from app.services.ocr_service import get_ocr_service
 import numpy as np
 
@@ -52,7 +53,6 @@ class HybridEmbeddingService:
         # Generate visual embedding (SigLIP)
         siglip = self._get_siglip()
         visual_embedding = siglip.embed_image(image_bytes, preprocess=True)
-        visual_embedding = siglip_service.embed_image(image_bytes, preprocess=True)
         
         # Extract text using OCR
         extracted_text = ""
@@ -120,14 +120,14 @@ class HybridEmbeddingService:
     
     def create_product_embedding(
         self,
-        image_bytes: Optional[bytes] = None,
+        image_bytes: Optional[Union[bytes, Image.Image]] = None,
         product_text: Optional[str] = None
     ) -> List[float]:
         """
         Create embedding for a product (pure visual).
         
         Args:
-            image_bytes: Product image bytes (required)
+            image_bytes: Product image bytes or decoded PIL image (required)
             product_text: Ignored (for compatibility)
             
         Returns:
@@ -136,11 +136,51 @@ class HybridEmbeddingService:
         if image_bytes:
             siglip = self._get_siglip()
             return siglip.embed_image(image_bytes, preprocess=True)
-            return siglip_service.embed_image(image_bytes, preprocess=True)
         else:
             # Return zero vector if no image
             return [0.0] * 768
     
+    def create_product_embeddings_batch(
+        self,
+        image_bytes_list: List[Optional[Union[bytes, Image.Image]]],
+        batch_size: int = 64
+    ) -> List[List[float]]:
+        """
+        Create embeddings for many products (pure visual), batching images
+        through SigLIP so each forward pass embeds up to `batch_size` images.
+        The next chunk is decoded/preprocessed on a worker thread while the
+        current one runs on the GPU.
+        
+        Args:
+            image_bytes_list: Product image bytes or PIL images (None for products without image)
+            batch_size: Images per forward pass
+            
+        Returns:
+            Visual embedding vectors in input order (zero vector if no image)
+        """
+        embeddings = [[0.0] * 768 for _ in image_bytes_list]
+        indexed = [(i, image_bytes) for i, image_bytes in enumerate(image_bytes_list) if image_bytes]
+        
+        siglip = self._get_siglip()
+        chunks = [indexed[start:start + batch_size] for start in range(0, len(indexed), batch_size)]
+        if not chunks:
+            return embeddings
+        
+        def prepare(chunk):
+            return siglip.prepare_images_batch([image for _, image in chunk], preprocess=True)
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(prepare, chunks[0])
+            for k, chunk in enumerate(chunks):
+                inputs = pending.result()
+                if k + 1 < len(chunks):
+                    pending = executor.submit(prepare, chunks[k + 1])
+                vectors = siglip.embed_prepared_batch(inputs)
+                for (i, _), vector in zip(chunk, vectors):
+                    embeddings[i] = vector
+        
+        return embeddings
+    
     def get_embedding_dimension(self) -> int:
         """Get the dimension of hybrid embeddings"""
         return 768  # SigLIP dimension
@@ -18,6 +18,8 @@ class PrototypeService:
     def __init__(self):
         self.prototypes = {}  # {category: {brand: prototype_embedding}}
         self.prototype_counts = {}  # Track number of examples per prototype
+        self._keys = []  # (category, brand) of each matrix row
+        self._matrix = np.empty((0, 0), dtype=np.float32)  # Stacked unit-norm prototypes
         self.cache_path = Path(__file__).parent.parent.parent / "cache" / "prototypes.pkl"
         self.load_prototypes()
     
@@ -64,6 +66,7 @@ class PrototypeService:
         
         self.prototypes = prototypes
         self.prototype_counts = counts
+        self._build_matrix()
         
         # Print statistics
         total_prototypes = sum(len(brands) for brands in prototypes.values())
@@ -94,30 +97,29 @@ class PrototypeService:
         Returns:
             List of {category, brand, similarity, count}
         """
-        if not self.prototypes:
+        if not self._keys or top_k <= 0:
             return []
         
-        query_vec = np.array(query_embedding)
-        results = []
-        
-        for category, brands in self.prototypes.items():
-            for brand, prototype in brands.items():
-                proto_vec = np.array(prototype)
-                
-                # Cosine similarity
-                similarity = np.dot(query_vec, proto_vec)
-                
-                results.append({
-                    'category': category,
-                    'brand': brand,
-                    'similarity': float(similarity),
-                    'count': self.prototype_counts[category][brand]
-                })
+        # Cosine similarity to every prototype in one matrix-vector product
+        # (prototypes and SigLIP queries are unit-norm)
+        similarities = self._matrix @ np.asarray(query_embedding, dtype=np.float32)
         
-        # Sort by similarity
-        results.sort(key=lambda x: x['similarity'], reverse=True)
+        # Top-k without sorting all prototypes
+        k = min(top_k, len(self._keys))
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
         
-        return results[:top_k]
+        results = []
+        for i in top:
+            category, brand = self._keys[i]
+            results.append({
+                'category': category,
+                'brand': brand,
+                'similarity': float(similarities[i]),
+                'count': self.prototype_counts[category][brand]
+            })
+        
+        return results
     
     def get_category_filter(
         self,
@@ -146,7 +148,8 @@ class PrototypeService:
         query_embedding: List[float],
         product_category: str,
         product_brand: str,
-        base_score: float
+        base_score: float,
+        closest: Optional[List[Dict]] = None
     ) -> float:
         """
         Boost product score if it matches the closest prototype.
@@ -156,11 +159,14 @@ class PrototypeService:
             product_category: Product's category
             product_brand: Product's brand
             base_score: Base similarity score
+            closest: Precomputed find_closest_prototype(query_embedding, top_k=1)
+                     (same for every result of a query)
             
         Returns:
             Boosted score
         """
-        closest = self.find_closest_prototype(query_embedding, top_k=1)
+        if closest is None:
+            closest = self.find_closest_prototype(query_embedding, top_k=1)
         
         if not closest:
             return base_score
@@ -179,6 +185,21 @@ class PrototypeService:
         
         return base_score
     
+    def _build_matrix(self):
+        """Stack prototypes into one matrix for vectorized matching"""
+        self._keys = [
+            (category, brand)
+            for category, brands in self.prototypes.items()
+            for brand in brands
+        ]
+        if self._keys:
+            self._matrix = np.array(
+                [self.prototypes[category][brand] for category, brand in self._keys],
+                dtype=np.float32
+            )
+        else:
+            self._matrix = np.empty((0, 0), dtype=np.float32)
+    
     def save_prototypes(self):
         """Save prototypes to cache"""
         try:
@@ -205,6 +226,7 @@ class PrototypeService:
                 
                 self.prototypes = data.get('prototypes', {})
                 self.prototype_counts = data.get('counts', {})
+                self._build_matrix()
                 
                 total = sum(len(brands) for brands in self.prototypes.values())
                 if total > 0:
@@ -1,10 +1,14 @@
 from qdrant_client import QdrantClient
 from qdrant_client.models import Distance, VectorParams, PointStruct, Filter, FieldCondition, Range
+from qdrant_client.models import ScalarQuantization, ScalarQuantizationConfig, ScalarType
 from typing import List, Dict, Any, Optional
 from app.core.config import settings
 from app.models.schemas import Product
 import uuid
 
+# Points per upsert call: few round trips, still well under request size limits
+UPSERT_BATCH_SIZE = 4096
+
 class QdrantService:
     def __init__(self):
         try:
@@ -15,8 +19,8 @@ class QdrantService:
             self.client = QdrantClient(
                 url=settings.QDRANT_URL,
                 api_key=settings.QDRANT_API_KEY,
-                timeout=180,  # 3 minutes timeout for slow connections
-                prefer_grpc=False,  # Use REST API
+                timeout=60,
+                prefer_grpc=True,  # gRPC/protobuf: smaller, faster vector payloads than REST JSON
                 https=True
             )
             print(f"[OK] Connected to Qdrant Cloud")
@@ -45,9 +49,17 @@ class QdrantService:
                 vectors_config=VectorParams(
                     size=dimension,
                     distance=Distance.COSINE
+                ),
+                # int8 copies of the vectors in RAM for HNSW scoring (4x smaller
+                # than float32); originals stay available for rescoring
+                quantization_config=ScalarQuantization(
+                    scalar=ScalarQuantizationConfig(
+                        type=ScalarType.INT8,
+                        always_ram=True
+                    )
                 )
             )
-            print(f"Created collection: {collection_name} with dimension {dimension}")
+            print(f"Created collection: {collection_name} with dimension {dimension} (int8 quantized)")
             
             # Create payload indexes for filtering
             self.client.create_payload_index(
@@ -70,8 +82,28 @@ class QdrantService:
                 field_schema=PayloadSchemaType.KEYWORD
             )
             print(f"Created index on 'market' field")
+            
+            self.create_name_text_index(collection_name)
         else:
             print(f"Collection already exists: {collection_name}")
+            # Collections created before the text index existed get it at the next ingestion
+            # (creating an index that already exists is a no-op)
+            self.create_name_text_index(collection_name)
+    
+    def create_name_text_index(self, collection_name: str):
+        """Full-text index on 'name' so name searches can be filtered server-side"""
+        from qdrant_client.models import TextIndexParams, TokenizerType
+        
+        self.client.create_payload_index(
+            collection_name=collection_name,
+            field_name="name",
+            field_schema=TextIndexParams(
+                type="text",
+                tokenizer=TokenizerType.WORD,
+                lowercase=True
+            )
+        )
+        print("Created text index on 'name' field")
     
     def insert_product(self, collection_name: str, product: Product, embedding: List[float]):
         """Insert a single product into Qdrant"""
@@ -117,10 +149,13 @@ class QdrantService:
             )
             points.append(point)
         
-        self.client.upsert(
-            collection_name=collection_name,
-            points=points
-        )
+        # Don't block on indexing/replication: fire chunks back to back
+        for i in range(0, len(points), UPSERT_BATCH_SIZE):
+            self.client.upsert(
+                collection_name=collection_name,
+                points=points[i:i + UPSERT_BATCH_SIZE],
+                wait=False
+            )
         print(f"Inserted {len(points)} products into {collection_name}")
     
     def search_products(
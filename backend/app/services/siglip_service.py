@@ -1,9 +1,17 @@
-from transformers import AutoModel, AutoImageProcessor
 from transformers import AutoProcessor, AutoModel
 from PIL import Image, ImageEnhance, ImageOps
 import torch
-from typing import List
+from typing import List, Union
+from collections import OrderedDict
+import hashlib
 import io
+import threading
+from app.core.config import settings
+
+# Embeddings of recently seen image bytes (re-uploads, retries, re-runs)
+EMBEDDING_CACHE_SIZE = 512
+# JPEGs are decoded at reduced scale down to at least this size (model input is 224)
+DECODE_MIN_SIDE = 448
 
 class SigLIPService:
     """
@@ -18,76 +26,171 @@ class SigLIPService:
         self.model_name = "google/siglip-base-patch16-224"
         print(f"[LOADING] SigLIP base model from {self.model_name}...")
         
-        # Load model and image processor (SigLIP is vision-only, no tokenizer needed)
+        # Load model and processor once (weights were previously loaded twice)
         try:
             self.model = AutoModel.from_pretrained(self.model_name)
-            self.image_processor = AutoImageProcessor.from_pretrained(self.model_name)
+            self.processor = AutoProcessor.from_pretrained(self.model_name)
             print("[OK] SigLIP model and processor loaded successfully")
         except Exception as e:
             print(f"[ERROR] Failed to load SigLIP: {e}")
             raise
         
-        self.model = AutoModel.from_pretrained(self.model_name)
-        self.processor = AutoProcessor.from_pretrained(self.model_name)
+        # Inference only: freeze every tower so no parameter ever tracks gradients
+        self.model.requires_grad_(False)
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        # bf16 keeps FP32's exponent range (no overflow); fp16 on older GPUs
+        self.autocast_dtype = (
+            torch.bfloat16 if self.device == "cuda" and torch.cuda.is_bf16_supported() else torch.float16
+        )
         self.model.to(self.device)
+        if self.device == "cuda":
+            # NHWC lets cuDNN pick tensor-core kernels for the patch-embedding conv
+            self.model.to(memory_format=torch.channels_last)
         self.model.eval()
+        # Inductor-fused vision forward; dynamic=True so batch-size changes
+        # (single queries vs. loader batches) don't trigger recompiles
+        self._image_forward = self.model.get_image_features
+        if settings.SIGLIP_COMPILE and self.device == "cuda":
+            self._image_forward = torch.compile(self.model.get_image_features, dynamic=True)
+        # (image digest, preprocess) -> embedding, LRU order
+        self._embedding_cache = OrderedDict()
+        self._embedding_cache_lock = threading.Lock()
         print(f"[OK] SigLIP base model loaded on {self.device}")
         print(f"[INFO] To use fine-tuned model: Increase Windows page file (see FIX_MEMORY_ERROR.md)")
     
-    def embed_image(self, image_bytes: bytes, preprocess: bool = True) -> List[float]:
+    def embed_image(self, image_bytes: Union[bytes, Image.Image], preprocess: bool = True) -> List[float]:
         """
         Generate embedding for an image with optional preprocessing
         
         Args:
-            image_bytes: Raw image bytes
+            image_bytes: Raw image bytes or an already-decoded PIL image
             preprocess: Whether to apply image enhancements (default: True)
             
         Returns:
             768-dimensional embedding vector (SigLIP base)
         """
+        # Same bytes already embedded: skip decode, preprocessing and forward pass
+        cache_key = None
+        if isinstance(image_bytes, bytes):
+            cache_key = (hashlib.blake2b(image_bytes, digest_size=16).digest(), preprocess)
+            with self._embedding_cache_lock:
+                cached = self._embedding_cache.get(cache_key)
+                if cached is not None:
+                    self._embedding_cache.move_to_end(cache_key)
+                    return list(cached)
+        
         try:
             # Load and preprocess image
             if preprocess:
                 image = self._preprocess_image(image_bytes)
             else:
-                image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+                image = self._open_image(image_bytes)
             
-            # Process image for SigLIP using image processor
-            inputs = self.image_processor(images=image, return_tensors="pt")
-            # Process image for SigLIP
+            # Process image for SigLIP, then the same mixed-precision path as batches
             inputs = self.processor(images=image, return_tensors="pt")
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+            embedding = self.embed_prepared_batch(inputs)[0]
             
-            # Generate embedding
-            with torch.no_grad():
-                outputs = self.model.get_image_features(**inputs)
-                
-                # For SigLIP, the output should be a tensor directly
-                # If it's a model output object, get the pooler_output or last_hidden_state
-                if hasattr(outputs, 'pooler_output') and outputs.pooler_output is not None:
-                    image_features = outputs.pooler_output
-                elif hasattr(outputs, 'last_hidden_state'):
-                    # Take the mean of the last hidden state (global average pooling)
-                    image_features = outputs.last_hidden_state.mean(dim=1)
-                elif torch.is_tensor(outputs):
-                    image_features = outputs
-                else:
-                    # Fallback - try to access the tensor
-                    image_features = outputs[0] if hasattr(outputs, '__getitem__') else outputs
-                
-                # Normalize for cosine similarity
+            if cache_key is not None:
+                with self._embedding_cache_lock:
+                    self._embedding_cache[cache_key] = embedding
+                    if len(self._embedding_cache) > EMBEDDING_CACHE_SIZE:
+                        self._embedding_cache.popitem(last=False)
+            return list(embedding)
+        
+        except Exception as e:
+            print(f"[ERROR] Error embedding image: {e}")
+            raise
+    
+    def embed_images_batch(self, images: List[Union[bytes, Image.Image]], preprocess: bool = True) -> List[List[float]]:
+        """
+        Generate embeddings for several images in a single forward pass
+        
+        Args:
+            images: List of raw image bytes or already-decoded PIL images
+            preprocess: Whether to apply image enhancements (default: True)
+            
+        Returns:
+            One 768-dimensional embedding vector per image, in input order
+        """
+        if not images:
+            return []
+        return self.embed_prepared_batch(self.prepare_images_batch(images, preprocess=preprocess))
+    
+    def prepare_images_batch(self, images: List[Union[bytes, Image.Image]], preprocess: bool = True) -> dict:
+        """
+        CPU half of embed_images_batch: decode, enhance and run the SigLIP
+        processor. Safe to call from a worker thread so the next batch can
+        be prepared while the current one is on the GPU.
+        """
+        pil_images = [
+            self._preprocess_image(image) if preprocess else self._open_image(image)
+            for image in images
+        ]
+        inputs = self.processor(images=pil_images, return_tensors="pt")
+        if self.device == "cuda":
+            # NHWC layout done here, on the prefetch thread, not on the GPU path
+            inputs["pixel_values"] = inputs["pixel_values"].contiguous(memory_format=torch.channels_last)
+            # Pinned host memory: the non_blocking copy in embed_prepared_batch
+            # really overlaps with GPU work instead of silently syncing
+            inputs = {k: v.pin_memory() for k, v in inputs.items()}
+        return inputs
+    
+    def embed_prepared_batch(self, inputs: dict) -> List[List[float]]:
+        """GPU half of embed_images_batch: forward pass on processor outputs"""
+        try:
+            inputs = {k: v.to(self.device, non_blocking=True) for k, v in inputs.items()}
+            if self.device == "cuda":
+                # No-op for batches already converted in prepare_images_batch
+                inputs["pixel_values"] = inputs["pixel_values"].contiguous(memory_format=torch.channels_last)
+            
+            # One forward pass for the batch (bf16/fp16 autocast on GPU)
+            with torch.inference_mode():
+                with torch.autocast(
+                    device_type="cuda", dtype=self.autocast_dtype, enabled=self.device == "cuda"
+                ):
+                    outputs = self._image_forward(**inputs)
+                # Normalize for cosine similarity in FP32 (outside autocast)
+                image_features = self._image_features(outputs).float()
                 image_features = image_features / image_features.norm(dim=-1, keepdim=True)
-                # Normalize for cosine similarity
-                image_features = outputs / outputs.norm(dim=-1, keepdim=True)
             
-            return image_features.cpu().numpy()[0].tolist()
+            return image_features.cpu().numpy().tolist()
         
         except Exception as e:
-            print(f"[ERROR] Error embedding image: {e}")
+            print(f"[ERROR] Error embedding image batch: {e}")
             raise
     
-    def _preprocess_image(self, image_bytes: bytes) -> Image.Image:
+    @staticmethod
+    def _image_features(outputs) -> torch.Tensor:
+        """Pooled image tensor, whether get_image_features returns a tensor or a model output"""
+        # For SigLIP, the output should be a tensor directly
+        # If it's a model output object, get the pooler_output or last_hidden_state
+        if torch.is_tensor(outputs):
+            return outputs
+        if getattr(outputs, 'pooler_output', None) is not None:
+            return outputs.pooler_output
+        if hasattr(outputs, 'last_hidden_state'):
+            # Take the mean of the last hidden state (global average pooling)
+            return outputs.last_hidden_state.mean(dim=1)
+        return outputs[0]
+    
+    def _open_image(self, image: Union[bytes, Image.Image]) -> Image.Image:
+        """Return an RGB PIL image from raw bytes or an already-decoded image"""
+        if isinstance(image, Image.Image):
+            return image if image.mode == "RGB" else image.convert("RGB")
+        return self._decode(image).convert("RGB")
+    
+    @staticmethod
+    def _decode(image_bytes: bytes) -> Image.Image:
+        """
+        Open raw image bytes. For JPEGs, libjpeg downscales in the DCT domain
+        while decoding (draft mode), so a 12MP phone photo is never fully
+        decoded just to be resized to 224x224; other formats are unaffected.
+        """
+        img = Image.open(io.BytesIO(image_bytes))
+        img.draft("RGB", (DECODE_MIN_SIDE, DECODE_MIN_SIDE))
+        return img
+    
+    def _preprocess_image(self, image_bytes: Union[bytes, Image.Image]) -> Image.Image:
         """
         Preprocess image for better recognition
         
@@ -98,8 +201,8 @@ class SigLIPService:
         - Center cropping
         """
         try:
-            # Load image
-            img = Image.open(io.BytesIO(image_bytes))
+            # Load image (already-decoded PIL images are used as-is)
+            img = image_bytes if isinstance(image_bytes, Image.Image) else self._decode(image_bytes)
             
             # Convert to RGB if needed
             if img.mode != 'RGB':
@@ -128,7 +231,7 @@ class SigLIPService:
         except Exception as e:
             print(f"[WARNING] Preprocessing failed, using original image: {e}")
             # Fallback to original
-            return Image.open(io.BytesIO(image_bytes)).convert("RGB")
+            return self._open_image(image_bytes)
     
     def _center_crop(self, img: Image.Image, crop_ratio: float = 0.9) -> Image.Image:
         """
@@ -158,7 +261,6 @@ class SigLIPService:
     def embed_text(self, text: str) -> List[float]:
         """Generate embedding for text (for cross-modal search)"""
         try:
-            inputs = self.tokenizer(text=[text], return_tensors="pt", padding=True)
             inputs = self.processor(text=[text], return_tensors="pt", padding=True)
             inputs = {k: v.to(self.device) for k, v in inputs.items()}
             
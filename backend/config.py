@@ -52,7 +52,7 @@ class Settings(BaseSettings):
         extra = "allow"  # Allow extra fields from .env
 
 
-@lru_cache()
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Singleton pour les settings"""
     return Settings()
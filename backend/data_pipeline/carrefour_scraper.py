@@ -25,6 +25,9 @@ import requests
 
 from data_pipeline.product_database import ProductDatabase
 
+# First number in a price string (compiled once, used for every product)
+PRICE_NUMBER_RX = re.compile(r'\d+[.,]?\d*')
+
 
 class CarrefourScraper:
     """Scraper for Carrefour Tunisia products using Selenium"""
@@ -69,7 +72,7 @@ class CarrefourScraper:
             return None
         
         # Remove currency symbols and extract numbers
-        numbers = re.findall(r'\d+[.,]?\d*', price_text.replace(',', '.'))
+        numbers = PRICE_NUMBER_RX.findall(price_text.replace(',', '.'))
         if numbers:
             try:
                 return float(numbers[0])
@@ -1,13 +1,19 @@
 """
 SQLite database for storing scraped product data.
-Stores product info and images as BLOBs.
+Stores product info in SQLite; images are written to IMAGES_DIR and only
+their path is stored (legacy rows may still carry an image BLOB).
 """
 import sqlite3
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from PIL import Image
 import io
+import hashlib
 from datetime import datetime
+import re
+
+# Product images live on disk next to the database, keyed by product_id
+IMAGES_DIR = Path(__file__).parent.parent / "scraped_images"
 
 class ProductDatabase:
     """SQLite database for scraped products"""
@@ -23,6 +29,15 @@ class ProductDatabase:
         self.conn = sqlite3.connect(str(self.db_path))
         self.conn.row_factory = sqlite3.Row  # Return rows as dictionaries
         
+        # WAL + relaxed fsync: scraper writes come in large batches
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+        # Memory-mapped reads: bulk SELECTs of legacy image BLOBs (loaders,
+        # prototype building) copy pages straight from the mapping, no pread per page
+        self.conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        
         cursor = self.conn.cursor()
         
         # Create products table
@@ -35,6 +50,7 @@ class ProductDatabase:
                 brand TEXT,
                 quantity TEXT,
                 price REAL NOT NULL,
+                price_millimes INTEGER,
                 old_price REAL,
                 currency TEXT DEFAULT 'TND',
                 market TEXT NOT NULL,
@@ -42,12 +58,20 @@ class ProductDatabase:
                 product_url TEXT,
                 image_url TEXT,
                 image_blob BLOB,
+                image_path TEXT,
                 promo TEXT,
                 scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
         
+        # Databases created before these columns existed: add them
+        columns = {row['name'] for row in cursor.execute("PRAGMA table_info(products)")}
+        if 'price_millimes' not in columns:
+            cursor.execute("ALTER TABLE products ADD COLUMN price_millimes INTEGER")
+        if 'image_path' not in columns:
+            cursor.execute("ALTER TABLE products ADD COLUMN image_path TEXT")
+        
         # Create index on market and product_id for fast lookups
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_market 
@@ -59,59 +83,101 @@ class ProductDatabase:
             ON products(product_id)
         """)
         
+        # Downloaded images keyed by sha1(image_url), reused across pages/runs
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS image_cache (
+                url_hash TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                bytes BLOB NOT NULL,
+                fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
         self.conn.commit()
         print(f"[OK] Database initialized: {self.db_path}")
     
-    def insert_product(self, product_data: Dict[str, Any]) -> int:
-        """
-        Insert or update a product in the database.
-        Returns the product ID.
-        """
-        cursor = self.conn.cursor()
-        
-        # Convert PIL Image to BLOB if present
-        image_blob = None
-        if "image" in product_data and product_data["image"] is not None:
-            img = product_data["image"]
-            img_byte_arr = io.BytesIO()
-            img.save(img_byte_arr, format='PNG')
-            image_blob = img_byte_arr.getvalue()
+    UPSERT_SQL = """
+        INSERT INTO products (
+            product_id, name, description, brand, quantity,
+            price, price_millimes, old_price, currency, market, category,
+            product_url, image_url, image_blob, image_path, promo, scraped_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(product_id) DO UPDATE SET
+            name = excluded.name,
+            price = excluded.price,
+            price_millimes = excluded.price_millimes,
+            old_price = excluded.old_price,
+            image_blob = excluded.image_blob,
+            image_path = excluded.image_path,
+            promo = excluded.promo,
+            updated_at = CURRENT_TIMESTAMP
+    """
+    
+    @staticmethod
+    def _product_id(product_data: Dict[str, Any]) -> str:
+        """Stable product_id: same market + name -> same id (and image file) on every run"""
+        if product_data.get("product_id"):
+            return product_data["product_id"]
+        digest = hashlib.sha1(f"{product_data['market']}:{product_data['name']}".encode("utf-8")).hexdigest()
+        return f"{product_data['market']}_{digest[:16]}"
+    
+    def _write_image(self, product_id: str, product_data: Dict[str, Any]) -> Optional[Path]:
+        """Write the product image to disk (raw bytes as-is, legacy PIL Images as PNG)"""
+        if product_data.get("image_bytes"):
+            image_path = self._image_file(product_id, ".jpg")
+            image_path.write_bytes(product_data["image_bytes"])
+            return image_path
+        if product_data.get("image") is not None:
+            image_path = self._image_file(product_id, ".png")
+            product_data["image"].save(image_path, format='PNG')
+            return image_path
+        return None
+    
+    def _product_row(self, product_data: Dict[str, Any], product_id: str, image_path: Optional[Path]) -> tuple:
+        """Build the UPSERT_SQL parameter tuple for a product dict (no side effects)"""
+        # Fixed-point price (integer millimes) alongside the display float
+        price_millimes = product_data.get("price_millimes")
+        if price_millimes is None:
+            price_millimes = round(product_data["price"] * 1000)
         
-        # Generate unique product_id
-        product_id = product_data.get("product_id") or f"{product_data['market']}_{hash(product_data['name'])}"
+        return (
+            product_id,
+            product_data["name"],
+            product_data.get("description", product_data["name"]),
+            product_data.get("brand"),
+            product_data.get("quantity"),
+            product_data["price"],
+            price_millimes,
+            product_data.get("old_price"),
+            product_data.get("currency", "TND"),
+            product_data["market"],
+            product_data.get("category", "food"),
+            product_data.get("url"),
+            product_data.get("image_url"),
+            None,
+            str(image_path) if image_path else None,
+            product_data.get("promo"),
+            product_data.get("scraped_at", datetime.now().isoformat())
+        )
+    
+    def _prepare_row(self, product_data: Dict[str, Any]) -> tuple:
+        """Write the product's image once, then build its row"""
+        product_id = self._product_id(product_data)
+        image_path = self._write_image(product_id, product_data)
+        return self._product_row(product_data, product_id, image_path)
+    
+    def _image_file(self, product_id: str, suffix: str) -> Path:
+        """On-disk location for a product image"""
+        IMAGES_DIR.mkdir(parents=True, exist_ok=True)
+        return IMAGES_DIR / (re.sub(r'[^\w.-]', '_', product_id) + suffix)
+    
+    def _insert_row(self, row: tuple) -> int:
+        """Upsert one prepared row in its own transaction; -1 on failure"""
+        cursor = self.conn.cursor()
         
         try:
-            cursor.execute("""
-                INSERT INTO products (
-                    product_id, name, description, brand, quantity,
-                    price, old_price, currency, market, category,
-                    product_url, image_url, image_blob, promo, scraped_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(product_id) DO UPDATE SET
-                    name = excluded.name,
-                    price = excluded.price,
-                    old_price = excluded.old_price,
-                    image_blob = excluded.image_blob,
-                    promo = excluded.promo,
-                    updated_at = CURRENT_TIMESTAMP
-            """, (
-                product_id,
-                product_data["name"],
-                product_data.get("description", product_data["name"]),
-                product_data.get("brand"),
-                product_data.get("quantity"),
-                product_data["price"],
-                product_data.get("old_price"),
-                product_data.get("currency", "TND"),
-                product_data["market"],
-                product_data.get("category", "food"),
-                product_data.get("url"),
-                product_data.get("image_url"),
-                image_blob,
-                product_data.get("promo"),
-                product_data.get("scraped_at", datetime.now().isoformat())
-            ))
-            
+            cursor.execute(self.UPSERT_SQL, row)
             self.conn.commit()
             return cursor.lastrowid
         
@@ -120,13 +186,43 @@ class ProductDatabase:
             self.conn.rollback()
             return -1
     
+    def insert_product(self, product_data: Dict[str, Any]) -> int:
+        """
+        Insert or update a product in the database.
+        Returns the product ID.
+        """
+        try:
+            row = self._prepare_row(product_data)
+        except Exception as e:
+            print(f"Error inserting product: {e}")
+            return -1
+        return self._insert_row(row)
+    
     def batch_insert_products(self, products: List[Dict[str, Any]]) -> int:
-        """Insert multiple products. Returns count of inserted products."""
-        count = 0
+        """
+        Insert multiple products in a single transaction.
+        Returns count of inserted products.
+        """
+        if not products:
+            return 0
+        
+        # Images are written here, once per product; the fallback below reuses the rows
+        rows = []
         for product in products:
-            if self.insert_product(product) > 0:
-                count += 1
-        return count
+            try:
+                rows.append(self._prepare_row(product))
+            except Exception as e:
+                print(f"Error inserting product: {e}")
+        
+        try:
+            with self.conn:  # one BEGIN ... COMMIT for the whole batch
+                self.conn.executemany(self.UPSERT_SQL, rows)
+            return len(rows)
+        
+        except Exception as e:
+            # A bad row aborts the batch: retry row by row to keep the good ones
+            print(f"Batch insert failed ({e}), falling back to per-product inserts")
+            return sum(1 for row in rows if self._insert_row(row) > 0)
     
     def get_product_by_id(self, product_id: str) -> Optional[Dict[str, Any]]:
         """Get a product by its product_id"""
@@ -162,15 +258,62 @@ class ProductDatabase:
         return [dict(row) for row in cursor.fetchall()]
     
     def get_product_image(self, product_id: str) -> Optional[Image.Image]:
-        """Get product image as PIL Image"""
+        """Get product image as PIL Image (lazily decoded from the image file)"""
         cursor = self.conn.cursor()
-        cursor.execute("SELECT image_blob FROM products WHERE product_id = ?", (product_id,))
+        cursor.execute("SELECT image_path, image_blob FROM products WHERE product_id = ?", (product_id,))
         row = cursor.fetchone()
         
+        if row and row['image_path'] and Path(row['image_path']).exists():
+            return Image.open(row['image_path'])
         if row and row['image_blob']:
             return Image.open(io.BytesIO(row['image_blob']))
         return None
     
+    @staticmethod
+    def get_product_image_bytes(product: Dict[str, Any]) -> Optional[bytes]:
+        """
+        Raw image bytes for a product row (file on disk, else legacy BLOB).
+        Doesn't touch the connection, so it's safe from worker threads.
+        """
+        image_path = product.get('image_path')
+        if image_path and Path(image_path).exists():
+            return Path(image_path).read_bytes()
+        return product.get('image_blob')
+    
+    def get_cached_image(self, url_hash: str) -> Optional[Dict[str, Any]]:
+        """Get a cached image download (bytes + validators) by URL hash"""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT * FROM image_cache WHERE url_hash = ?", (url_hash,))
+        row = cursor.fetchone()
+        
+        if row:
+            return dict(row)
+        return None
+    
+    def cache_image(self, url_hash: str, image_bytes: bytes,
+                    etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Insert or refresh a cached image download"""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            INSERT INTO image_cache (url_hash, etag, last_modified, bytes, fetched_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(url_hash) DO UPDATE SET
+                etag = excluded.etag,
+                last_modified = excluded.last_modified,
+                bytes = excluded.bytes,
+                fetched_at = excluded.fetched_at
+        """, (url_hash, etag, last_modified, sqlite3.Binary(image_bytes), datetime.now().isoformat()))
+        self.conn.commit()
+    
+    def touch_cached_image(self, url_hash: str):
+        """Mark a cached image as revalidated (server answered 304 Not Modified)"""
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "UPDATE image_cache SET fetched_at = ? WHERE url_hash = ?",
+            (datetime.now().isoformat(), url_hash)
+        )
+        self.conn.commit()
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Get database statistics"""
         cursor = self.conn.cursor()
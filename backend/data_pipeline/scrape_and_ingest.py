@@ -22,7 +22,6 @@ from app.core.config import settings
 from data_pipeline.web_scraper import run_weekly_scrape
 from data_pipeline.product_database import product_db
 from app.models.schemas import Product
-import io
 
 async def scrape_and_ingest_supermarkets():
     """
@@ -87,9 +86,8 @@ async def scrape_and_ingest_supermarkets():
                 )
                 products.append(product)
                 
-                # Get image from database
-                image = product_db.get_product_image(db_prod['product_id'])
-                product_images.append(image)
+                # Stored image bytes, embedded as-is (no decode/re-encode)
+                product_images.append(product_db.get_product_image_bytes(db_prod))
             
             print(f"✓ Prepared {len(products)} products for Qdrant")
         
@@ -113,12 +111,9 @@ async def scrape_and_ingest_supermarkets():
         print("\nGenerating CLIP embeddings...")
         embeddings = []
         
-        for i, (product, image) in enumerate(zip(products, product_images)):
-            if image is not None:
+        for i, (product, img_bytes) in enumerate(zip(products, product_images)):
+            if img_bytes:
                 # Use actual product image from database
-                img_byte_arr = io.BytesIO()
-                image.save(img_byte_arr, format='PNG')
-                img_bytes = img_byte_arr.getvalue()
                 embedding = clip_service.embed_image(img_bytes)
             else:
                 # Fallback to text embedding
@@ -4,18 +4,25 @@ Extracts product images and prices from supermarket websites.
 Stores data in SQLite database.
 """
 import asyncio
+import aiohttp
+from contextlib import asynccontextmanager
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
-from bs4 import BeautifulSoup
-from typing import List, Dict, Any
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve as sv
+from typing import List, Dict, Any, Optional, Tuple
 from PIL import Image
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from io import BytesIO
 import re
-from datetime import datetime
+from datetime import datetime, timedelta
 from urllib.robotparser import RobotFileParser
 from urllib.parse import urlparse
 from pathlib import Path
 import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
 
 # Import database
 from data_pipeline.product_database import product_db
@@ -32,21 +39,351 @@ browser_config = BrowserConfig(
     ],
 )
 
+# Shared sync HTTP session for robots.txt fetches (image downloads go
+# through the scraper's aiohttp session, see SupermarketScraper._get_http_session)
+_http = requests.Session()
+_http_adapter = HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.3),
+)
+_http.mount("https://", _http_adapter)
+_http.mount("http://", _http_adapter)
+
+def parse_tnd(dinars: str, millimes: str = "") -> int:
+    """
+    Parse a Tunisian dinar price split into its dinar/millime parts.
+    Returns integer millimes (1 TND = 1000 millimes), e.g. ("10", "9") → 10900,
+    so prices are fixed-point until converted for display.
+    """
+    return int(dinars) * 1000 + int((millimes or "").ljust(3, '0')[:3])
+
+
+# Price patterns used inside per-card loops
+PRICE_RX = re.compile(r'(\d+)[.,\s]*(\d+)?')
+PRICE_STRICT_RX = re.compile(r'(\d+)[.,](\d+)')
+
+# Only build DOM nodes for product cards (skips navbars, footers, scripts...)
+AZIZA_CARD_STRAINER = SoupStrainer('div', class_='article-block')
+MG_CARD_STRAINER = SoupStrainer('article', class_='product-miniature')
+GEANT_CARD_STRAINER = SoupStrainer('div', class_='item-product')
+CARREFOUR_CARD_STRAINER = SoupStrainer(['div', 'article'], class_=['product-item', 'product'])
+MONOPRIX_CARD_STRAINER = SoupStrainer(['article', 'div'], class_=['product', 'product-card'])
+
+# Product images above this size are skipped (high-res originals)
+MAX_IMAGE_BYTES = 1_000_000
+IMAGE_ACCEPT_HEADER = 'image/webp,image/jpeg,*/*;q=0.8'
+
+# Images downloaded more recently than this are reused without revalidation
+IMAGE_CACHE_TTL = timedelta(hours=24)
+
+# Precompiled per-card field selectors (one compile, reused for every card)
+# Aziza
+AZIZA_TITLE_SEL = sv.compile('.article-title')
+AZIZA_BRAND_SEL = sv.compile('.article-marque')
+AZIZA_QUANTITY_SEL = sv.compile('.article-quantity')
+AZIZA_PRICE_INT_SEL = sv.compile('.price-integer')
+AZIZA_PRICE_DEC_SEL = sv.compile('.price-decimal')
+AZIZA_CURRENCY_SEL = sv.compile('.price-currency')
+AZIZA_PROMO_SEL = sv.compile('.promo-badge')
+AZIZA_IMG_SEL = sv.compile('img.fade-in-image')
+# MG
+MG_NAME_LINK_SEL = sv.compile('h2.product-title a')
+MG_CATEGORY_SEL = sv.compile('div.product-category-name')
+MG_PRICE_SEL = sv.compile('div.price-amount')
+MG_PRICE_FIRST_SEL = sv.compile('.price-first-part')
+MG_PRICE_SECOND_SEL = sv.compile('.price-second-part')
+MG_IMG_SEL = sv.compile('img.lazy-product-image')
+# Geant
+GEANT_ARTICLE_SEL = sv.compile('article.product-miniature')
+GEANT_NAME_LINK_SEL = sv.compile('h2.product-title a')
+GEANT_BRAND_SEL = sv.compile('p.manufacturer_product')
+GEANT_DESC_SEL = sv.compile('div.product_short')
+GEANT_PRICE_SEL = sv.compile('span.price')
+GEANT_OLD_PRICE_SEL = sv.compile('span.regular-price')
+GEANT_PROMO_SEL = sv.compile('ul.product-flags li.discount')
+GEANT_IMG_SEL = sv.compile('img.img-responsive')
+# Carrefour / Monoprix (loose class names: substring attribute matches)
+CARREFOUR_CARD_SEL = sv.compile('div.product-item, article.product')
+CARREFOUR_NAME_SEL = sv.compile('a[class*=product][class*=name], h3[class*=product][class*=name]')
+MONOPRIX_CARD_SEL = sv.compile('article.product, div.product-card')
+MONOPRIX_NAME_SEL = sv.compile(
+    'h2[class*=product][class*=title], h3[class*=product][class*=title], h2[class*=name], h3[class*=name]'
+)
+PRICE_SPAN_SEL = sv.compile('span[class*=price]')
+IMG_SEL = sv.compile('img')
+
+# Canonical size for stored product images (catalog display + CLIP input)
+THUMBNAIL_SIZE = (256, 256)
+THUMBNAIL_JPEG_QUALITY = 85
+
+
+def make_thumbnail(raw_bytes: bytes) -> Optional[bytes]:
+    """
+    Downscale an image to THUMBNAIL_SIZE and re-encode it as JPEG.
+    Returns None if the payload cannot be decoded as an image.
+    """
+    try:
+        # BytesIO over an immutable bytes object shares its buffer (no copy)
+        img = Image.open(BytesIO(raw_bytes))
+        # For JPEGs, let the decoder downscale during decode so the
+        # full-resolution bitmap is never materialized
+        img.draft('RGB', (THUMBNAIL_SIZE[0] * 2, THUMBNAIL_SIZE[1] * 2))
+        img.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
+        buf = BytesIO()
+        img.convert('RGB').save(buf, 'JPEG', quality=THUMBNAIL_JPEG_QUALITY, optimize=True)
+        return buf.getvalue()
+    except Exception as e:
+        print(f"    ⚠️ Failed to process image: {e}")
+        return None
+
+
+# Process pool for CPU-bound image decode/resize (holds the GIL in-thread)
+_image_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_image_pool() -> ProcessPoolExecutor:
+    """Create the image processing pool on first use"""
+    global _image_pool
+    if _image_pool is None:
+        _image_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _image_pool
+
+
 class SupermarketScraper:
     """
     Scrapes supermarket websites for product data.
     Designed to run weekly to update discount/promo data.
     """
     
-    def __init__(self):
+    def __init__(self, crawler: Optional[AsyncWebCrawler] = None):
         self.scraped_data = {}
         self.last_scrape_time = None
+        # Long-lived browser shared by all site scrapers (see __aenter__)
+        self.crawler = crawler
+        self._owns_crawler = False
+        # Nesting depth of `async with self` blocks: only the outermost one
+        # starts and closes the browser/HTTP session
+        self._context_depth = 0
+        # Parsed robots.txt per host (None = unavailable, treated as allowed)
+        self._robots: Dict[str, Optional[RobotFileParser]] = {}
+        # Keep-alive HTTP session for image downloads (created lazily)
+        self._http: Optional[aiohttp.ClientSession] = None
+        # In-flight/finished thumbnail jobs per image URL, shared across markets
+        self._image_tasks: Dict[str, asyncio.Future] = {}
+    
+    async def __aenter__(self):
+        """Start one shared browser for every scrape_* call in this block (re-entrant)"""
+        if self._context_depth == 0 and self.crawler is None:
+            self.crawler = await AsyncWebCrawler(config=browser_config).__aenter__()
+            self._owns_crawler = True
+        self._context_depth += 1
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._context_depth -= 1
+        if self._context_depth > 0:
+            return  # An enclosing block still uses the browser and session
+        if self._owns_crawler:
+            await self.crawler.__aexit__(exc_type, exc_val, exc_tb)
+            self.crawler = None
+            self._owns_crawler = False
+        await self.close()
+    
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Get the shared image download session, creating it on first use"""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=50, limit_per_host=10, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=10),
+            )
+        return self._http
+    
+    async def close(self):
+        """Close the image download session and drop this run's image jobs"""
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        self._http = None
+        self._image_tasks.clear()
+    
+    @asynccontextmanager
+    async def _get_crawler(self):
+        """Yield the shared crawler if one is open, otherwise a one-off crawler"""
+        if self.crawler is not None:
+            yield self.crawler
+        else:
+            async with AsyncWebCrawler(config=browser_config) as crawler:
+                yield crawler
     
     def is_allowed_by_robots(self, url: str, user_agent: str = "*") -> bool:
-        """Check if URL is allowed by robots.txt"""
-        # Skip robots.txt check for demo purposes
-        # In production, implement proper robots.txt checking with timeout
-        return True
+        """
+        Check if URL is allowed by robots.txt.
+        Each host's robots.txt is fetched (with a timeout) and parsed once,
+        then reused for every page checked on that host.
+        """
+        parsed = urlparse(url)
+        host = parsed.netloc
+        
+        if host not in self._robots:
+            robots_url = f"{parsed.scheme or 'https'}://{host}/robots.txt"
+            rp = RobotFileParser()
+            rp.set_url(robots_url)
+            try:
+                response = _http.get(robots_url, timeout=10)
+                # Same status handling as RobotFileParser.read()
+                if response.status_code in (401, 403):
+                    rp.disallow_all = True
+                elif response.status_code >= 400:
+                    rp.allow_all = True
+                else:
+                    rp.parse(response.text.splitlines())
+            except Exception as e:
+                print(f"  ⚠️ Could not fetch {robots_url}: {e}")
+                rp = None
+            self._robots[host] = rp
+        
+        rp = self._robots[host]
+        return rp is None or rp.can_fetch(user_agent, url)
+
+    async def _robots_allowed(self, url: str) -> bool:
+        """
+        Async robots.txt check: cached hosts are answered inline, only the
+        first lookup per host goes to a thread so the blocking fetch doesn't
+        stall the other markets' scrapes.
+        """
+        if urlparse(url).netloc in self._robots:
+            return self.is_allowed_by_robots(url)
+        return await asyncio.to_thread(self.is_allowed_by_robots, url)
+
+    async def _download_image_bytes(
+        self, img_url: str, cached: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Optional[bytes], int, Dict[str, Optional[str]]]:
+        """
+        Download a product image and return its raw (compressed) bytes.
+        Decoding into a PIL Image is deferred to whoever needs pixel data,
+        so the scraped product lists only hold small JPEG/PNG payloads.
+        
+        If a cached copy is given, the request is made conditional on its
+        ETag / Last-Modified and the cached bytes are reused on 304.
+        Returns (bytes, status_code, {"etag", "last_modified"}).
+        """
+        headers = {'Accept': IMAGE_ACCEPT_HEADER}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        
+        try:
+            async with self._get_http_session().get(img_url, headers=headers) as img_response:
+                validators = {
+                    'etag': img_response.headers.get('ETag'),
+                    'last_modified': img_response.headers.get('Last-Modified'),
+                }
+                if img_response.status == 304 and cached:
+                    return cached['bytes'], 304, validators
+                if img_response.status == 200:
+                    if (img_response.content_length or 0) > MAX_IMAGE_BYTES:
+                        print(f"    ⚠️ Skipping oversized image: {img_url}")
+                        return None, 0, {}
+                    # Stream the body so oversized chunked assets are abandoned early
+                    chunks = []
+                    size = 0
+                    async for chunk in img_response.content.iter_chunked(64 * 1024):
+                        size += len(chunk)
+                        if size > MAX_IMAGE_BYTES:
+                            print(f"    ⚠️ Skipping oversized image: {img_url}")
+                            return None, 0, {}
+                        chunks.append(chunk)
+                    image_bytes = b''.join(chunks)
+                    if len(image_bytes) > 100:
+                        return image_bytes, 200, validators
+        except Exception as e:
+            print(f"    ⚠️ Failed to download image: {e}")
+        return None, 0, {}
+
+    async def _fetch_product_image(self, img_url: str) -> Optional[bytes]:
+        """
+        Download a product image and resize it to the canonical thumbnail.
+        The resize runs in a process pool so it neither blocks the event loop
+        nor serializes on the GIL.
+        Images fetched within IMAGE_CACHE_TTL are served from the SQLite
+        image cache without any HTTP request.
+        """
+        url_hash = hashlib.sha1(img_url.encode()).hexdigest()
+        cached = product_db.get_cached_image(url_hash)
+        
+        if cached and datetime.now() - datetime.fromisoformat(cached['fetched_at']) < IMAGE_CACHE_TTL:
+            raw_bytes = cached['bytes']
+        else:
+            raw_bytes, status, validators = await self._download_image_bytes(img_url, cached)
+            if status == 304:
+                product_db.touch_cached_image(url_hash)
+            elif status == 200:
+                product_db.cache_image(url_hash, raw_bytes, **validators)
+        
+        if not raw_bytes:
+            return None
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_image_pool(), make_thumbnail, raw_bytes)
+
+    def _product_image_task(self, img_url: str) -> asyncio.Future:
+        """
+        One thumbnail job per image URL: cards (or markets) sharing an image
+        await the same download instead of fetching it again.
+        """
+        task = self._image_tasks.get(img_url)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_product_image(img_url))
+            self._image_tasks[img_url] = task
+        return task
+
+    async def _attach_images(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Download the images of all scraped products concurrently.
+        Products whose image cannot be fetched are dropped.
+        """
+        images = await asyncio.gather(
+            *[self._product_image_task(product["image_url"]) for product in products],
+            return_exceptions=True,
+        )
+        
+        with_images = []
+        for product, image_bytes in zip(products, images):
+            if isinstance(image_bytes, Exception) or not image_bytes:
+                continue
+            product["image_bytes"] = image_bytes
+            with_images.append(product)
+        return with_images
+
+    async def _crawl_pages(
+        self,
+        crawler: AsyncWebCrawler,
+        url: str,
+        max_pages: int,
+        session_prefix: str,
+        wait_for: str,
+    ) -> List[Any]:
+        """
+        Fetch the first `max_pages` pages of a PrestaShop listing concurrently.
+        PrestaShop paginates with `?page=N`, so page URLs are synthesized up
+        front instead of following each page's "next" link in turn.
+        Results are returned in page order; failures are returned as exceptions.
+        """
+        page_urls = [url] + [f"{url}?page={i}" for i in range(2, max_pages + 1)]
+        
+        return await asyncio.gather(*[
+            crawler.arun(
+                url=page_url,
+                config=CrawlerRunConfig(
+                    cache_mode=CacheMode.BYPASS,
+                    session_id=f"{session_prefix}_page_{page_num}",
+                    wait_for=wait_for,
+                    page_timeout=30000,
+                )
+            )
+            for page_num, page_url in enumerate(page_urls, start=1)
+        ], return_exceptions=True)
     
     async def scrape_aziza_online(self) -> List[Dict[str, Any]]:
         """
@@ -55,41 +392,37 @@ class SupermarketScraper:
         URL: https://www.aziza.tn/promotions
         """
         products = []
+        # One timestamp for this scrape run, shared by every product
+        scraped_at = datetime.now().isoformat()
         url = "https://www.aziza.tn/promotions"
         
         try:
-            if not self.is_allowed_by_robots(url):
+            if not await self._robots_allowed(url):
                 print(f"  ⚠️ Blocked by robots.txt: {url}")
                 return products
             
             print(f"  Crawling {url} (JS rendering + scrolling)...")
             
-            # Aziza-specific browser config with JS rendering
-            aziza_browser_config = BrowserConfig(
-                browser_type="chromium",
-                headless=True,
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
-                extra_args=[
-                    "--no-sandbox",
-                    "--disable-dev-shm-usage",
-                    "--disable-blink-features=AutomationControlled",
-                ],
-            )
-            
-            async with AsyncWebCrawler(config=aziza_browser_config) as crawler:
+            # JS rendering is configured per run (js_code), so the shared browser works
+            async with self._get_crawler() as crawler:
                 result = await crawler.arun(
                     url=url,
                     config=CrawlerRunConfig(
                         cache_mode=CacheMode.BYPASS,
                         session_id="aziza_scrape",
                         js_code=[
-                            # Wait for Angular to load
-                            "await new Promise(r => setTimeout(r, 3000));",
-                            # Scroll to load more products (infinite scroll)
+                            # Give Angular a short grace period only if no cards rendered yet
+                            "document.querySelectorAll('div.article-block').length === 0 && await new Promise(r => setTimeout(r, 500));",
+                            # Scroll to load more products (infinite scroll),
+                            # stopping as soon as the card count stops growing
                             """
+                            let prev = 0;
                             for (let i = 0; i < 5; i++) {
                                 window.scrollTo(0, document.body.scrollHeight);
-                                await new Promise(r => setTimeout(r, 2000));
+                                await new Promise(r => requestAnimationFrame(() => setTimeout(r, 300)));
+                                let cur = document.querySelectorAll('div.article-block').length;
+                                if (cur === prev) break;
+                                prev = cur;
                             }
                             """
                         ],
@@ -102,102 +435,96 @@ class SupermarketScraper:
                     print(f"  ❌ Failed to fetch page")
                     return products
                 
-                soup = BeautifulSoup(result.html, 'html.parser')
+                soup = BeautifulSoup(result.html, 'lxml', parse_only=AZIZA_CARD_STRAINER)
                 
                 # Aziza uses div.article-block for each product
-                product_cards = soup.find_all('div', class_='article-block')
+                product_cards = soup.find_all('div', class_='article-block', limit=100)  # Limit to 100 products
                 
                 print(f"  Found {len(product_cards)} product cards")
                 
-                for card in product_cards[:100]:  # Limit to 100 products
-                    try:
-                        # Extract product name (.article-title)
-                        name_elem = card.find(class_='article-title')
-                        name = name_elem.text.strip() if name_elem else None
-                        
-                        # Extract brand (.article-marque)
-                        brand_elem = card.find(class_='article-marque')
-                        brand = brand_elem.text.strip() if brand_elem else ""
-                        
-                        # Extract quantity (.article-quantity)
-                        quantity_elem = card.find(class_='article-quantity')
-                        quantity = quantity_elem.text.strip() if quantity_elem else ""
-                        
-                        # Extract price (split into integer and decimal)
-                        price_integer_elem = card.find(class_='price-integer')
-                        price_decimal_elem = card.find(class_='price-decimal')
-                        
-                        price = None
-                        if price_integer_elem and price_decimal_elem:
-                            # Aziza splits price: "10," + "990" → 10.990 TND
-                            integer_part = price_integer_elem.text.strip().replace(',', '').replace('.', '')
-                            decimal_part = price_decimal_elem.text.strip()
-                            try:
-                                price = float(f"{integer_part}.{decimal_part}")
-                            except ValueError:
-                                pass
-                        
-                        # Extract currency (.price-currency)
-                        currency_elem = card.find(class_='price-currency')
-                        currency = currency_elem.text.strip() if currency_elem else "TND"
-                        
-                        # Extract promo percentage (optional, .promo-badge)
-                        promo_elem = card.find(class_='promo-badge')
-                        promo_percent = promo_elem.text.strip() if promo_elem else None
-                        
-                        # Extract image URL (img.fade-in-image)
-                        img_elem = card.find('img', class_='fade-in-image')
-                        img_url = None
-                        if img_elem:
-                            img_url = img_elem.get('src') or img_elem.get('data-src') or img_elem.get('ng-src')
-                        
-                        # Download image
-                        product_image = None
-                        if img_url:
-                            if not img_url.startswith('http'):
-                                img_url = f"https://www.aziza.tn{img_url}"
-                            
-                            try:
-                                img_response = requests.get(img_url, timeout=10)
-                                if img_response.status_code == 200:
-                                    product_image = Image.open(BytesIO(img_response.content))
-                            except Exception as e:
-                                print(f"    ⚠️ Failed to download image: {e}")
-                        
-                        # Build full product name with brand and quantity
-                        full_name = name
-                        if brand:
-                            full_name = f"{brand} {name}"
-                        if quantity:
-                            full_name = f"{full_name} {quantity}"
-                        
-                        if name and price and product_image:
-                            product_data = {
-                                "name": full_name,
-                                "price": price,
-                                "market": "aziza",
-                                "description": full_name,
-                                "category": "food",
-                                "image": product_image,
-                                "image_url": img_url,
-                                "brand": brand,
-                                "quantity": quantity,
-                                "scraped_at": datetime.now().isoformat()
-                            }
-                            
-                            # Add promo info if available
-                            if promo_percent:
-                                product_data["promo"] = promo_percent
-                            
-                            products.append(product_data)
+                for card in product_cards:
+                    # Extract product name (.article-title)
+                    name_elem = AZIZA_TITLE_SEL.select_one(card)
+                    name = name_elem.text.strip() if name_elem else None
+                    if not name:
+                        continue
+                    
+                    # Extract brand (.article-marque)
+                    brand_elem = AZIZA_BRAND_SEL.select_one(card)
+                    brand = brand_elem.text.strip() if brand_elem else ""
+                    
+                    # Extract quantity (.article-quantity)
+                    quantity_elem = AZIZA_QUANTITY_SEL.select_one(card)
+                    quantity = quantity_elem.text.strip() if quantity_elem else ""
+                    
+                    # Extract price (split into integer and decimal)
+                    price_integer_elem = AZIZA_PRICE_INT_SEL.select_one(card)
+                    price_decimal_elem = AZIZA_PRICE_DEC_SEL.select_one(card)
                     
-                    except Exception as e:
+                    price_millimes = None
+                    if price_integer_elem and price_decimal_elem:
+                        # Aziza splits price: "10," + "990" → 10.990 TND
+                        integer_part = price_integer_elem.text.strip().replace(',', '').replace('.', '')
+                        decimal_part = price_decimal_elem.text.strip()
+                        try:
+                            price_millimes = parse_tnd(integer_part, decimal_part)
+                        except ValueError:
+                            pass
+                    
+                    if not price_millimes:
+                        continue
+                    
+                    # Extract currency (.price-currency)
+                    currency_elem = AZIZA_CURRENCY_SEL.select_one(card)
+                    currency = currency_elem.text.strip() if currency_elem else "TND"
+                    
+                    # Extract promo percentage (optional, .promo-badge)
+                    promo_elem = AZIZA_PROMO_SEL.select_one(card)
+                    promo_percent = promo_elem.text.strip() if promo_elem else None
+                    
+                    # Extract image URL (img.fade-in-image)
+                    img_elem = AZIZA_IMG_SEL.select_one(card)
+                    img_url = None
+                    if img_elem:
+                        img_url = img_elem.get('src') or img_elem.get('data-src') or img_elem.get('ng-src')
+                    
+                    if not img_url:
                         continue
+                    
+                    # Resolve image URL (images are downloaded concurrently after the loop)
+                    if not img_url.startswith('http'):
+                        img_url = f"https://www.aziza.tn{img_url}"
+                    
+                    # Build full product name with brand and quantity
+                    full_name = name
+                    if brand:
+                        full_name = f"{brand} {name}"
+                    if quantity:
+                        full_name = f"{full_name} {quantity}"
+                    
+                    product_data = {
+                        "name": full_name,
+                        "price": price_millimes / 1000,
+                        "price_millimes": price_millimes,
+                        "market": "aziza",
+                        "description": full_name,
+                        "category": "food",
+                        "image_url": img_url,
+                        "brand": brand,
+                        "quantity": quantity,
+                        "scraped_at": scraped_at
+                    }
+                    
+                    # Add promo info if available
+                    if promo_percent:
+                        product_data["promo"] = promo_percent
+                    
+                    products.append(product_data)
         
         except Exception as e:
             print(f"  ❌ Error scraping Aziza: {e}")
         
-        return products
+        return await self._attach_images(products)
     
     async def scrape_mg_tunisia(self) -> List[Dict[str, Any]]:
         """
@@ -206,6 +533,8 @@ class SupermarketScraper:
         URL: https://mg.tn/15-alimentaire
         """
         products = []
+        # One timestamp for this scrape run, shared by every product
+        scraped_at = datetime.now().isoformat()
         base_url = "https://mg.tn"
         
         # Multiple category URLs to scrape
@@ -215,142 +544,117 @@ class SupermarketScraper:
         ]
         
         try:
-            async with AsyncWebCrawler(config=browser_config) as crawler:
+            async with self._get_crawler() as crawler:
+                allowed_urls = []
                 for category_url in category_urls:
-                    if not self.is_allowed_by_robots(category_url):
+                    if await self._robots_allowed(category_url):
+                        allowed_urls.append(category_url)
+                    else:
                         print(f"  ⚠️ Blocked by robots.txt: {category_url}")
-                        continue
-                    
-                    print(f"  Crawling {category_url}...")
-                    
-                    # Pagination: follow up to 3 pages per category
-                    current_url = category_url
-                    page_count = 0
-                    max_pages = 3
+                
+                # Pagination: fetch up to 3 pages per category, all categories
+                # at once on the shared browser (one session per category)
+                max_pages = 3
+                category_results = await asyncio.gather(*[
+                    self._crawl_pages(
+                        crawler, category_url, max_pages,
+                        session_prefix=f"mg_scrape_{i}",
+                        wait_for="css:article.product-miniature",
+                    )
+                    for i, category_url in enumerate(allowed_urls)
+                ])
+                
+                for category_url, page_results in zip(allowed_urls, category_results):
+                    print(f"  Crawled {category_url}")
                     
-                    while current_url and page_count < max_pages:
-                        page_count += 1
-                        print(f"    Page {page_count}...")
-                        
-                        result = await crawler.arun(
-                            url=current_url,
-                            config=CrawlerRunConfig(
-                                cache_mode=CacheMode.BYPASS,
-                                session_id=f"mg_scrape_page_{page_count}",
-                                wait_for="css:article.product-miniature",
-                                page_timeout=30000,
-                            )
-                        )
-                        
-                        if not result.success or not result.html:
+                    for page_count, result in enumerate(page_results, start=1):
+                        if isinstance(result, Exception) or not result.success or not result.html:
                             print(f"    ❌ Failed to fetch page {page_count}")
                             break
                         
-                        soup = BeautifulSoup(result.html, 'html.parser')
+                        soup = BeautifulSoup(result.html, 'lxml', parse_only=MG_CARD_STRAINER)
                         
                         # MG uses article.product-miniature for each product
-                        product_cards = soup.find_all('article', class_='product-miniature')
+                        product_cards = soup.find_all('article', class_='product-miniature', limit=200)
                         
                         print(f"    Found {len(product_cards)} products on page {page_count}")
                         
+                        # Past the last page: PrestaShop serves an empty listing
+                        if not product_cards:
+                            break
+                        
                         for card in product_cards:
-                            try:
-                                # Extract product name (h2.product-title a)
-                                name_elem = card.find('h2', class_='product-title')
-                                if name_elem:
-                                    name_link = name_elem.find('a')
-                                    name = name_link.text.strip() if name_link else None
-                                    product_url = name_link.get('href') if name_link else None
-                                else:
-                                    name = None
-                                    product_url = None
-                                
-                                # Extract category (div.product-category-name)
-                                category_elem = card.find('div', class_='product-category-name')
-                                category = category_elem.text.strip() if category_elem else "food"
-                                
-                                # Extract price (div.price-amount)
-                                price_elem = card.find('div', class_='price-amount')
-                                price = None
-                                if price_elem:
-                                    # Look for price-first-part and price-second-part
-                                    first_part = price_elem.find(class_='price-first-part')
-                                    second_part = price_elem.find(class_='price-second-part')
-                                    
-                                    if first_part and second_part:
-                                        # Combine parts: "12" + "500" → 12.500 TND
-                                        try:
-                                            first = first_part.text.strip().replace(',', '.')
-                                            second = second_part.text.strip()
-                                            price = float(f"{first}.{second}")
-                                        except ValueError:
-                                            pass
-                                    else:
-                                        # Fallback: parse entire price text
-                                        price_text = price_elem.text.strip()
-                                        price_match = re.search(r'(\d+)[.,\s]*(\d+)?', price_text)
-                                        if price_match:
-                                            dinars = int(price_match.group(1))
-                                            millimes = int(price_match.group(2)) if price_match.group(2) else 0
-                                            price = dinars + (millimes / 1000)
-                                
-                                # Extract image URL (img.lazy-product-image[data-src])
-                                img_elem = card.find('img', class_='lazy-product-image')
-                                img_url = None
-                                if img_elem:
-                                    # Lazy-loaded images use data-src
-                                    img_url = img_elem.get('data-src') or img_elem.get('src')
-                                
-                                # Download image
-                                product_image = None
-                                if img_url:
-                                    if not img_url.startswith('http'):
-                                        img_url = f"{base_url}{img_url}"
-                                    
+                            # Extract product name (h2.product-title a)
+                            name_link = MG_NAME_LINK_SEL.select_one(card)
+                            name = name_link.text.strip() if name_link else None
+                            product_url = name_link.get('href') if name_link else None
+                            if not name:
+                                continue
+                            
+                            # Extract category (div.product-category-name)
+                            category_elem = MG_CATEGORY_SEL.select_one(card)
+                            category = category_elem.text.strip() if category_elem else "food"
+                            
+                            # Extract price (div.price-amount)
+                            price_elem = MG_PRICE_SEL.select_one(card)
+                            price_millimes = None
+                            if price_elem:
+                                # Look for price-first-part and price-second-part
+                                first_part = MG_PRICE_FIRST_SEL.select_one(price_elem)
+                                second_part = MG_PRICE_SECOND_SEL.select_one(price_elem)
+                            
+                                if first_part and second_part:
+                                    # Combine parts: "12" + "500" → 12.500 TND
                                     try:
-                                        img_response = requests.get(img_url, timeout=10)
-                                        if img_response.status_code == 200:
-                                            product_image = Image.open(BytesIO(img_response.content))
-                                    except Exception as e:
-                                        print(f"      ⚠️ Failed to download image: {e}")
-                                
-                                if name and price and product_image:
-                                    product_data = {
-                                        "name": name,
-                                        "price": price,
-                                        "market": "mg",
-                                        "description": name,
-                                        "category": category,
-                                        "image": product_image,
-                                        "scraped_at": datetime.now().isoformat()
-                                    }
-                                    
-                                    if product_url:
-                                        product_data["url"] = product_url
-                                    
-                                    products.append(product_data)
+                                        first = first_part.text.strip().replace(',', '').replace('.', '')
+                                        second = second_part.text.strip()
+                                        price_millimes = parse_tnd(first, second)
+                                    except ValueError:
+                                        pass
+                                else:
+                                    # Fallback: parse entire price text
+                                    price_text = price_elem.text.strip()
+                                    price_match = PRICE_RX.search(price_text)
+                                    if price_match:
+                                        price_millimes = parse_tnd(price_match.group(1), price_match.group(2))
                             
-                            except Exception as e:
+                            if not price_millimes:
                                 continue
-                        
-                        # Find next page link (nav.pagination a[rel="next"])
-                        pagination = soup.find('nav', class_='pagination')
-                        next_link = None
-                        if pagination:
-                            next_elem = pagination.find('a', rel='next')
-                            if next_elem:
-                                next_link = next_elem.get('href')
-                        
-                        # Update current_url for next iteration
-                        current_url = next_link
-                        
-                        # Small delay between pages
-                        await asyncio.sleep(1)
+                            
+                            # Extract image URL (img.lazy-product-image[data-src])
+                            img_elem = MG_IMG_SEL.select_one(card)
+                            img_url = None
+                            if img_elem:
+                                # Lazy-loaded images use data-src
+                                img_url = img_elem.get('data-src') or img_elem.get('src')
+                            
+                            if not img_url:
+                                continue
+                            
+                            # Resolve image URL (images are downloaded concurrently after the loop)
+                            if not img_url.startswith('http'):
+                                img_url = f"{base_url}{img_url}"
+                            
+                            product_data = {
+                                "name": name,
+                                "price": price_millimes / 1000,
+                                "price_millimes": price_millimes,
+                                "market": "mg",
+                                "description": name,
+                                "category": category,
+                                "image_url": img_url,
+                                "scraped_at": scraped_at
+                            }
+                            
+                            if product_url:
+                                product_data["url"] = product_url
+                            
+                            products.append(product_data)
         
         except Exception as e:
             print(f"  ❌ Error scraping MG: {e}")
         
-        return products
+        return await self._attach_images(products)
     
     async def scrape_geant_tunisia(self) -> List[Dict[str, Any]]:
         """
@@ -358,179 +662,140 @@ class SupermarketScraper:
         URL: https://www.geantdrive.tn/tunis-city/332-promotions
         """
         products = []
+        # One timestamp for this scrape run, shared by every product
+        scraped_at = datetime.now().isoformat()
         base_url = "https://www.geantdrive.tn"
         
         # Promotions URL
         url = "https://www.geantdrive.tn/tunis-city/332-promotions"
         
         try:
-            if not self.is_allowed_by_robots(url):
+            if not await self._robots_allowed(url):
                 print(f"  ⚠️ Blocked by robots.txt: {url}")
                 return products
             
             print(f"  Crawling {url}...")
             
-            async with AsyncWebCrawler(config=browser_config) as crawler:
-                # Pagination: follow up to 3 pages
-                current_url = url
-                page_count = 0
+            async with self._get_crawler() as crawler:
+                # Pagination: fetch up to 3 pages concurrently
                 max_pages = 3
+                page_results = await self._crawl_pages(
+                    crawler, url, max_pages,
+                    session_prefix="geant_scrape",
+                    wait_for="css:article.product-miniature",
+                )
                 
-                while current_url and page_count < max_pages:
-                    page_count += 1
-                    print(f"    Page {page_count}...")
-                    
-                    result = await crawler.arun(
-                        url=current_url,
-                        config=CrawlerRunConfig(
-                            cache_mode=CacheMode.BYPASS,
-                            session_id=f"geant_scrape_page_{page_count}",
-                            wait_for="css:article.product-miniature",
-                            page_timeout=30000,
-                        )
-                    )
-                    
-                    if not result.success or not result.html:
+                for page_count, result in enumerate(page_results, start=1):
+                    if isinstance(result, Exception) or not result.success or not result.html:
                         print(f"    ❌ Failed to fetch page {page_count}")
                         break
                     
-                    soup = BeautifulSoup(result.html, 'html.parser')
+                    soup = BeautifulSoup(result.html, 'lxml', parse_only=GEANT_CARD_STRAINER)
                     
                     # Geant uses div.item-product > article.product-miniature
-                    product_containers = soup.find_all('div', class_='item-product')
+                    product_containers = soup.find_all('div', class_='item-product', limit=200)
                     
                     print(f"    Found {len(product_containers)} products on page {page_count}")
                     
+                    # Past the last page: PrestaShop serves an empty listing
+                    if not product_containers:
+                        break
+                    
                     for container in product_containers:
-                        try:
-                            # Find the article inside
-                            article = container.find('article', class_='product-miniature')
-                            if not article:
-                                continue
-                            
-                            # Extract product ID (data-id-product attribute)
-                            product_id = article.get('data-id-product')
-                            
-                            # Extract product name (h2.product-title a)
-                            name_elem = article.find('h2', class_='product-title')
-                            name = None
-                            product_url = None
-                            if name_elem:
-                                name_link = name_elem.find('a')
-                                if name_link:
-                                    name = name_link.text.strip()
-                                    product_url = name_link.get('href')
-                            
-                            # Extract brand (p.manufacturer_product)
-                            brand_elem = article.find('p', class_='manufacturer_product')
-                            brand = brand_elem.text.strip() if brand_elem else ""
-                            
-                            # Extract short description (div.product_short)
-                            desc_elem = article.find('div', class_='product_short')
-                            short_desc = desc_elem.text.strip() if desc_elem else ""
-                            
-                            # Extract price (span.price)
-                            price_elem = article.find('span', class_='price')
-                            price = None
-                            if price_elem:
-                                price_text = price_elem.text.strip()
-                                # Parse price with comma decimal: "12,500 DT" → 12.500
-                                price_match = re.search(r'(\d+)[.,](\d+)', price_text)
-                                if price_match:
-                                    dinars = int(price_match.group(1))
-                                    millimes = int(price_match.group(2))
-                                    price = dinars + (millimes / 1000)
-                            
-                            # Extract old price (span.regular-price) - optional
-                            old_price_elem = article.find('span', class_='regular-price')
-                            old_price = None
-                            if old_price_elem:
-                                old_price_text = old_price_elem.text.strip()
-                                price_match = re.search(r'(\d+)[.,](\d+)', old_price_text)
-                                if price_match:
-                                    dinars = int(price_match.group(1))
-                                    millimes = int(price_match.group(2))
-                                    old_price = dinars + (millimes / 1000)
-                            
-                            # Extract promo flag (ul.product-flags li.product-flag.discount)
-                            promo_flag = None
-                            flags_elem = article.find('ul', class_='product-flags')
-                            if flags_elem:
-                                discount_flag = flags_elem.find('li', class_='discount')
-                                if discount_flag:
-                                    promo_flag = discount_flag.text.strip()
-                            
-                            # Extract image URL (img.img-responsive[src])
-                            img_elem = article.find('img', class_='img-responsive')
-                            img_url = None
-                            if img_elem:
-                                img_url = img_elem.get('src')
-                            
-                            # Download image
-                            product_image = None
-                            if img_url:
-                                if not img_url.startswith('http'):
-                                    img_url = f"{base_url}{img_url}"
-                                
-                                try:
-                                    img_response = requests.get(img_url, timeout=10)
-                                    if img_response.status_code == 200:
-                                        product_image = Image.open(BytesIO(img_response.content))
-                                except Exception as e:
-                                    print(f"      ⚠️ Failed to download image: {e}")
-                            
-                            # Build full product name with brand
-                            full_name = name
-                            if brand:
-                                full_name = f"{brand} {name}"
-                            
-                            if name and price and product_image:
-                                product_data = {
-                                    "name": full_name,
-                                    "price": price,
-                                    "market": "geant",
-                                    "description": short_desc or full_name,
-                                    "category": "food",
-                                    "image": product_image,
-                                    "scraped_at": datetime.now().isoformat()
-                                }
-                                
-                                # Add optional fields
-                                if product_id:
-                                    product_data["product_id"] = product_id
-                                if product_url:
-                                    product_data["url"] = product_url
-                                if old_price:
-                                    product_data["old_price"] = old_price
-                                if promo_flag:
-                                    product_data["promo"] = promo_flag
-                                
-                                products.append(product_data)
+                        # Find the article inside
+                        article = GEANT_ARTICLE_SEL.select_one(container)
+                        if not article:
+                            continue
                         
-                        except Exception as e:
+                        # Extract product ID (data-id-product attribute)
+                        product_id = article.get('data-id-product')
+                        
+                        # Extract product name (h2.product-title a)
+                        name_link = GEANT_NAME_LINK_SEL.select_one(article)
+                        name = name_link.text.strip() if name_link else None
+                        product_url = name_link.get('href') if name_link else None
+                        if not name:
                             continue
-                    
-                    # Find next page link (.pagination a.next)
-                    pagination = soup.find('div', class_='pagination')
-                    if not pagination:
-                        pagination = soup.find('nav', class_='pagination')
-                    
-                    next_link = None
-                    if pagination:
-                        next_elem = pagination.find('a', class_='next')
-                        if next_elem:
-                            next_link = next_elem.get('href')
-                    
-                    # Update current_url for next iteration
-                    current_url = next_link
-                    
-                    # Small delay between pages
-                    await asyncio.sleep(1)
+                        
+                        # Extract brand (p.manufacturer_product)
+                        brand_elem = GEANT_BRAND_SEL.select_one(article)
+                        brand = brand_elem.text.strip() if brand_elem else ""
+                        
+                        # Extract short description (div.product_short)
+                        desc_elem = GEANT_DESC_SEL.select_one(article)
+                        short_desc = desc_elem.text.strip() if desc_elem else ""
+                        
+                        # Extract price (span.price)
+                        price_elem = GEANT_PRICE_SEL.select_one(article)
+                        price_millimes = None
+                        if price_elem:
+                            price_text = price_elem.text.strip()
+                            # Parse price with comma decimal: "12,500 DT" → 12.500
+                            price_match = PRICE_STRICT_RX.search(price_text)
+                            if price_match:
+                                price_millimes = parse_tnd(price_match.group(1), price_match.group(2))
+                        
+                        if not price_millimes:
+                            continue
+                        
+                        # Extract old price (span.regular-price) - optional
+                        old_price_elem = GEANT_OLD_PRICE_SEL.select_one(article)
+                        old_price = None
+                        if old_price_elem:
+                            old_price_text = old_price_elem.text.strip()
+                            price_match = PRICE_STRICT_RX.search(old_price_text)
+                            if price_match:
+                                old_price = parse_tnd(price_match.group(1), price_match.group(2)) / 1000
+                        
+                        # Extract promo flag (ul.product-flags li.product-flag.discount)
+                        discount_flag = GEANT_PROMO_SEL.select_one(article)
+                        promo_flag = discount_flag.text.strip() if discount_flag else None
+                        
+                        # Extract image URL (img.img-responsive[src])
+                        img_elem = GEANT_IMG_SEL.select_one(article)
+                        img_url = None
+                        if img_elem:
+                            img_url = img_elem.get('src')
+                        
+                        if not img_url:
+                            continue
+                        
+                        # Resolve image URL (images are downloaded concurrently after the loop)
+                        if not img_url.startswith('http'):
+                            img_url = f"{base_url}{img_url}"
+                        
+                        # Build full product name with brand
+                        full_name = name
+                        if brand:
+                            full_name = f"{brand} {name}"
+                        
+                        product_data = {
+                            "name": full_name,
+                            "price": price_millimes / 1000,
+                            "price_millimes": price_millimes,
+                            "market": "geant",
+                            "description": short_desc or full_name,
+                            "category": "food",
+                            "image_url": img_url,
+                            "scraped_at": scraped_at
+                        }
+                        
+                        # Add optional fields
+                        if product_id:
+                            product_data["product_id"] = product_id
+                        if product_url:
+                            product_data["url"] = product_url
+                        if old_price:
+                            product_data["old_price"] = old_price
+                        if promo_flag:
+                            product_data["promo"] = promo_flag
+                        
+                        products.append(product_data)
         
         except Exception as e:
             print(f"  ❌ Error scraping Geant: {e}")
         
-        return products
+        return await self._attach_images(products)
     
     async def scrape_carrefour_tunisia(self) -> List[Dict[str, Any]]:
         """
@@ -538,16 +803,18 @@ class SupermarketScraper:
         Example: https://www.carrefour.tn/
         """
         products = []
+        # One timestamp for this scrape run, shared by every product
+        scraped_at = datetime.now().isoformat()
         url = "https://www.carrefour.tn/maftn/fr/promotions"  # Update with actual URL
         
         try:
-            if not self.is_allowed_by_robots(url):
+            if not await self._robots_allowed(url):
                 print(f"  ⚠️ Blocked by robots.txt: {url}")
                 return products
             
             print(f"  Crawling {url}...")
             
-            async with AsyncWebCrawler(config=browser_config) as crawler:
+            async with self._get_crawler() as crawler:
                 result = await crawler.arun(
                     url=url,
                     config=CrawlerRunConfig(
@@ -560,65 +827,56 @@ class SupermarketScraper:
                     print(f"  ❌ Failed to fetch page")
                     return products
                 
-                soup = BeautifulSoup(result.html, 'html.parser')
+                soup = BeautifulSoup(result.html, 'lxml', parse_only=CARREFOUR_CARD_STRAINER)
                 
                 # Carrefour-specific selectors (adjust based on actual site)
-                product_cards = soup.find_all('div', class_='product-item')
-                
-                if not product_cards:
-                    product_cards = soup.find_all('article', class_='product')
+                product_cards = CARREFOUR_CARD_SEL.select(soup, limit=50)
                 
                 print(f"  Found {len(product_cards)} product cards")
                 
-                for card in product_cards[:50]:
-                    try:
-                        name_elem = card.find(['a', 'h3'], class_=re.compile('product.*name'))
-                        name = name_elem.text.strip() if name_elem else None
-                        
-                        price_elem = card.find('span', class_=re.compile('price'))
-                        price_text = price_elem.text.strip() if price_elem else None
-                        
-                        price = None
-                        if price_text:
-                            price_match = re.search(r'(\d+)[.,\s]*(\d+)?', price_text)
-                            if price_match:
-                                dinars = int(price_match.group(1))
-                                millimes = int(price_match.group(2)) if price_match.group(2) else 0
-                                price = dinars + (millimes / 1000)
-                        
-                        img_elem = card.find('img')
-                        img_url = img_elem.get('src') or img_elem.get('data-src') if img_elem else None
-                        
-                        product_image = None
-                        if img_url:
-                            if not img_url.startswith('http'):
-                                img_url = f"https://www.carrefour.tn{img_url}"
-                            
-                            try:
-                                img_response = requests.get(img_url, timeout=10)
-                                if img_response.status_code == 200:
-                                    product_image = Image.open(BytesIO(img_response.content))
-                            except:
-                                pass
-                        
-                        if name and price and product_image:
-                            products.append({
-                                "name": name,
-                                "price": price,
-                                "market": "carrefour",
-                                "description": name,
-                                "category": "food",
-                                "image": product_image,
-                                "scraped_at": datetime.now().isoformat()
-                            })
+                for card in product_cards:
+                    name_elem = CARREFOUR_NAME_SEL.select_one(card)
+                    name = name_elem.text.strip() if name_elem else None
+                    if not name:
+                        continue
+                    
+                    price_elem = PRICE_SPAN_SEL.select_one(card)
+                    price_text = price_elem.text.strip() if price_elem else None
+                    
+                    price_millimes = None
+                    if price_text:
+                        price_match = PRICE_RX.search(price_text)
+                        if price_match:
+                            price_millimes = parse_tnd(price_match.group(1), price_match.group(2))
+                    
+                    if not price_millimes:
+                        continue
                     
-                    except Exception as e:
+                    img_elem = IMG_SEL.select_one(card)
+                    img_url = img_elem.get('src') or img_elem.get('data-src') if img_elem else None
+                    
+                    if not img_url:
                         continue
+                    
+                    # Resolve image URL (images are downloaded concurrently after the loop)
+                    if not img_url.startswith('http'):
+                        img_url = f"https://www.carrefour.tn{img_url}"
+                    
+                    products.append({
+                        "name": name,
+                        "price": price_millimes / 1000,
+                        "price_millimes": price_millimes,
+                        "market": "carrefour",
+                        "description": name,
+                        "category": "food",
+                        "image_url": img_url,
+                        "scraped_at": scraped_at
+                    })
         
         except Exception as e:
             print(f"  ❌ Error scraping Carrefour: {e}")
         
-        return products
+        return await self._attach_images(products)
     
     async def scrape_monoprix_tunisia(self) -> List[Dict[str, Any]]:
         """
@@ -626,16 +884,18 @@ class SupermarketScraper:
         Example: https://courses.monoprix.tn/
         """
         products = []
+        # One timestamp for this scrape run, shared by every product
+        scraped_at = datetime.now().isoformat()
         url = "https://courses.monoprix.tn/promotions"  # Update with actual URL
         
         try:
-            if not self.is_allowed_by_robots(url):
+            if not await self._robots_allowed(url):
                 print(f"  ⚠️ Blocked by robots.txt: {url}")
                 return products
             
             print(f"  Crawling {url}...")
             
-            async with AsyncWebCrawler(config=browser_config) as crawler:
+            async with self._get_crawler() as crawler:
                 result = await crawler.arun(
                     url=url,
                     config=CrawlerRunConfig(
@@ -648,132 +908,103 @@ class SupermarketScraper:
                     print(f"  ❌ Failed to fetch page")
                     return products
                 
-                soup = BeautifulSoup(result.html, 'html.parser')
+                soup = BeautifulSoup(result.html, 'lxml', parse_only=MONOPRIX_CARD_STRAINER)
                 
                 # Monoprix-specific selectors
-                product_cards = soup.find_all('article', class_='product')
-                
-                if not product_cards:
-                    product_cards = soup.find_all('div', class_='product-card')
+                product_cards = MONOPRIX_CARD_SEL.select(soup, limit=50)
                 
                 print(f"  Found {len(product_cards)} product cards")
                 
-                for card in product_cards[:50]:
-                    try:
-                        name_elem = card.find(['h2', 'h3'], class_=re.compile('product.*title|name'))
-                        name = name_elem.text.strip() if name_elem else None
-                        
-                        price_elem = card.find('span', class_=re.compile('price'))
-                        price_text = price_elem.text.strip() if price_elem else None
-                        
-                        price = None
-                        if price_text:
-                            price_match = re.search(r'(\d+)[.,\s]*(\d+)?', price_text)
-                            if price_match:
-                                dinars = int(price_match.group(1))
-                                millimes = int(price_match.group(2)) if price_match.group(2) else 0
-                                price = dinars + (millimes / 1000)
-                        
-                        img_elem = card.find('img')
-                        img_url = img_elem.get('src') or img_elem.get('data-src') if img_elem else None
-                        
-                        product_image = None
-                        if img_url:
-                            if not img_url.startswith('http'):
-                                img_url = f"https://courses.monoprix.tn{img_url}"
-                            
-                            try:
-                                img_response = requests.get(img_url, timeout=10)
-                                if img_response.status_code == 200:
-                                    product_image = Image.open(BytesIO(img_response.content))
-                            except:
-                                pass
-                        
-                        if name and price and product_image:
-                            products.append({
-                                "name": name,
-                                "price": price,
-                                "market": "monoprix",
-                                "description": name,
-                                "category": "food",
-                                "image": product_image,
-                                "scraped_at": datetime.now().isoformat()
-                            })
+                for card in product_cards:
+                    name_elem = MONOPRIX_NAME_SEL.select_one(card)
+                    name = name_elem.text.strip() if name_elem else None
+                    if not name:
+                        continue
+                    
+                    price_elem = PRICE_SPAN_SEL.select_one(card)
+                    price_text = price_elem.text.strip() if price_elem else None
+                    
+                    price_millimes = None
+                    if price_text:
+                        price_match = PRICE_RX.search(price_text)
+                        if price_match:
+                            price_millimes = parse_tnd(price_match.group(1), price_match.group(2))
+                    
+                    if not price_millimes:
+                        continue
+                    
+                    img_elem = IMG_SEL.select_one(card)
+                    img_url = img_elem.get('src') or img_elem.get('data-src') if img_elem else None
                     
-                    except Exception as e:
+                    if not img_url:
                         continue
+                    
+                    # Resolve image URL (images are downloaded concurrently after the loop)
+                    if not img_url.startswith('http'):
+                        img_url = f"https://courses.monoprix.tn{img_url}"
+                    
+                    products.append({
+                        "name": name,
+                        "price": price_millimes / 1000,
+                        "price_millimes": price_millimes,
+                        "market": "monoprix",
+                        "description": name,
+                        "category": "food",
+                        "image_url": img_url,
+                        "scraped_at": scraped_at
+                    })
         
         except Exception as e:
             print(f"  ❌ Error scraping Monoprix: {e}")
         
-        return products
+        return await self._attach_images(products)
+    
+    async def scrape_all(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Scrape every market concurrently.
+        Each site is network-bound and uses its own crawler session, so the
+        total wall time is roughly that of the slowest site.
+        A failing site is logged and reported as an empty list.
+        """
+        scrapers = {
+            'aziza': self.scrape_aziza_online(),
+            'mg': self.scrape_mg_tunisia(),
+            'geant': self.scrape_geant_tunisia(),
+            'carrefour': self.scrape_carrefour_tunisia(),
+            'monoprix': self.scrape_monoprix_tunisia(),
+        }
+        # Re-entrant: inside run_weekly_scrape's block this reuses its browser
+        async with self:
+            results = await asyncio.gather(*scrapers.values(), return_exceptions=True)
+        
+        all_products = {}
+        for market, result in zip(scrapers.keys(), results):
+            if isinstance(result, Exception):
+                print(f"  ❌ Error scraping {market}: {result}")
+                result = []
+            all_products[market] = result
+        return all_products
     
     async def scrape_all_markets(self) -> Dict[str, List[Dict[str, Any]]]:
         """
-        Scrape all configured supermarkets.
+        Scrape all configured supermarkets concurrently.
         Run this weekly to update product database.
-        Saves products to SQLite database.
+        Saves products to SQLite database, serialized per market.
         """
         print("🕷️ Starting weekly supermarket scraping...")
         print("=" * 60)
         
-        all_products = {}
+        # Scrape all markets concurrently (network-bound)
+        print("\n📍 Scraping Aziza, MG, Geant, Carrefour and Monoprix concurrently...")
+        all_products = await self.scrape_all()
         
-        # Scrape Aziza
-        print("\n📍 Scraping Aziza...")
-        aziza_products = await self.scrape_aziza_online()
-        all_products['aziza'] = aziza_products
-        print(f"   ✓ Found {len(aziza_products)} products from Aziza")
-        
-        # Save to database
-        if aziza_products:
-            print(f"   💾 Saving to database...")
-            saved = product_db.batch_insert_products(aziza_products)
-            print(f"   ✓ Saved {saved} products to database")
-        
-        # Scrape MG
-        print("\n📍 Scraping MG...")
-        mg_products = await self.scrape_mg_tunisia()
-        all_products['mg'] = mg_products
-        print(f"   ✓ Found {len(mg_products)} products from MG")
-        
-        if mg_products:
-            print(f"   💾 Saving to database...")
-            saved = product_db.batch_insert_products(mg_products)
-            print(f"   ✓ Saved {saved} products to database")
-        
-        # Scrape Geant
-        print("\n📍 Scraping Geant...")
-        geant_products = await self.scrape_geant_tunisia()
-        all_products['geant'] = geant_products
-        print(f"   ✓ Found {len(geant_products)} products from Geant")
-        
-        if geant_products:
-            print(f"   💾 Saving to database...")
-            saved = product_db.batch_insert_products(geant_products)
-            print(f"   ✓ Saved {saved} products to database")
-        
-        # Scrape Carrefour
-        print("\n📍 Scraping Carrefour...")
-        carrefour_products = await self.scrape_carrefour_tunisia()
-        all_products['carrefour'] = carrefour_products
-        print(f"   ✓ Found {len(carrefour_products)} products from Carrefour")
-        
-        if carrefour_products:
-            print(f"   💾 Saving to database...")
-            saved = product_db.batch_insert_products(carrefour_products)
-            print(f"   ✓ Saved {saved} products to database")
-        
-        # Scrape Monoprix
-        print("\n📍 Scraping Monoprix...")
-        monoprix_products = await self.scrape_monoprix_tunisia()
-        all_products['monoprix'] = monoprix_products
-        print(f"   ✓ Found {len(monoprix_products)} products from Monoprix")
-        
-        if monoprix_products:
-            print(f"   💾 Saving to database...")
-            saved = product_db.batch_insert_products(monoprix_products)
-            print(f"   ✓ Saved {saved} products to database")
+        # Save to database one market at a time (single SQLite connection)
+        for market, market_products in all_products.items():
+            print(f"\n📍 {market.capitalize()}: found {len(market_products)} products")
+            if market_products:
+                print(f"   💾 Saving to database...")
+                saved = product_db.batch_insert_products(market_products)
+                print(f"   ✓ Saved {saved} products to database")
         
         self.last_scrape_time = datetime.now()
         self.scraped_data = all_products
@@ -804,4 +1035,5 @@ supermarket_scraper = SupermarketScraper()
 # Async helper function
 async def run_weekly_scrape():
     """Run the weekly scraping job"""
-    return await supermarket_scraper.scrape_all_markets()
+    async with supermarket_scraper:
+        return await supermarket_scraper.scrape_all_markets()
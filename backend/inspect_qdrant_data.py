@@ -7,53 +7,68 @@ sys.path.append(str(Path(__file__).parent))
 
 from app.services.qdrant_service import qdrant_service
 from app.core.config import settings
-from collections import defaultdict
+from qdrant_client.models import Filter, FieldCondition, MatchText
+from collections import Counter, defaultdict
+from itertools import chain
+import numpy as np
 
-def inspect_qdrant():
-    """Show what data is in Qdrant for each market"""
-    
-    print("\n" + "="*70)
-    print("QDRANT DATA INSPECTION")
-    print("="*70)
-    
-    print(f"\nCollection: {settings.COLLECTION_SUPERMARKET}")
-    
-    # Scroll through all products
-    print("\n[LOADING] Fetching all products from Qdrant...")
-    
-    all_products = []
+# Points fetched per scroll request (fewer round-trips than the old 100)
+SCROLL_BATCH_SIZE = 1024
+
+def _iter_qdrant_payloads(collection_name, predicate=None, scroll_filter=None, batch_size=SCROLL_BATCH_SIZE):
+    """
+    Yield point payloads in a collection, one scroll page at a time.
+    scroll_filter is applied by Qdrant; predicate(payload), if given, client-side.
+    """
     offset = None
     
     while True:
-        result = qdrant_service.client.scroll(
-            collection_name=settings.COLLECTION_SUPERMARKET,
-            limit=100,
+        points, offset = qdrant_service.client.scroll(
+            collection_name=collection_name,
+            limit=batch_size,
             offset=offset,
+            scroll_filter=scroll_filter,
             with_payload=True,
             with_vectors=False
         )
         
-        points, next_offset = result
-        
-        if not points:
-            break
-        
-        all_products.extend(points)
+        if predicate is None:
+            yield from (point.payload for point in points)
+        else:
+            yield from (point.payload for point in points if predicate(point.payload))
         
-        if next_offset is None:
+        if offset is None:
             break
-        
-        offset = next_offset
-        print(f"  Loaded {len(all_products)} products...")
+
+def _name_contains(search_term):
+    """Predicate: case-insensitive substring match on the product name"""
+    search_term_lower = search_term.lower()
+    return lambda payload: search_term_lower in payload.get('name', '').lower()
+
+def inspect_qdrant():
+    """Show what data is in Qdrant for each market"""
     
-    print(f"\n[OK] Total products in Qdrant: {len(all_products)}")
+    print("\n" + "="*70)
+    print("QDRANT DATA INSPECTION")
+    print("="*70)
     
-    # Group by market
+    print(f"\nCollection: {settings.COLLECTION_SUPERMARKET}")
+    
+    # Scroll through all products
+    print("\n[LOADING] Fetching all products from Qdrant...")
+    
+    # Group by market while streaming (payloads are only held once)
     by_market = defaultdict(list)
+    total_products = 0
     
-    for point in all_products:
-        market = point.payload.get('market', 'Unknown')
-        by_market[market].append(point.payload)
+    for payload in _iter_qdrant_payloads(settings.COLLECTION_SUPERMARKET):
+        market = payload.get('market', 'Unknown')
+        by_market[market].append(payload)
+        total_products += 1
+        if total_products % SCROLL_BATCH_SIZE == 0:
+            print(f"  Loaded {total_products} products...")
+    
+    print(f"\n[OK] Total products in Qdrant: {total_products}")
     
     # Show statistics
     print("\n" + "-"*70)
@@ -64,11 +79,11 @@ def inspect_qdrant():
         products = by_market[market]
         print(f"\n{market}: {len(products)} products")
         
-        # Price statistics
-        prices = [p.get('price', 0) for p in products if p.get('price')]
-        if prices:
-            print(f"  Price range: {min(prices):.2f} - {max(prices):.2f} TND")
-            print(f"  Average price: {sum(prices)/len(prices):.2f} TND")
+        # Price statistics (vectorized)
+        prices = np.fromiter((p['price'] for p in products if p.get('price')), dtype=np.float64)
+        if prices.size:
+            print(f"  Price range: {prices.min():.2f} - {prices.max():.2f} TND")
+            print(f"  Average price: {prices.mean():.2f} TND")
         
         # Sample products
         print(f"  Sample products:")
@@ -82,10 +97,10 @@ def inspect_qdrant():
     print("PRODUCTS BY CATEGORY")
     print("-"*70)
     
-    by_category = defaultdict(int)
-    for point in all_products:
-        category = point.payload.get('category', 'unknown')
-        by_category[category] += 1
+    by_category = Counter(
+        payload.get('category', 'unknown')
+        for payload in chain.from_iterable(by_market.values())
+    )
     
     for category in sorted(by_category.keys()):
         count = by_category[category]
@@ -96,15 +111,14 @@ def inspect_qdrant():
     print("TOP BRANDS")
     print("-"*70)
     
-    by_brand = defaultdict(int)
-    for point in all_products:
-        brand = point.payload.get('brand')
-        if brand:
-            by_brand[brand] += 1
+    by_brand = Counter(
+        payload['brand']
+        for payload in chain.from_iterable(by_market.values())
+        if payload.get('brand')
+    )
     
     # Top 10 brands
-    top_brands = sorted(by_brand.items(), key=lambda x: x[1], reverse=True)[:10]
-    for brand, count in top_brands:
+    for brand, count in by_brand.most_common(10):
         print(f"  {brand}: {count} products")
     
     # Search for specific product
@@ -115,11 +129,8 @@ def inspect_qdrant():
     search_term = "café"
     print(f"\nSearching for '{search_term}'...")
     
-    matching = []
-    for point in all_products:
-        name = point.payload.get('name', '').lower()
-        if search_term.lower() in name:
-            matching.append(point.payload)
+    matches = _name_contains(search_term)
+    matching = [payload for payload in chain.from_iterable(by_market.values()) if matches(payload)]
     
     print(f"Found {len(matching)} products matching '{search_term}':")
     for i, product in enumerate(matching[:10], 1):
@@ -137,75 +148,38 @@ def inspect_qdrant():
 
 def export_to_json(filename):
     """Export all Qdrant data to JSON"""
-    import json
+    import orjson
     
     print(f"\n[EXPORTING] Fetching all products...")
     
-    all_products = []
-    offset = None
-    
-    while True:
-        result = qdrant_service.client.scroll(
-            collection_name=settings.COLLECTION_SUPERMARKET,
-            limit=100,
-            offset=offset,
-            with_payload=True,
-            with_vectors=False
-        )
-        
-        points, next_offset = result
-        
-        if not points:
-            break
-        
-        all_products.extend([p.payload for p in points])
-        
-        if next_offset is None:
-            break
-        
-        offset = next_offset
-    
-    # Save to file
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(all_products, f, indent=2, ensure_ascii=False)
-    
-    print(f"[OK] Exported {len(all_products)} products to {filename}")
+    # Stream payloads straight to the file as a JSON array (orjson emits UTF-8 bytes)
+    count = 0
+    with open(filename, 'wb') as f:
+        f.write(b'[\n')
+        for payload in _iter_qdrant_payloads(settings.COLLECTION_SUPERMARKET):
+            if count:
+                f.write(b',\n')
+            f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+            count += 1
+        f.write(b'\n]\n')
+    
+    print(f"[OK] Exported {count} products to {filename}")
 
 def search_products(search_term):
     """Search for products by name"""
     
     print(f"\n[SEARCHING] Looking for '{search_term}'...")
     
-    all_products = []
-    offset = None
-    
-    while True:
-        result = qdrant_service.client.scroll(
-            collection_name=settings.COLLECTION_SUPERMARKET,
-            limit=100,
-            offset=offset,
-            with_payload=True,
-            with_vectors=False
-        )
-        
-        points, next_offset = result
-        
-        if not points:
-            break
-        
-        all_products.extend(points)
-        
-        if next_offset is None:
-            break
-        
-        offset = next_offset
-    
-    # Search
-    matching = []
-    for point in all_products:
-        name = point.payload.get('name', '').lower()
-        if search_term.lower() in name:
-            matching.append(point.payload)
+    # Let Qdrant match on its full-text 'name' index (created by the ingestion
+    # path, not here: this script is read-only): only hits come over the wire
+    try:
+        name_filter = Filter(must=[FieldCondition(key='name', match=MatchText(text=search_term))])
+        matching = list(_iter_qdrant_payloads(settings.COLLECTION_SUPERMARKET, scroll_filter=name_filter))
+    except Exception as e:
+        # Fall back to filtering during the scroll
+        print(f"[WARNING] Server-side text search unavailable ({e}), scanning client-side")
+        print("          Re-run the ingestion to create the 'name' text index")
+        matching = list(_iter_qdrant_payloads(settings.COLLECTION_SUPERMARKET, _name_contains(search_term)))
     
     print(f"\n[FOUND] {len(matching)} products matching '{search_term}':\n")
     
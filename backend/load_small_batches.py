@@ -6,12 +6,17 @@ Script pour charger les produits par petits lots avec gestion d'erreurs
 import sys
 import os
 import asyncio
-import time
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app.database import db
-from app.data_loader import data_loader
+from app.database_usershop import db as usershop_db
+from app.data_loader_usershop import data_loader
+
+# Essais par sous-lot dans upload_points : il attend le retry_after des 429 et
+# renvoie les mêmes points (ids inchangés). Pas de nouvel essai autour
+# d'add_products, qui ré-embedderait le lot et créerait des doublons
+MAX_RETRIES = 5
+UPLOAD_CONCURRENCY = 4
 
 async def load_in_small_batches():
     """Charge les produits par petits lots"""
@@ -21,11 +26,11 @@ async def load_in_small_batches():
     try:
         # Initialiser la collection
         print("\n⚙️ Initialisation...")
-        await db.initialize_collection()
+        await usershop_db.initialize_collection()
         
         # Compter les produits existants
         try:
-            count_result = db.client.count(collection_name=db.collection_name)
+            count_result = usershop_db.client.count(collection_name=usershop_db.collection_name)
             existing_count = count_result.count
         except:
             existing_count = 0
@@ -49,36 +54,42 @@ async def load_in_small_batches():
         
         print(f"\n🔄 Chargement en {total_batches} lots de {batch_size} produits...")
         
-        for i in range(0, total_products, batch_size):
-            batch_products = products[i:i + batch_size]
-            batch_num = i // batch_size + 1
-            
-            print(f"\n📦 Lot {batch_num}/{total_batches} ({len(batch_products)} produits)...")
-            
-            try:
-                # Charger ce lot
-                upload_stats = await db.add_products(batch_products)
-                
-                # Afficher quelques étapes
-                for step in upload_stats["steps"][-3:]:
-                    print(f"  {step}")
-                
-                # Vérifier le compte
-                count_result = db.client.count(collection_name=db.collection_name)
-                current_count = count_result.count
-                print(f"  ✅ Total actuel: {current_count} produits")
-                
-                # Petite pause entre les lots
-                if batch_num < total_batches:
-                    time.sleep(2)
-                
-            except Exception as e:
-                print(f"  ❌ Erreur sur le lot {batch_num}: {e}")
-                print(f"  ⏭️ Passage au lot suivant...")
+        # Charger le modèle d'embedding une seule fois avant les uploads parallèles
+        usershop_db._get_embedding_model()
+        
+        # Jusqu'à UPLOAD_CONCURRENCY lots en vol sur la même boucle : add_products
+        # fait l'embedding et l'upload dans des threads, l'embedding d'un lot
+        # chevauche donc l'upload d'un autre
+        sem = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+        
+        async def _upload(batch_num, batch_products):
+            async with sem:
+                print(f"\n📦 Lot {batch_num}/{total_batches} ({len(batch_products)} produits)...")
+                # wait=True : les points sont appliqués avant le comptage final
+                return await usershop_db.add_products(batch_products, max_retries=MAX_RETRIES, wait=True)
+        
+        # Indexation HNSW suspendue une seule fois pour tout le chargement
+        async with usershop_db.bulk_load():
+            results = await asyncio.gather(
+                *[
+                    _upload(i // batch_size + 1, products[i:i + batch_size])
+                    for i in range(0, total_products, batch_size)
+                ],
+                return_exceptions=True
+            )
+        
+        for batch_num, upload_stats in enumerate(results, 1):
+            if isinstance(upload_stats, Exception):
+                print(f"  ❌ Erreur sur le lot {batch_num}: {upload_stats}")
                 continue
+            
+            # Afficher quelques étapes
+            print(f"\n📦 Lot {batch_num}/{total_batches}:")
+            for step in upload_stats["steps"][-3:]:
+                print(f"  {step}")
         
         # Vérifier le résultat final
-        count_result = db.client.count(collection_name=db.collection_name)
+        count_result = usershop_db.client.count(collection_name=usershop_db.collection_name)
         final_count = count_result.count
         
         print("\n" + "=" * 60)
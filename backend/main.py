@@ -1,5 +1,6 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from contextlib import asynccontextmanager
 from models import SearchQuery, RecommendationResponse
 from services.recommendation_service import RecommendationService
@@ -8,17 +9,54 @@ from services.marketing_service import MarketingService
 from services.marketplace_service import MarketplaceService
 from services.order_service import OrderService
 from services.settings_service import SettingsService
+from services.http_client import close_http_client
+from services.error_middleware import InternalErrorMiddleware
 from config import get_settings
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Dict, Annotated
+from logging.handlers import QueueHandler, QueueListener
+import logging
+import queue
+import hashlib
+import time
+import orjson
 
-# Service global
-recommendation_service = None
-realtime_search_service = None
-marketing_service = None
-marketplace_service = None
-order_service = None
-settings_service = None
+
+class JsonLogFormatter(logging.Formatter):
+    """Une ligne JSON par log (sérialisée par orjson)"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry).decode()
+
+
+# Les handlers ne font qu'un put() dans la queue ; l'écriture sur stderr
+# se fait dans le thread du QueueListener, hors de la boucle asyncio
+_log_queue = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(JsonLogFormatter())
+log_listener = QueueListener(_log_queue, _log_stream_handler)
+
+logger = logging.getLogger("app")
+logger.setLevel(logging.INFO)
+logger.addHandler(QueueHandler(_log_queue))
+logger.propagate = False
+
+# Cache des infos de collection Qdrant pour /api/stats (données qui bougent peu)
+STATS_CACHE_TTL_SECONDS = 5.0
+_collection_info_cache = {"value": None, "expires_at": 0.0}
+
+# Cache HTTP (ETag) des GET en lecture seule : clé -> (etag, expires_at, body)
+HTTP_CACHE_TTL_SECONDS = 5.0
+_http_cache: Dict[str, tuple] = {}
+MARKETPLACE_CACHE_KEYS = ("marketplace_products", "marketplace_stats")
 
 
 class MarketingRequest(BaseModel):
@@ -98,26 +136,27 @@ class UpdateSettingsRequest(BaseModel):
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Gestion du cycle de vie de l'application"""
-    global recommendation_service, realtime_search_service, marketing_service, marketplace_service, order_service, settings_service
-    
-    print("🚀 Initialisation de l'application...")
-    recommendation_service = RecommendationService()
-    await recommendation_service.initialize()
+    """Gestion du cycle de vie de l'application (services stockés dans app.state)"""
+    log_listener.start()
+    logger.info("🚀 Initialisation de l'application...")
+    app.state.recommendation = RecommendationService()
+    await app.state.recommendation.initialize()
     
     # Service de recherche sémantique temps réel (Qdrant :memory: + FastEmbed)
-    realtime_search_service = RealtimeSemanticSearchService()
+    app.state.realtime_search = RealtimeSemanticSearchService()
     
-    marketing_service = MarketingService(debug=True)
-    marketplace_service = MarketplaceService(debug=True)
-    order_service = OrderService(debug=True)
-    settings_service = SettingsService(debug=True)
+    app.state.marketing = MarketingService(debug=True)
+    app.state.marketplace = MarketplaceService(debug=True)
+    app.state.orders = OrderService(debug=True)
+    app.state.settings = SettingsService(debug=True)
     
-    print("✅ Application prête!")
+    logger.info("✅ Application prête!")
     
     yield
     
-    print("👋 Arrêt de l'application...")
+    logger.info("👋 Arrêt de l'application...")
+    await close_http_client()
+    log_listener.stop()
 
 
 # Configuration de l'application
@@ -125,9 +164,14 @@ settings = get_settings()
 app = FastAPI(
     title=settings.api_title,
     version=settings.api_version,
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson sérialise les listes produits/commandes bien plus vite que json
+    default_response_class=ORJSONResponse
 )
 
+# 500 génériques : enregistré avant CORS pour que CORS enveloppe aussi les erreurs
+app.add_middleware(InternalErrorMiddleware, logger=logger)
+
 # CORS pour le frontend React
 app.add_middleware(
     CORSMiddleware,
@@ -138,6 +182,62 @@ app.add_middleware(
 )
 
 
+def require_service(attr: str, label: str):
+    """Dépendance FastAPI : service lu dans app.state, 503 s'il n'est pas initialisé"""
+    def dependency(request: Request):
+        service = getattr(request.app.state, attr, None)
+        if not service:
+            raise HTTPException(
+                status_code=503,
+                detail=f"{label} service not initialized"
+            )
+        return service
+    return dependency
+
+
+def check_result(result: Dict) -> Dict:
+    """Renvoie le résultat d'un service, ou lève 404/500 selon l'erreur"""
+    if result["success"]:
+        return result
+    raise HTTPException(
+        status_code=404 if "non trouvé" in result.get("error", "") else 500,
+        detail=result.get("error")
+    )
+
+
+def cached_json(request: Request, key: str, build) -> Response:
+    """
+    Réponse JSON mise en cache HTTP_CACHE_TTL_SECONDS avec ETag
+    build() n'est appelé (et sérialisé) qu'une fois par fenêtre ; 304 si If-None-Match correspond
+    """
+    now = time.monotonic()
+    entry = _http_cache.get(key)
+    if entry is None or now >= entry[1]:
+        body = orjson.dumps(build())
+        entry = (f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"', now + HTTP_CACHE_TTL_SECONDS, body)
+        _http_cache[key] = entry
+    
+    etag, _, body = entry
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={int(HTTP_CACHE_TTL_SECONDS)}"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def invalidate_http_cache(*keys: str):
+    """Invalide les réponses en cache après une écriture"""
+    for key in keys:
+        _http_cache.pop(key, None)
+
+
+RecommendationDep = Annotated[RecommendationService, Depends(require_service("recommendation", "Recommendation"))]
+RealtimeSearchDep = Annotated[RealtimeSemanticSearchService, Depends(require_service("realtime_search", "Realtime search"))]
+MarketingDep = Annotated[MarketingService, Depends(require_service("marketing", "Marketing"))]
+MarketplaceDep = Annotated[MarketplaceService, Depends(require_service("marketplace", "Marketplace"))]
+OrderDep = Annotated[OrderService, Depends(require_service("orders", "Order"))]
+SettingsDep = Annotated[SettingsService, Depends(require_service("settings", "Settings"))]
+
+
 @app.get("/")
 async def root():
     """Endpoint de santé"""
@@ -162,7 +262,7 @@ async def health_check():
 
 
 @app.post("/api/recommend", response_model=RecommendationResponse)
-async def get_recommendations(query: SearchQuery):
+async def get_recommendations(query: SearchQuery, service: RecommendationDep):
     """
     Endpoint principal de recommandation
     
@@ -174,26 +274,11 @@ async def get_recommendations(query: SearchQuery):
     5. Recherche sémantique (Cosine Similarity)
     6. Génération de recommandation (Groq LLM)
     """
-    try:
-        if not recommendation_service:
-            raise HTTPException(
-                status_code=503, 
-                detail="Service not initialized"
-            )
-        
-        result = await recommendation_service.get_recommendations(query)
-        return result
-        
-    except Exception as e:
-        print(f"❌ Erreur: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Recommendation error: {str(e)}"
-        )
+    return await service.get_recommendations(query)
 
 
 @app.post("/api/search/semantic")
-async def semantic_search_realtime(query: SearchQuery):
+async def semantic_search_realtime(query: SearchQuery, service: RealtimeSearchDep):
     """
     🔍 RECHERCHE SÉMANTIQUE EN TEMPS RÉEL (AUDIT-COMPLIANT)
     
@@ -201,56 +286,49 @@ async def semantic_search_realtime(query: SearchQuery):
     - Qdrant en mode :memory: (éphémère)
     - FastEmbed pour embeddings (Qdrant-compatible)
     - AUCUNE persistance des données scrapées
-    - Collections temporaires supprimées après usage
+    - Points temporaires (req_id) supprimés après usage
     
     Pipeline:
     1. Scraping temps réel (pas de cache)
     2. Génération embeddings (FastEmbed)
-    3. Création collection temporaire (Qdrant :memory:)
-    4. Insertion temporaire dans Qdrant
-    5. Recherche sémantique vectorielle
-    6. Suppression collection (nettoyage)
+    3. Collection partagée en RAM (Qdrant :memory:)
+    4. Insertion temporaire dans Qdrant (marquée par req_id)
+    5. Recherche sémantique vectorielle (filtrée sur req_id)
+    6. Suppression des points de la recherche (nettoyage)
     
     GARANTIES:
     - Données 100% temporaires (RAM uniquement)
     - Qdrant utilisé activement pour la recherche
     - Nettoyage explicite après chaque recherche
     """
-    try:
-        if not realtime_search_service:
-            raise HTTPException(
-                status_code=503,
-                detail="Realtime search service not initialized"
-            )
-        
-        result = await realtime_search_service.search_products_semantic(
-            user_query=query.query,
-            use_amazon=query.use_amazon,
-            use_alibaba=query.use_alibaba,
-            use_walmart=query.use_walmart,
-            use_cdiscount=query.use_cdiscount,
-            max_results=query.max_results,
-            top_k=10
-        )
-        
-        return result
-        
-    except Exception as e:
-        print(f"❌ Erreur recherche sémantique: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Semantic search error: {str(e)}"
+    return await service.search_products_semantic(
+        user_query=query.query,
+        use_amazon=query.use_amazon,
+        use_alibaba=query.use_alibaba,
+        use_walmart=query.use_walmart,
+        use_cdiscount=query.use_cdiscount,
+        max_results=query.max_results,
+        top_k=10
+    )
+
+
+async def _fetch_collection_info(recommendation_service: RecommendationService):
+    """Infos de la collection Qdrant, mises en cache STATS_CACHE_TTL_SECONDS"""
+    now = time.monotonic()
+    if _collection_info_cache["value"] is None or now >= _collection_info_cache["expires_at"]:
+        _collection_info_cache["value"] = await recommendation_service.qdrant_service.async_client.get_collection(
+            collection_name=settings.collection_name
         )
+        _collection_info_cache["expires_at"] = now + STATS_CACHE_TTL_SECONDS
+    return _collection_info_cache["value"]
 
 
 @app.get("/api/stats")
-async def get_stats():
+async def get_stats(request: Request):
     """Statistiques du système"""
     try:
-        # Récupérer les stats de Qdrant
-        collection_info = recommendation_service.qdrant_service.client.get_collection(
-            collection_name=settings.collection_name
-        )
+        # Récupérer les stats de Qdrant (au plus un appel par TTL)
+        collection_info = await _fetch_collection_info(request.app.state.recommendation)
         
         return {
             "total_products": collection_info.points_count,
@@ -265,7 +343,7 @@ async def get_stats():
 
 
 @app.post("/api/marketing", response_model=MarketingResponse)
-async def generate_marketing_strategy(request: MarketingRequest):
+async def generate_marketing_strategy(request: MarketingRequest, service: MarketingDep):
     """
     Génère une stratégie marketing pour un produit
     
@@ -275,558 +353,227 @@ async def generate_marketing_strategy(request: MarketingRequest):
     Returns:
         Stratégie marketing structurée
     """
-    try:
-        if not marketing_service:
-            raise HTTPException(
-                status_code=503,
-                detail="Marketing service not initialized"
-            )
-        
-        result = marketing_service.generate_marketing_strategy(
-            product_name=request.product_name,
-            product_description=request.product_description
-        )
-        
-        return MarketingResponse(**result)
-        
-    except Exception as e:
-        print(f"❌ Erreur marketing: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Marketing strategy error: {str(e)}"
-        )
+    result = service.generate_marketing_strategy(
+        product_name=request.product_name,
+        product_description=request.product_description
+    )
+    # Construit par notre service : pas de re-validation
+    return MarketingResponse.model_construct(**result)
 
 
 # ==================== MARKETPLACE ENDPOINTS ====================
 
 @app.post("/api/marketplace/products")
-async def add_marketplace_product(product: MarketplaceProduct):
+async def add_marketplace_product(product: MarketplaceProduct, service: MarketplaceDep):
     """Ajoute un produit à la marketplace de l'utilisateur"""
-    try:
-        if not marketplace_service:
-            raise HTTPException(
-                status_code=503,
-                detail="Marketplace service not initialized"
-            )
-        
-        result = marketplace_service.add_product(
-            name=product.name,
-            description=product.description,
-            price=product.price,
-            image_url=product.image_url,
-            category=product.category,
-            metadata=product.metadata
-        )
-        
-        if result["success"]:
-            return result
-        else:
-            raise HTTPException(status_code=500, detail=result.get("error"))
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"❌ Erreur ajout produit: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error adding product: {str(e)}"
-        )
+    invalidate_http_cache(*MARKETPLACE_CACHE_KEYS)
+    return check_result(service.add_product(
+        name=product.name,
+        description=product.description,
+        price=product.price,
+        image_url=product.image_url,
+        category=product.category,
+        metadata=product.metadata
+    ))
+
+
+@app.post("/api/marketplace/products/bulk")
+async def bulk_add_marketplace_products(products: List[MarketplaceProduct], service: MarketplaceDep):
+    """Ajoute plusieurs produits à la marketplace en une seule sauvegarde"""
+    invalidate_http_cache(*MARKETPLACE_CACHE_KEYS)
+    return check_result(service.add_products([product.model_dump() for product in products]))
 
 
 @app.get("/api/marketplace/products")
-async def get_marketplace_products():
+async def get_marketplace_products(request: Request, service: MarketplaceDep):
     """Récupère tous les produits de la marketplace"""
-    try:
-        if not marketplace_service:
-            raise HTTPException(
-                status_code=503,
-                detail="Marketplace service not initialized"
-            )
-        
-        products = marketplace_service.get_all_products()
+    def build():
+        products = service.get_all_products()
         return {
             "success": True,
             "products": products,
             "total": len(products)
         }
-        
-    except Exception as e:
-        print(f"❌ Erreur récupération produits: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error fetching products: {str(e)}"
-        )
+    return cached_json(request, "marketplace_products", build)
 
 
 @app.get("/api/marketplace/products/{product_id}")
-async def get_marketplace_product(product_id: str):
+async def get_marketplace_product(product_id: str, service: MarketplaceDep):
     """Récupère un produit spécifique"""
-    try:
-        if not marketplace_service:
-            raise HTTPException(
-                status_code=503,
-                detail="Marketplace service not initialized"
-            )
-        
-        product = marketplace_service.get_product(product_id)
-        
-        if product:
-            return {
-                "success": True,
-                "product": product
-            }
-        else:
-            raise HTTPException(status_code=404, detail="Product not found")
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"❌ Erreur récupération produit: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error fetching product: {str(e)}"
-        )
+    product = service.get_product(product_id)
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return {
+        "success": True,
+        "product": product
+    }
 
 
 @app.put("/api/marketplace/products/{product_id}")
-async def update_marketplace_product(product_id: str, product: MarketplaceProductUpdate):
+async def update_marketplace_product(product_id: str, product: MarketplaceProductUpdate, service: MarketplaceDep):
     """Met à jour un produit de la marketplace"""
-    try:
-        if not marketplace_service:
-            raise HTTPException(
-                status_code=503,
-                detail="Marketplace service not initialized"
-            )
-        
-        result = marketplace_service.update_product(
-            product_id=product_id,
-            name=product.name,
-            description=product.description,
-            price=product.price,
-            image_url=product.image_url,
-            category=product.category
-        )
-        
-        if result["success"]:
-            return result
-        else:
-            raise HTTPException(
-                status_code=404 if "non trouvé" in result.get("error", "") else 500,
-                detail=result.get("error")
-            )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"❌ Erreur mise à jour produit: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error updating product: {str(e)}"
-        )
+    invalidate_http_cache(*MARKETPLACE_CACHE_KEYS)
+    return check_result(service.update_product(
+        product_id=product_id,
+        name=product.name,
+        description=product.description,
+        price=product.price,
+        image_url=product.image_url,
+        category=product.category
+    ))
 
 
 @app.delete("/api/marketplace/products/{product_id}")
-async def delete_marketplace_product(product_id: str):
+async def delete_marketplace_product(product_id: str, service: MarketplaceDep):
     """Supprime un produit de la marketplace"""
-    try:
-        if not marketplace_service:
-            raise HTTPException(
-                status_code=503,
-                detail="Marketplace service not initialized"
-            )
-        
-        result = marketplace_service.delete_product(product_id)
-        
-        if result["success"]:
-            return result
-        else:
-            raise HTTPException(
-                status_code=404 if "non trouvé" in result.get("error", "") else 500,
-                detail=result.get("error")
-            )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"❌ Erreur suppression produit: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error deleting product: {str(e)}"
-        )
+    invalidate_http_cache(*MARKETPLACE_CACHE_KEYS)
+    return check_result(service.delete_product(product_id))
 
 
 @app.get("/api/marketplace/stats")
-async def get_marketplace_stats():
+async def get_marketplace_stats(request: Request, service: MarketplaceDep):
     """Récupère les statistiques de la marketplace"""
-    try:
-        if not marketplace_service:
-            raise HTTPException(
-                status_code=503,
-                detail="Marketplace service not initialized"
-            )
-        
-        stats = marketplace_service.get_stats()
-        return {
-            "success": True,
-            "stats": stats
-        }
-        
-    except Exception as e:
-        print(f"❌ Erreur stats: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error fetching stats: {str(e)}"
-        )
+    return cached_json(request, "marketplace_stats", lambda: {
+        "success": True,
+        "stats": service.get_stats()
+    })
 
 
 @app.post("/api/marketplace/products/{product_id}/click")
-async def track_product_click(product_id: str):
+async def track_product_click(product_id: str, service: MarketplaceDep):
     """Enregistre un clic sur un produit"""
-    try:
-        if not marketplace_service:
-            raise HTTPException(
-                status_code=503,
-                detail="Marketplace service not initialized"
-            )
-        
-        result = marketplace_service.increment_click(product_id)
-        
-        if result["success"]:
-            return result
-        else:
-            raise HTTPException(
-                status_code=404 if "non trouvé" in result.get("error", "") else 500,
-                detail=result.get("error")
-            )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"❌ Erreur tracking clic: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error tracking click: {str(e)}"
-        )
+    invalidate_http_cache(*MARKETPLACE_CACHE_KEYS)
+    return check_result(service.increment_click(product_id))
 
 
 @app.post("/api/marketplace/products/{product_id}/view")
-async def track_product_view(product_id: str):
+async def track_product_view(product_id: str, service: MarketplaceDep):
     """Enregistre une vue sur un produit"""
-    try:
-        if not marketplace_service:
-            raise HTTPException(
-                status_code=503,
-                detail="Marketplace service not initialized"
-            )
-        
-        result = marketplace_service.increment_view(product_id)
-        
-        if result["success"]:
-            return result
-        else:
-            raise HTTPException(
-                status_code=404 if "non trouvé" in result.get("error", "") else 500,
-                detail=result.get("error")
-            )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"❌ Erreur tracking vue: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error tracking view: {str(e)}"
-        )
+    invalidate_http_cache(*MARKETPLACE_CACHE_KEYS)
+    return check_result(service.increment_view(product_id))
 
 
 # ==================== ORDER ENDPOINTS ====================
 
 @app.post("/api/orders")
-async def create_order(order_request: CreateOrderRequest):
+async def create_order(order_request: CreateOrderRequest, service: OrderDep):
     """Crée une nouvelle commande (automatiquement livrée)"""
-    try:
-        if not order_service:
-            raise HTTPException(
-                status_code=503,
-                detail="Order service not initialized"
-            )
-        
-        result = order_service.create_order(
-            customer_name=order_request.customer_name,
-            customer_phone=order_request.customer_phone,
-            shipping_address=order_request.shipping_address,
-            items=order_request.items,
-            payment_method=order_request.payment_method
-        )
-        
-        if result["success"]:
-            return result
-        else:
-            raise HTTPException(status_code=500, detail=result.get("error"))
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"❌ Erreur création commande: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error creating order: {str(e)}"
-        )
+    invalidate_http_cache("order_stats")
+    return check_result(service.create_order(
+        customer_name=order_request.customer_name,
+        customer_phone=order_request.customer_phone,
+        shipping_address=order_request.shipping_address,
+        items=order_request.items,
+        payment_method=order_request.payment_method
+    ))
 
 
 @app.get("/api/orders")
-async def get_all_orders():
+async def get_all_orders(service: OrderDep):
     """Récupère toutes les commandes"""
-    try:
-        if not order_service:
-            raise HTTPException(
-                status_code=503,
-                detail="Order service not initialized"
-            )
-        
-        orders = order_service.get_all_orders()
-        return {
-            "success": True,
-            "orders": orders,
-            "total": len(orders)
-        }
-        
-    except Exception as e:
-        print(f"❌ Erreur récupération commandes: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error fetching orders: {str(e)}"
-        )
+    orders = service.get_all_orders()
+    return {
+        "success": True,
+        "orders": orders,
+        "total": len(orders)
+    }
 
 
 @app.get("/api/orders/delivered")
-async def get_delivered_orders():
+async def get_delivered_orders(service: OrderDep):
     """Récupère uniquement les commandes livrées"""
-    try:
-        if not order_service:
-            raise HTTPException(
-                status_code=503,
-                detail="Order service not initialized"
-            )
-        
-        orders = order_service.get_delivered_orders()
-        return {
-            "success": True,
-            "orders": orders,
-            "total": len(orders)
-        }
-        
-    except Exception as e:
-        print(f"❌ Erreur récupération commandes livrées: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error fetching delivered orders: {str(e)}"
-        )
+    orders = service.get_delivered_orders()
+    return {
+        "success": True,
+        "orders": orders,
+        "total": len(orders)
+    }
 
 
 @app.get("/api/orders/{order_id}")
-async def get_order(order_id: str):
+async def get_order(order_id: str, service: OrderDep):
     """Récupère une commande spécifique"""
-    try:
-        if not order_service:
-            raise HTTPException(
-                status_code=503,
-                detail="Order service not initialized"
-            )
-        
-        order = order_service.get_order(order_id)
-        
-        if order:
-            return {
-                "success": True,
-                "order": order
-            }
-        else:
-            raise HTTPException(status_code=404, detail="Order not found")
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"❌ Erreur récupération commande: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error fetching order: {str(e)}"
-        )
+    order = service.get_order(order_id)
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return {
+        "success": True,
+        "order": order
+    }
 
 
 @app.get("/api/orders/number/{order_number}")
-async def get_order_by_number(order_number: str):
+async def get_order_by_number(order_number: str, service: OrderDep):
     """Récupère une commande par son numéro"""
-    try:
-        if not order_service:
-            raise HTTPException(
-                status_code=503,
-                detail="Order service not initialized"
-            )
-        
-        order = order_service.get_order_by_number(order_number)
-        
-        if order:
-            return {
-                "success": True,
-                "order": order
-            }
-        else:
-            raise HTTPException(status_code=404, detail="Order not found")
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"❌ Erreur récupération commande: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error fetching order: {str(e)}"
-        )
+    order = service.get_order_by_number(order_number)
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return {
+        "success": True,
+        "order": order
+    }
 
 
 @app.put("/api/orders/{order_id}/status")
-async def update_order_status(order_id: str, status_request: UpdateOrderStatusRequest):
+async def update_order_status(order_id: str, status_request: UpdateOrderStatusRequest, service: OrderDep):
     """Met à jour le statut d'une commande"""
-    try:
-        if not order_service:
-            raise HTTPException(
-                status_code=503,
-                detail="Order service not initialized"
-            )
-        
-        result = order_service.update_order_status(
-            order_id=order_id,
-            status=status_request.status,
-            tracking_number=status_request.tracking_number,
-            note=status_request.note
-        )
-        
-        if result["success"]:
-            return result
-        else:
-            raise HTTPException(
-                status_code=404 if "non trouvé" in result.get("error", "") else 500,
-                detail=result.get("error")
-            )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"❌ Erreur mise à jour statut: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error updating status: {str(e)}"
-        )
+    invalidate_http_cache("order_stats")
+    return check_result(service.update_order_status(
+        order_id=order_id,
+        status=status_request.status,
+        tracking_number=status_request.tracking_number,
+        note=status_request.note
+    ))
 
 
 @app.get("/api/orders/stats")
-async def get_order_stats():
+async def get_order_stats(request: Request, service: OrderDep):
     """Récupère les statistiques des commandes"""
-    try:
-        if not order_service:
-            raise HTTPException(
-                status_code=503,
-                detail="Order service not initialized"
-            )
-        
-        stats = order_service.get_stats()
-        return {
-            "success": True,
-            "stats": stats
-        }
-        
-    except Exception as e:
-        print(f"❌ Erreur stats commandes: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error fetching stats: {str(e)}"
-        )
+    return cached_json(request, "order_stats", lambda: {
+        "success": True,
+        "stats": service.get_stats()
+    })
 
 
 # ==================== SETTINGS ENDPOINTS ====================
 
 @app.get("/api/settings")
-async def get_settings():
+async def read_settings(request: Request, service: SettingsDep):
     """Récupère les paramètres de la marketplace"""
-    try:
-        if not settings_service:
-            raise HTTPException(
-                status_code=503,
-                detail="Settings service not initialized"
-            )
-        
-        settings = settings_service.get_settings()
-        return {
-            "success": True,
-            "settings": settings
-        }
-        
-    except Exception as e:
-        print(f"❌ Erreur récupération settings: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error fetching settings: {str(e)}"
-        )
+    return cached_json(request, "settings", lambda: {
+        "success": True,
+        "settings": service.get_settings()
+    })
 
 
 @app.put("/api/settings")
-async def update_settings(settings_request: UpdateSettingsRequest):
+async def update_settings(settings_request: UpdateSettingsRequest, service: SettingsDep):
     """Met à jour les paramètres de la marketplace"""
-    try:
-        if not settings_service:
-            raise HTTPException(
-                status_code=503,
-                detail="Settings service not initialized"
-            )
-        
-        result = settings_service.update_settings(
-            marketplace_name=settings_request.marketplace_name,
-            marketplace_logo=settings_request.marketplace_logo,
-            marketplace_description=settings_request.marketplace_description
-        )
-        
-        if result["success"]:
-            return result
-        else:
-            raise HTTPException(status_code=500, detail=result.get("error"))
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"❌ Erreur mise à jour settings: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error updating settings: {str(e)}"
-        )
+    invalidate_http_cache("settings")
+    return check_result(service.update_settings(
+        marketplace_name=settings_request.marketplace_name,
+        marketplace_logo=settings_request.marketplace_logo,
+        marketplace_description=settings_request.marketplace_description
+    ))
 
 
 @app.post("/api/settings/reset")
-async def reset_settings():
+async def reset_settings(service: SettingsDep):
     """Réinitialise les paramètres aux valeurs par défaut"""
-    try:
-        if not settings_service:
-            raise HTTPException(
-                status_code=503,
-                detail="Settings service not initialized"
-            )
-        
-        result = settings_service.reset_settings()
-        
-        if result["success"]:
-            return result
-        else:
-            raise HTTPException(status_code=500, detail=result.get("error"))
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"❌ Erreur reset settings: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error resetting settings: {str(e)}"
-        )
+    invalidate_http_cache("settings")
+    return check_result(service.reset_settings())
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # loop="auto" : uvloop s'il est installé (pas sous Windows), asyncio sinon ;
+    # parseur HTTP httptools (C). Un seul worker car la marketplace et les
+    # commandes vivent en mémoire dans ce process
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="httptools",
+        access_log=False
+    )
@@ -1,4 +1,8 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+from itertools import islice
 from app.routes import auth, home, search_proxy, click
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
@@ -7,15 +11,28 @@ from scripts.qroq_explainerB2B import GroqExplainer
 from scripts.search_B2B import SemanticSearchAgent
 from scripts.price_optimizeB2B import PriceOptimizer
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 from fastapi import Depends
-from app.database_sqlite import get_events_collection
+from pymongo import WriteConcern
 from app.database import get_events_collection
 from app.core.security import get_current_user_id  # JWT helper
 
+# Threads for the blocking search / optimize / LLM calls
+EXECUTOR_MAX_WORKERS = 16
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Cap the default executor and resolve the events collection once"""
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=EXECUTOR_MAX_WORKERS)
+    )
+    # Analytics events are fire-and-forget: w=0 skips the server acknowledgement
+    app.state.events = get_events_collection().with_options(write_concern=WriteConcern(w=0))
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS for React frontend
 app.add_middleware(
@@ -48,79 +65,72 @@ class ClickRequest(BaseModel):
 @app.post("/search")
 async def search_best_supplier_endpoint(
     req: SearchRequest,
+    request: Request,
     user_id: str = Depends(get_current_user_id)  # <-- automatically extract user from JWT
 ):
-    # --- 1️⃣ Log search in SQLite automatically ---
-    events_db = get_events_collection()
-    event_id = events_db.track_event({
-        "user_id": user_id,
-        "event_type": "search",
-        "content": req.product_name
-    # --- 1️⃣ Log search in Mongo automatically ---
-    events = get_events_collection()
-    await events.insert_one({
+    # --- 1️⃣ Log search in Mongo automatically (runs alongside the search) ---
+    log_task = asyncio.create_task(request.app.state.events.insert_one({
         "user_id": user_id,
         "type": "search",
         "content": req.product_name,
-        "timestamp": datetime.utcnow()
-    })
-
-    # --- 2️⃣ Call teammate's search agent ---
-    products = search_agent.search(req.product_name, top_k=20)
+        "timestamp": datetime.now(timezone.utc)
+    }))
+
+    try:
+        # --- 2️⃣ Call teammate's search agent (blocking → worker thread) ---
+        products = await asyncio.to_thread(search_agent.search, req.product_name, top_k=20)
+
+        # --- 3️⃣ Optimize products ---
+        optimized_products = await asyncio.to_thread(
+            price_optimizer.optimize,
+            products=products,
+            quantity=req.quantity,
+            max_price=req.max_price,
+            query=req.product_name
+        )
+
+        # --- 4️⃣ Return results ---
+        if not optimized_products:
+            return {
+                "best_product": None,
+                "alternatives": [],
+                "explanation": "No products match your criteria."
+            }
+
+        best_supplier = optimized_products[0]
+        best_price = best_supplier["total_price"]
+        # optimize() already dropped everything above max_price; stop at 3 matches
+        alternatives = list(islice(
+            (p for p in islice(optimized_products, 1, None) if p["total_price"] > best_price),
+            3
+        ))
+
+        explanation = await asyncio.to_thread(
+            explainer.explain_choice,
+            best_supplier=best_supplier,
+            query=req.product_name,
+            quantity=req.quantity
+        )
 
-    # --- 3️⃣ Optimize products ---
-    optimized_products = price_optimizer.optimize(
-        products=products,
-        quantity=req.quantity,
-        max_price=req.max_price,
-        query=req.product_name
-    )
-
-    # --- 4️⃣ Return results ---
-    if not optimized_products:
         return {
-            "best_product": None,
-            "alternatives": [],
-            "explanation": "No products match your criteria."
+            "best_product": best_supplier,
+            "alternatives": alternatives,
+            "explanation": explanation
         }
-
-    best_supplier = optimized_products[0]
-    alternatives = [
-        p for p in optimized_products[1:]
-        if p["total_price"] > best_supplier["total_price"]
-        and (req.max_price is None or p["total_price"] <= req.max_price)
-    ][:3]
-
-    explanation = explainer.explain_choice(
-        best_supplier=best_supplier,
-        query=req.product_name,
-        quantity=req.quantity
-    )
-
-    return {
-        "best_product": best_supplier,
-        "alternatives": alternatives,
-        "explanation": explanation
-    }
+    finally:
+        await log_task
 
 @app.post("/click")
 async def click_endpoint(
     req: ClickRequest,
+    request: Request,
     user_id: str = Depends(get_current_user_id)
 ):
-    events_db = get_events_collection()
-    event_id = events_db.track_event({
-        "user_id": user_id,
-        "event_type": "click",
-        "content": req.product_name
-    })
-    return {"status": "ok", "message": "Click recorded automatically", "event_id": event_id}
-    events = get_events_collection()
-    await events.insert_one({
+    await request.app.state.events.insert_one({
         "user_id": user_id,
         "type": "click",
         "content": req.product_name,
-        "timestamp": datetime.utcnow()
+        "timestamp": datetime.now(timezone.utc)
     })
     return {"status": "ok", "message": "Click recorded automatically"}
 
@@ -16,17 +16,24 @@ Usage:
 
 import sys
 import os
+import asyncio
 from contextlib import asynccontextmanager
+from pathlib import Path
 from typing import Optional, List
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from fastapi import FastAPI, HTTPException, Depends, UploadFile, File
+from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, Field
 import logging
+import orjson
 import tempfile
+import time
+from collections import OrderedDict
+from itertools import islice
 from datetime import datetime
 
 # ==================== IMPORTS FOR B2C ====================
@@ -37,6 +44,7 @@ from services.marketing_service import MarketingService
 from services.marketplace_service import MarketplaceService
 from services.order_service import OrderService
 from services.settings_service import SettingsService
+from services.error_middleware import InternalErrorMiddleware
 from config import get_settings
 
 # ==================== IMPORTS FOR B2B ====================
@@ -44,6 +52,10 @@ from app.routes import auth, home, search_proxy, click
 from app.database_sqlite import get_events_collection
 from app.core.security import get_current_user_id
 
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
 # Check if B2B scripts exist
 try:
     from scripts.embedding_agent_B2B import EmbeddingAgent
@@ -53,7 +65,7 @@ try:
     B2B_AVAILABLE = True
 except ImportError:
     B2B_AVAILABLE = False
-    print("⚠️ B2B scripts not found - B2B endpoints will be disabled")
+    logger.warning("⚠️ B2B scripts not found - B2B endpoints will be disabled")
 
 # ==================== IMPORTS FOR USERSHOP ====================
 from app.config_usershop import settings as usershop_settings
@@ -76,14 +88,10 @@ try:
     SHOPGPT_AVAILABLE = True
 except ImportError as e:
     SHOPGPT_AVAILABLE = False
-    print(f"⚠️ ShopGPT modules not found - ShopGPT endpoints will be disabled")
+    logger.warning(f"⚠️ ShopGPT modules not found - ShopGPT endpoints will be disabled")
 except Exception as e:
     SHOPGPT_AVAILABLE = False
-    print(f"⚠️ ShopGPT initialization error - ShopGPT endpoints will be disabled: {e}")
-
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+    logger.warning(f"⚠️ ShopGPT initialization error - ShopGPT endpoints will be disabled: {e}")
 
 # ==================== GLOBAL SERVICES ====================
 # B2C Services
@@ -100,6 +108,44 @@ b2b_search_agent = None
 b2b_price_optimizer = None
 b2b_explainer = None
 
+# Per-application initialization state reported by /health:
+# "initializing" until _deferred_init() is done, then "active" or "failed"
+SERVICE_STATUS = {"b2c": "initializing", "usershop": "initializing"}
+if B2B_AVAILABLE:
+    SERVICE_STATUS["b2b"] = "initializing"
+if SHOPGPT_AVAILABLE:
+    SERVICE_STATUS["shopgpt"] = "active"  # Router only, nothing to initialize
+
+# Usershop recommendations for identical requests: key -> (expires_at, response)
+RECOMMENDATION_CACHE_SIZE = 1024
+RECOMMENDATION_CACHE_TTL_SECONDS = 120
+_recommendation_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+
+def _recommendation_cache_key(payload: dict) -> tuple:
+    """Request fields, with text normalized (case, surrounding spaces)"""
+    return tuple(
+        value.strip().lower() if isinstance(value, str) else value
+        for value in payload.values()
+    )
+
+# CSV uploads are copied to disk in chunks of this size
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+# Identical requests already running: key -> task shared by every caller
+_inflight: dict = {}
+
+
+async def _single_flight(key: tuple, work):
+    """Run work() once for concurrent identical requests; the others await its result"""
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(work())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # shield: a client disconnecting must not cancel the work for the others
+    return await asyncio.shield(task)
+
 # ==================== PYDANTIC MODELS ====================
 
 # B2C Models
@@ -158,88 +204,174 @@ class ClickRequest(BaseModel):
     category: str
     supplier: str
 
+# Each query of a batch may cost one Groq explanation call
+B2B_BATCH_MAX_QUERIES = 20
+
+class BatchSearchRequest(BaseModel):
+    queries: List[SearchRequest] = Field(..., min_length=1, max_length=B2B_BATCH_MAX_QUERIES)
+
 # ==================== LIFESPAN MANAGEMENT ====================
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Initialize all services on startup"""
+# Set once _deferred_init() has finished (readiness probe: /health)
+READY = asyncio.Event()
+
+
+# Model-loading constructors run in worker threads so the event loop keeps
+# answering (liveness probes, 503s) and the three inits overlap
+
+async def _init_b2c():
+    """Initialize the B2C marketplace services"""
     global recommendation_service, realtime_search_service, marketing_service
     global marketplace_service, order_service, settings_service
+    
+    logger.info("📦 [B2C] Initializing B2C Marketplace Services...")
+    # Built in locals and published together: endpoints never see a half-initialized service
+    recommendation = await asyncio.to_thread(RecommendationService)
+    await recommendation.initialize()
+    realtime_search = await asyncio.to_thread(RealtimeSemanticSearchService)
+    marketing = await asyncio.to_thread(MarketingService, debug=True)
+    marketplace = MarketplaceService(debug=True)
+    orders = OrderService(debug=True)
+    marketplace_settings = SettingsService(debug=True)
+    
+    recommendation_service = recommendation
+    realtime_search_service = realtime_search
+    marketing_service = marketing
+    marketplace_service = marketplace
+    order_service = orders
+    settings_service = marketplace_settings
+    logger.info("✅ [B2C] B2C services initialized")
+
+
+async def _init_b2b():
+    """Initialize the B2B supplier search services"""
     global b2b_agent, b2b_search_agent, b2b_price_optimizer, b2b_explainer
     
-    print("=" * 80)
-    print("🚀 UNIFIED MINERVA AI PLATFORM - STARTING ALL SERVICES")
-    print("=" * 80)
+    if not B2B_AVAILABLE:
+        return
+    logger.info("🏭 [B2B] Initializing B2B Supplier Search Services...")
+    agent = await asyncio.to_thread(EmbeddingAgent)
+    search_agent = await asyncio.to_thread(SemanticSearchAgent, agent)
+    price_optimizer = PriceOptimizer()
+    GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+    explainer = await asyncio.to_thread(GroqExplainer, api_key=GROQ_API_KEY)
     
-    # ==================== INITIALIZE B2C SERVICES ====================
-    print("\n📦 [B2C] Initializing B2C Marketplace Services...")
-    try:
-        recommendation_service = RecommendationService()
-        await recommendation_service.initialize()
-        realtime_search_service = RealtimeSemanticSearchService()
-        marketing_service = MarketingService(debug=True)
-        marketplace_service = MarketplaceService(debug=True)
-        order_service = OrderService(debug=True)
-        settings_service = SettingsService(debug=True)
-        print("✅ [B2C] B2C services initialized")
-    except Exception as e:
-        print(f"❌ [B2C] Error initializing B2C services: {e}")
+    # Published last: the endpoints only check b2b_search_agent before using all four
+    b2b_agent = agent
+    b2b_price_optimizer = price_optimizer
+    b2b_explainer = explainer
+    b2b_search_agent = search_agent
+    logger.info("✅ [B2B] B2B services initialized")
+
+
+async def _init_usershop():
+    """Initialize the Usershop collection, loading the CSVs if it is empty"""
+    logger.info("🛍️ [USERSHOP] Initializing Usershop Recommendation Services...")
+    await usershop_db.initialize_collection()
+    collection_info = usershop_db.get_collection_info()
+    products_count = collection_info.get('points_count', 0)
     
-    # ==================== INITIALIZE B2B SERVICES ====================
-    if B2B_AVAILABLE:
-        print("\n🏭 [B2B] Initializing B2B Supplier Search Services...")
-        try:
-            b2b_agent = EmbeddingAgent()
-            b2b_search_agent = SemanticSearchAgent(b2b_agent)
-            b2b_price_optimizer = PriceOptimizer()
-            GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-            b2b_explainer = GroqExplainer(api_key=GROQ_API_KEY)
-            print("✅ [B2B] B2B services initialized")
-        except Exception as e:
-            print(f"❌ [B2B] Error initializing B2B services: {e}")
-    
-    # ==================== INITIALIZE USERSHOP SERVICES ====================
-    print("\n🛍️ [USERSHOP] Initializing Usershop Recommendation Services...")
-    try:
-        await usershop_db.initialize_collection()
-        collection_info = usershop_db.get_collection_info()
-        products_count = collection_info.get('points_count', 0)
+    if products_count == 0:
+        logger.info("📁 [USERSHOP] Loading products from /data directory...")
+        possible_paths = ["data", "../data", "../../data"]
+        
+        # First directory that actually holds CSV files (cheap stat/glob probes)
+        data_path = next(
+            (path for path in map(Path, possible_paths) if path.is_dir() and any(path.glob("*.csv"))),
+            None
+        )
+        if data_path is None:
+            logger.warning(f"⚠️ [USERSHOP] No CSV files found in {possible_paths}")
+            return
         
-        if products_count == 0:
-            print("📁 [USERSHOP] Loading products from /data directory...")
-            possible_paths = ["data", "../data", "../../data"]
-            
-            for data_path in possible_paths:
-                try:
-                    products, load_stats = data_loader.load_all_csv_from_directory(data_path)
-                    if products:
-                        await usershop_db.add_products(products)
-                        print(f"✅ [USERSHOP] {len(products)} products loaded from '{data_path}'")
-                        break
-                except Exception:
-                    continue
+        # Stream the CSVs chunk by chunk: each batch is uploaded before the next is parsed,
+        # with HNSW indexing paused once for the whole stream
+        batches = data_loader.iter_directory_batches(str(data_path))
+        loaded = 0
+        async with usershop_db.bulk_load():
+            while (products := await asyncio.to_thread(next, batches, None)) is not None:
+                await usershop_db.add_products(products)
+                loaded += len(products)
+        if loaded:
+            logger.info(f"✅ [USERSHOP] {loaded} products loaded from '{data_path}'")
         else:
-            print(f"✅ [USERSHOP] {products_count} products already in Qdrant")
+            logger.warning(f"⚠️ [USERSHOP] No valid products in '{data_path}'")
+    else:
+        logger.info(f"✅ [USERSHOP] {products_count} products already in Qdrant")
+
+
+def _set_service_status(name: str, status: str):
+    """Record a service's state; the /health body is re-encoded once startup is done"""
+    global HEALTH_BODY
+    SERVICE_STATUS[name] = status
+    if READY.is_set():
+        HEALTH_BODY = orjson.dumps(_health_info())
+
+
+async def _tracked_init(name: str, init):
+    """Run one initializer and publish its status as soon as it finishes,
+    without waiting for the other services"""
+    try:
+        await init()
     except Exception as e:
-        print(f"⚠️ [USERSHOP] Error initializing Usershop: {e}")
+        logger.error(f"❌ [{name.upper()}] Error initializing {name.upper()} services: {e}")
+        _set_service_status(name, "failed")
+        raise
+    _set_service_status(name, "active")
+
+
+async def _deferred_init():
+    """Initialize all services concurrently, after the server has bound its port"""
+    global HEALTH_BODY
+    inits = {"b2c": _init_b2c, "b2b": _init_b2b, "usershop": _init_usershop}
+    results = await asyncio.gather(
+        *[
+            _tracked_init(name, init) if name in SERVICE_STATUS else init()
+            for name, init in inits.items()
+        ],
+        return_exceptions=True
+    )
+    failed = [name.upper() for name, result in zip(inits, results) if isinstance(result, Exception)]
     
-    print("\n" + "=" * 80)
-    print("✅ ALL SERVICES INITIALIZED SUCCESSFULLY")
-    print("=" * 80)
-    print("\n📡 Available Services:")
-    print("   • B2C Marketplace: /api/b2c/*")
+    # Final health body, encoded once now that every service has its status
+    HEALTH_BODY = orjson.dumps(_health_info())
+    READY.set()
+    
+    if failed:
+        logger.warning(f"⚠️ SERVICES INITIALIZED WITH ERRORS: {', '.join(failed)}")
+    else:
+        logger.info("✅ ALL SERVICES INITIALIZED SUCCESSFULLY")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Bind immediately; heavy service initialization continues in the background"""
+    # Event store resolved once; endpoints read it from app.state
+    app.state.events_collection = get_events_collection()
+    init_task = asyncio.create_task(_deferred_init())
+    
+    # Whole banner as a single log record
+    banner = [
+        "🚀 UNIFIED MINERVA AI PLATFORM - STARTING ALL SERVICES",
+        "📡 Available Services:",
+        "   • B2C Marketplace: /api/b2c/*"
+    ]
     if B2B_AVAILABLE:
-        print("   • B2B Supplier Search: /api/b2b/*")
-    print("   • Usershop Recommendations: /api/usershop/*")
+        banner.append("   • B2B Supplier Search: /api/b2b/*")
+    banner.append("   • Usershop Recommendations: /api/usershop/*")
     if SHOPGPT_AVAILABLE:
-        print("   • ShopGPT Image Search: /api/shopping/*")
-    print("\n📚 API Documentation: http://localhost:8000/docs")
-    print("=" * 80)
-    print()
+        banner.append("   • ShopGPT Image Search: /api/shopping/*")
+    banner += [
+        "📚 API Documentation: http://localhost:8000/docs",
+        "⏳ Services are initializing in the background (GET /health returns 503 until ready)"
+    ]
+    logger.info("\n".join(banner))
     
     yield
     
-    print("\n👋 Shutting down all services...")
+    logger.info("👋 Shutting down all services...")
+    if not init_task.done():
+        init_task.cancel()
 
 # ==================== CREATE FASTAPI APP ====================
 
@@ -249,13 +381,19 @@ app = FastAPI(
     title="MinervaAI Unified Platform",
     description="Unified AI-powered shopping platform with B2C, B2B, and Usershop services",
     version="3.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson serializes the product/order lists much faster than json
+    default_response_class=ORJSONResponse
 )
 
-# CORS Configuration
+# Generic 500s for unhandled errors; added before CORS so CORS also wraps error responses
+app.add_middleware(InternalErrorMiddleware, logger=logger)
+
+# CORS Configuration: one precompiled regex match per request
+# (localhost:3000, localhost:5173, 127.0.0.1:3000)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://localhost:5173", "http://127.0.0.1:3000"],
+    allow_origin_regex=r"^http://(localhost:(3000|5173)|127\.0\.0\.1:3000)$",
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -263,9 +401,8 @@ app.add_middleware(
 
 # ==================== ROOT ENDPOINTS ====================
 
-@app.get("/")
-async def root():
-    """Main entry point showing all available services"""
+def _root_info() -> dict:
+    """Platform overview (only depends on the import-time availability flags)"""
     services = {
         "b2c": {
             "name": "B2C Marketplace",
@@ -305,24 +442,36 @@ async def root():
         "documentation": "/docs"
     }
 
+def _health_info() -> dict:
+    """Services reported by /health once initialization is done"""
+    all_active = all(status == "active" for status in SERVICE_STATUS.values())
+    return {
+        "status": "healthy" if all_active else "degraded",
+        "services": dict(SERVICE_STATUS)
+    }
+
+# Static probe/overview bodies, encoded once at import instead of per request
+ROOT_BODY = orjson.dumps(_root_info())
+HEALTH_BODY = b""  # Set by _deferred_init() from the services that actually initialized
+HEALTH_INITIALIZING_BODY = orjson.dumps({"status": "initializing"})
+LIVE_BODY = orjson.dumps({"status": "alive"})
+
+@app.get("/")
+async def root():
+    """Main entry point showing all available services"""
+    return Response(content=ROOT_BODY, media_type="application/json")
+
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness probe: the process is up and serving"""
+    return Response(content=LIVE_BODY, media_type="application/json")
+
 @app.get("/health")
 async def health_check():
-    """Health check for all services"""
-    health_status = {
-        "status": "healthy",
-        "services": {
-            "b2c": "active",
-            "usershop": "active"
-        }
-    }
-    
-    if B2B_AVAILABLE:
-        health_status["services"]["b2b"] = "active"
-    
-    if SHOPGPT_AVAILABLE:
-        health_status["services"]["shopgpt"] = "active"
-    
-    return health_status
+    """Health check for all services (503 until background initialization is done)"""
+    if not READY.is_set():
+        return Response(content=HEALTH_INITIALIZING_BODY, status_code=503, media_type="application/json")
+    return Response(content=HEALTH_BODY, media_type="application/json")
 
 
 # ==================== B2C ENDPOINTS ====================
@@ -331,262 +480,203 @@ async def health_check():
 @app.post("/api/b2c/recommend", response_model=RecommendationResponse)
 async def b2c_get_recommendations(query: SearchQuery):
     """B2C: Get AI product recommendations with scraping"""
-    try:
-        if not recommendation_service:
-            raise HTTPException(status_code=503, detail="B2C service not initialized")
-        
-        result = await recommendation_service.get_recommendations(query)
-        return result
-    except Exception as e:
-        logger.error(f"[B2C] Error: {e}")
-        raise HTTPException(status_code=500, detail=f"Recommendation error: {str(e)}")
+    if not recommendation_service:
+        raise HTTPException(status_code=503, detail="B2C service not initialized")
+    
+    result = await recommendation_service.get_recommendations(query)
+    return result
 
 @app.post("/api/b2c/search/semantic")
 async def b2c_semantic_search(query: SearchQuery):
     """B2C: Real-time semantic search (audit-compliant, ephemeral)"""
-    try:
-        if not realtime_search_service:
-            raise HTTPException(status_code=503, detail="Realtime search service not initialized")
-        
-        result = await realtime_search_service.search_products_semantic(
-            user_query=query.query,
-            use_amazon=query.use_amazon,
-            use_alibaba=query.use_alibaba,
-            use_walmart=query.use_walmart,
-            use_cdiscount=query.use_cdiscount,
-            max_results=query.max_results,
-            top_k=10
-        )
-        return result
-    except Exception as e:
-        logger.error(f"[B2C] Semantic search error: {e}")
-        raise HTTPException(status_code=500, detail=f"Semantic search error: {str(e)}")
+    if not realtime_search_service:
+        raise HTTPException(status_code=503, detail="Realtime search service not initialized")
+    
+    # Concurrent identical searches share one scrape + ephemeral Qdrant pass
+    # (nothing is kept once it completes, so audit non-persistence holds)
+    key = (
+        "b2c_semantic", query.query, query.use_amazon, query.use_alibaba,
+        query.use_walmart, query.use_cdiscount, query.max_results
+    )
+    result = await _single_flight(key, lambda: realtime_search_service.search_products_semantic(
+        user_query=query.query,
+        use_amazon=query.use_amazon,
+        use_alibaba=query.use_alibaba,
+        use_walmart=query.use_walmart,
+        use_cdiscount=query.use_cdiscount,
+        max_results=query.max_results,
+        top_k=10
+    ))
+    return result
 
 @app.post("/api/b2c/marketing", response_model=MarketingResponse)
 async def b2c_generate_marketing(request: MarketingRequest):
     """B2C: Generate marketing strategy for a product"""
-    try:
-        if not marketing_service:
-            raise HTTPException(status_code=503, detail="Marketing service not initialized")
-        
-        result = marketing_service.generate_marketing_strategy(
-            product_name=request.product_name,
-            product_description=request.product_description
-        )
-        return MarketingResponse(**result)
-    except Exception as e:
-        logger.error(f"[B2C] Marketing error: {e}")
-        raise HTTPException(status_code=500, detail=f"Marketing error: {str(e)}")
+    if not marketing_service:
+        raise HTTPException(status_code=503, detail="Marketing service not initialized")
+    
+    result = marketing_service.generate_marketing_strategy(
+        product_name=request.product_name,
+        product_description=request.product_description
+    )
+    # Built by our own service: skip re-validation
+    return MarketingResponse.model_construct(**result)
 
 # Marketplace Endpoints
 @app.post("/api/b2c/marketplace/products")
 async def b2c_add_product(product: MarketplaceProduct):
     """B2C: Add product to user's marketplace"""
-    try:
-        if not marketplace_service:
-            raise HTTPException(status_code=503, detail="Marketplace service not initialized")
-        
-        result = marketplace_service.add_product(
-            name=product.name,
-            description=product.description,
-            price=product.price,
-            image_url=product.image_url,
-            category=product.category,
-            metadata=product.metadata
-        )
-        
-        if result["success"]:
-            return result
-        else:
-            raise HTTPException(status_code=500, detail=result.get("error"))
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"[B2C] Add product error: {e}")
-        raise HTTPException(status_code=500, detail=f"Error adding product: {str(e)}")
+    if not marketplace_service:
+        raise HTTPException(status_code=503, detail="Marketplace service not initialized")
+    
+    result = marketplace_service.add_product(
+        name=product.name,
+        description=product.description,
+        price=product.price,
+        image_url=product.image_url,
+        category=product.category,
+        metadata=product.metadata
+    )
+    
+    if result["success"]:
+        return result
+    else:
+        raise HTTPException(status_code=500, detail=result.get("error"))
 
 @app.get("/api/b2c/marketplace/products")
 async def b2c_get_products():
     """B2C: Get all marketplace products"""
-    try:
-        if not marketplace_service:
-            raise HTTPException(status_code=503, detail="Marketplace service not initialized")
-        
-        products = marketplace_service.get_all_products()
-        return {"success": True, "products": products, "total": len(products)}
-    except Exception as e:
-        logger.error(f"[B2C] Get products error: {e}")
-        raise HTTPException(status_code=500, detail=f"Error fetching products: {str(e)}")
+    if not marketplace_service:
+        raise HTTPException(status_code=503, detail="Marketplace service not initialized")
+    
+    products = marketplace_service.get_all_products()
+    # Returned directly: skips jsonable_encoder on the whole list
+    return ORJSONResponse({"success": True, "products": products, "total": len(products)})
 
 @app.get("/api/b2c/marketplace/products/{product_id}")
 async def b2c_get_product(product_id: str):
     """B2C: Get specific marketplace product"""
-    try:
-        if not marketplace_service:
-            raise HTTPException(status_code=503, detail="Marketplace service not initialized")
-        
-        product = marketplace_service.get_product(product_id)
-        if product:
-            return {"success": True, "product": product}
-        else:
-            raise HTTPException(status_code=404, detail="Product not found")
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"[B2C] Get product error: {e}")
-        raise HTTPException(status_code=500, detail=f"Error fetching product: {str(e)}")
+    if not marketplace_service:
+        raise HTTPException(status_code=503, detail="Marketplace service not initialized")
+    
+    product = marketplace_service.get_product(product_id)
+    if product:
+        return {"success": True, "product": product}
+    else:
+        raise HTTPException(status_code=404, detail="Product not found")
 
 @app.put("/api/b2c/marketplace/products/{product_id}")
 async def b2c_update_product(product_id: str, product: MarketplaceProductUpdate):
     """B2C: Update marketplace product"""
-    try:
-        if not marketplace_service:
-            raise HTTPException(status_code=503, detail="Marketplace service not initialized")
-        
-        result = marketplace_service.update_product(
-            product_id=product_id,
-            name=product.name,
-            description=product.description,
-            price=product.price,
-            image_url=product.image_url,
-            category=product.category
+    if not marketplace_service:
+        raise HTTPException(status_code=503, detail="Marketplace service not initialized")
+    
+    result = marketplace_service.update_product(
+        product_id=product_id,
+        name=product.name,
+        description=product.description,
+        price=product.price,
+        image_url=product.image_url,
+        category=product.category
+    )
+    
+    if result["success"]:
+        return result
+    else:
+        raise HTTPException(
+            status_code=404 if "non trouvé" in result.get("error", "") else 500,
+            detail=result.get("error")
         )
-        
-        if result["success"]:
-            return result
-        else:
-            raise HTTPException(
-                status_code=404 if "non trouvé" in result.get("error", "") else 500,
-                detail=result.get("error")
-            )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"[B2C] Update product error: {e}")
-        raise HTTPException(status_code=500, detail=f"Error updating product: {str(e)}")
 
 @app.delete("/api/b2c/marketplace/products/{product_id}")
 async def b2c_delete_product(product_id: str):
     """B2C: Delete marketplace product"""
-    try:
-        if not marketplace_service:
-            raise HTTPException(status_code=503, detail="Marketplace service not initialized")
-        
-        result = marketplace_service.delete_product(product_id)
-        if result["success"]:
-            return result
-        else:
-            raise HTTPException(
-                status_code=404 if "non trouvé" in result.get("error", "") else 500,
-                detail=result.get("error")
-            )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"[B2C] Delete product error: {e}")
-        raise HTTPException(status_code=500, detail=f"Error deleting product: {str(e)}")
+    if not marketplace_service:
+        raise HTTPException(status_code=503, detail="Marketplace service not initialized")
+    
+    result = marketplace_service.delete_product(product_id)
+    if result["success"]:
+        return result
+    else:
+        raise HTTPException(
+            status_code=404 if "non trouvé" in result.get("error", "") else 500,
+            detail=result.get("error")
+        )
 
 @app.get("/api/b2c/marketplace/stats")
 async def b2c_marketplace_stats():
     """B2C: Get marketplace statistics"""
-    try:
-        if not marketplace_service:
-            raise HTTPException(status_code=503, detail="Marketplace service not initialized")
-        
-        stats = marketplace_service.get_stats()
-        return {"success": True, "stats": stats}
-    except Exception as e:
-        logger.error(f"[B2C] Stats error: {e}")
-        raise HTTPException(status_code=500, detail=f"Error fetching stats: {str(e)}")
+    if not marketplace_service:
+        raise HTTPException(status_code=503, detail="Marketplace service not initialized")
+    
+    stats = marketplace_service.get_stats()
+    return {"success": True, "stats": stats}
 
 # Order Endpoints
 @app.post("/api/b2c/orders")
 async def b2c_create_order(order_request: CreateOrderRequest):
     """B2C: Create new order"""
-    try:
-        if not order_service:
-            raise HTTPException(status_code=503, detail="Order service not initialized")
-        
-        result = order_service.create_order(
-            customer_name=order_request.customer_name,
-            customer_phone=order_request.customer_phone,
-            shipping_address=order_request.shipping_address,
-            items=order_request.items,
-            payment_method=order_request.payment_method
-        )
-        
-        if result["success"]:
-            return result
-        else:
-            raise HTTPException(status_code=500, detail=result.get("error"))
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"[B2C] Create order error: {e}")
-        raise HTTPException(status_code=500, detail=f"Error creating order: {str(e)}")
+    if not order_service:
+        raise HTTPException(status_code=503, detail="Order service not initialized")
+    
+    result = order_service.create_order(
+        customer_name=order_request.customer_name,
+        customer_phone=order_request.customer_phone,
+        shipping_address=order_request.shipping_address,
+        items=order_request.items,
+        payment_method=order_request.payment_method
+    )
+    
+    if result["success"]:
+        return result
+    else:
+        raise HTTPException(status_code=500, detail=result.get("error"))
 
 @app.get("/api/b2c/orders")
 async def b2c_get_orders():
     """B2C: Get all orders"""
-    try:
-        if not order_service:
-            raise HTTPException(status_code=503, detail="Order service not initialized")
-        
-        orders = order_service.get_all_orders()
-        return {"success": True, "orders": orders, "total": len(orders)}
-    except Exception as e:
-        logger.error(f"[B2C] Get orders error: {e}")
-        raise HTTPException(status_code=500, detail=f"Error fetching orders: {str(e)}")
+    if not order_service:
+        raise HTTPException(status_code=503, detail="Order service not initialized")
+    
+    orders = order_service.get_all_orders()
+    # Returned directly: skips jsonable_encoder on the whole list
+    return ORJSONResponse({"success": True, "orders": orders, "total": len(orders)})
 
 @app.get("/api/b2c/orders/stats")
 async def b2c_order_stats():
     """B2C: Get order statistics"""
-    try:
-        if not order_service:
-            raise HTTPException(status_code=503, detail="Order service not initialized")
-        
-        stats = order_service.get_stats()
-        return {"success": True, "stats": stats}
-    except Exception as e:
-        logger.error(f"[B2C] Order stats error: {e}")
-        raise HTTPException(status_code=500, detail=f"Error fetching stats: {str(e)}")
+    if not order_service:
+        raise HTTPException(status_code=503, detail="Order service not initialized")
+    
+    stats = order_service.get_stats()
+    return {"success": True, "stats": stats}
 
 # Settings Endpoints
 @app.get("/api/b2c/settings")
 async def b2c_get_settings():
     """B2C: Get marketplace settings"""
-    try:
-        if not settings_service:
-            raise HTTPException(status_code=503, detail="Settings service not initialized")
-        
-        settings = settings_service.get_settings()
-        return {"success": True, "settings": settings}
-    except Exception as e:
-        logger.error(f"[B2C] Get settings error: {e}")
-        raise HTTPException(status_code=500, detail=f"Error fetching settings: {str(e)}")
+    if not settings_service:
+        raise HTTPException(status_code=503, detail="Settings service not initialized")
+    
+    settings = settings_service.get_settings()
+    return {"success": True, "settings": settings}
 
 @app.put("/api/b2c/settings")
 async def b2c_update_settings(settings_request: UpdateSettingsRequest):
     """B2C: Update marketplace settings"""
-    try:
-        if not settings_service:
-            raise HTTPException(status_code=503, detail="Settings service not initialized")
-        
-        result = settings_service.update_settings(
-            marketplace_name=settings_request.marketplace_name,
-            marketplace_logo=settings_request.marketplace_logo,
-            marketplace_description=settings_request.marketplace_description
-        )
-        
-        if result["success"]:
-            return result
-        else:
-            raise HTTPException(status_code=500, detail=result.get("error"))
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"[B2C] Update settings error: {e}")
-        raise HTTPException(status_code=500, detail=f"Error updating settings: {str(e)}")
+    if not settings_service:
+        raise HTTPException(status_code=503, detail="Settings service not initialized")
+    
+    result = settings_service.update_settings(
+        marketplace_name=settings_request.marketplace_name,
+        marketplace_logo=settings_request.marketplace_logo,
+        marketplace_description=settings_request.marketplace_description
+    )
+    
+    if result["success"]:
+        return result
+    else:
+        raise HTTPException(status_code=500, detail=result.get("error"))
 
 
 # ==================== B2B ENDPOINTS ====================
@@ -601,190 +691,211 @@ from app.core.jwt import create_access_token
 @app.post("/api/b2b/auth/register", response_model=B2BUserOut)
 async def b2b_register(user: B2BUserCreate):
     """B2B: Register new business user"""
+    # bcrypt + SQLite are blocking: keep them off the event loop
+    hashed_pw = await asyncio.to_thread(hash_password, user.password)
+    user_data = {
+        "email": user.email,
+        "password": hashed_pw,
+        "company_name": user.company_name,
+        "contact_person": user.contact_person,
+        "phone": user.phone,
+        "address": user.address,
+        "business_type": user.business_type,
+        "user_type": "b2b",
+        "is_verified": False
+    }
+    
     try:
-        hashed_pw = hash_password(user.password)
-        user_data = {
-            "email": user.email,
-            "password": hashed_pw,
-            "company_name": user.company_name,
-            "contact_person": user.contact_person,
-            "phone": user.phone,
-            "address": user.address,
-            "business_type": user.business_type,
-            "user_type": "b2b",
-            "is_verified": False
-        }
-        
-        created_user = user_db.create_user(user_data)
-        
-        return B2BUserOut(
-            id=created_user["id"],
-            email=created_user["email"],
-            company_name=created_user["company_name"],
-            contact_person=created_user["contact_person"],
-            phone=created_user["phone"],
-            address=created_user["address"],
-            business_type=created_user["business_type"]
-        )
+        created_user = await asyncio.to_thread(user_db.create_user, user_data)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error(f"[B2B] Registration error: {e}")
-        raise HTTPException(status_code=500, detail=f"Registration failed: {str(e)}")
+    
+    # Row written from the validated B2BUserCreate body: no re-validation needed
+    return B2BUserOut.model_construct(
+        id=created_user["id"],
+        email=created_user["email"],
+        company_name=created_user["company_name"],
+        contact_person=created_user["contact_person"],
+        phone=created_user["phone"],
+        address=created_user["address"],
+        business_type=created_user["business_type"]
+    )
 
 @app.post("/api/b2b/auth/login")
 async def b2b_login(user: UserCreate):
     """B2B: Login business user"""
-    try:
-        db_user = user_db.get_user_by_email(user.email, user_type="b2b")
-        if not db_user or not verify_password(user.password, db_user["password"]):
-            raise HTTPException(status_code=401, detail="Invalid credentials")
+    db_user = await asyncio.to_thread(user_db.get_user_by_email, user.email, "b2b")
+    if not db_user or not await asyncio.to_thread(verify_password, user.password, db_user["password"]):
+        raise HTTPException(status_code=401, detail="Invalid credentials")
 
-        token = create_access_token({"sub": db_user["id"]})
-        return {
-            "access_token": token,
-            "token_type": "bearer",
-            "user": B2BUserOut(
-                id=db_user["id"],
-                email=db_user["email"],
-                company_name=db_user["company_name"],
-                contact_person=db_user["contact_person"],
-                phone=db_user["phone"],
-                address=db_user["address"],
-                business_type=db_user["business_type"]
-            )
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"[B2B] Login error: {e}")
-        raise HTTPException(status_code=500, detail=f"Login failed: {str(e)}")
+    token = create_access_token({"sub": db_user["id"]})
+    return {
+        "access_token": token,
+        "token_type": "bearer",
+        "user": B2BUserOut.model_construct(
+            id=db_user["id"],
+            email=db_user["email"],
+            company_name=db_user["company_name"],
+            contact_person=db_user["contact_person"],
+            phone=db_user["phone"],
+            address=db_user["address"],
+            business_type=db_user["business_type"]
+        )
+    }
 
 @app.get("/api/b2b/auth/stats")
 async def b2b_auth_stats():
     """B2B: Get user registration statistics"""
-    try:
-        stats = user_db.get_stats()
-        return {"success": True, "stats": stats}
-    except Exception as e:
-        logger.error(f"[B2B] Stats error: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to get stats: {str(e)}")
+    stats = user_db.get_stats()
+    return {"success": True, "stats": stats}
+
+def _b2b_best_supplier(req: SearchRequest, products: List[dict]) -> dict:
+    """Price-optimize search results, pick the best supplier and explain the choice"""
+    optimized_products = b2b_price_optimizer.optimize(
+        products=products,
+        quantity=req.quantity,
+        max_price=req.max_price,
+        query=req.product_name
+    )
+    
+    if not optimized_products:
+        return {
+            "best_product": None,
+            "alternatives": [],
+            "explanation": "No products match your criteria."
+        }
+    
+    best_supplier = optimized_products[0]
+    best_price = best_supplier["total_price"]
+    # optimize() already dropped everything above max_price; stop at 3 matches
+    alternatives = list(islice(
+        (p for p in islice(optimized_products, 1, None) if p["total_price"] > best_price),
+        3
+    ))
+    
+    explanation = b2b_explainer.explain_choice(
+        best_supplier=best_supplier,
+        query=req.product_name,
+        quantity=req.quantity
+    )
+    
+    return {
+        "best_product": best_supplier,
+        "alternatives": alternatives,
+        "explanation": explanation
+    }
+
+# Fields the B2B frontend expects on every recommended product
+_B2B_CONTACT_DEFAULTS = {"phone": None, "email": None, "city": None}
+
+def _b2b_with_defaults(product: dict) -> dict:
+    """Backfill missing/empty frontend fields in a single dict merge"""
+    defaults = {
+        **_B2B_CONTACT_DEFAULTS,
+        "description": f"Recommended based on your interest in {product.get('category', 'similar products')}"
+    }
+    return {**product, **{key: value for key, value in defaults.items() if not product.get(key)}}
+
+def get_events(request: Request):
+    """Event store resolved at startup (see lifespan)"""
+    return request.app.state.events_collection
 
 if B2B_AVAILABLE:
+    def _b2b_track_searches(events, user_id: str, product_names: List[str]):
+        """Log one search event per product name (blocking SQLite writes)"""
+        for product_name in product_names:
+            events.track_event({
+                "user_id": user_id,
+                "event_type": "search",
+                "content": product_name
+            })
+    
     @app.post("/api/b2b/search")
     async def b2b_search_suppliers(
         req: SearchRequest,
-        user_id: str = Depends(get_current_user_id)
+        user_id: str = Depends(get_current_user_id),
+        events=Depends(get_events)
     ):
         """B2B: Search for best suppliers with price optimization"""
-        try:
-            # Log search event
-            events = get_events_collection()
-            event_id = events.track_event({
-                "user_id": user_id,
-                "event_type": "search",
-                "content": req.product_name
-            })
-            
-            # Search suppliers
-            products = b2b_search_agent.search(req.product_name, top_k=20)
-            
-            # Optimize by price
-            optimized_products = b2b_price_optimizer.optimize(
-                products=products,
-                quantity=req.quantity,
-                max_price=req.max_price,
-                query=req.product_name
-            )
-            
-            if not optimized_products:
-                return {
-                    "best_product": None,
-                    "alternatives": [],
-                    "explanation": "No products match your criteria."
-                }
-            
-            best_supplier = optimized_products[0]
-            alternatives = [
-                p for p in optimized_products[1:]
-                if p["total_price"] > best_supplier["total_price"]
-                and (req.max_price is None or p["total_price"] <= req.max_price)
-            ][:3]
-            
-            explanation = b2b_explainer.explain_choice(
-                best_supplier=best_supplier,
-                query=req.product_name,
-                quantity=req.quantity
-            )
-            
-            return {
-                "best_product": best_supplier,
-                "alternatives": alternatives,
-                "explanation": explanation
-            }
-        except Exception as e:
-            logger.error(f"[B2B] Search error: {e}")
-            raise HTTPException(status_code=500, detail=f"B2B search error: {str(e)}")
+        if not b2b_search_agent:
+            raise HTTPException(status_code=503, detail="B2B services not initialized")
+        # SQLite write, Qdrant search and Groq explanation all block: run them in threads
+        await asyncio.to_thread(_b2b_track_searches, events, user_id, [req.product_name])
+        
+        # Search suppliers
+        products = await asyncio.to_thread(b2b_search_agent.search, req.product_name, top_k=20)
+        
+        return await asyncio.to_thread(_b2b_best_supplier, req, products)
+    
+    @app.post("/api/b2b/search/batch")
+    async def b2b_search_suppliers_batch(
+        req: BatchSearchRequest,
+        user_id: str = Depends(get_current_user_id),
+        events=Depends(get_events)
+    ):
+        """B2B: Best supplier for several products (one batched Qdrant query)"""
+        if not b2b_search_agent:
+            raise HTTPException(status_code=503, detail="B2B services not initialized")
+        await asyncio.to_thread(
+            _b2b_track_searches, events, user_id, [query.product_name for query in req.queries]
+        )
+        
+        # One embedding batch + one query_batch_points round-trip for all products
+        products_per_query = await asyncio.to_thread(
+            b2b_search_agent.search_batch,
+            [query.product_name for query in req.queries],
+            top_k=20
+        )
+        
+        # Price optimization + Groq explanation per query, concurrently
+        results = await asyncio.gather(*[
+            asyncio.to_thread(_b2b_best_supplier, query, products)
+            for query, products in zip(req.queries, products_per_query)
+        ])
+        return {"results": results}
     
     @app.post("/api/b2b/click")
     async def b2b_track_click(
         req: ClickRequest,
-        user_id: str = Depends(get_current_user_id)
+        user_id: str = Depends(get_current_user_id),
+        events=Depends(get_events)
     ):
         """B2B: Track user click for personalization"""
-        try:
-            events = get_events_collection()
-            event_id = events.track_event({
-                "user_id": user_id,
-                "event_type": "click",
-                "content": req.product_name
-            })
-            return {"status": "ok", "message": "Click recorded", "event_id": event_id}
-        except Exception as e:
-            logger.error(f"[B2B] Click tracking error: {e}")
-            raise HTTPException(status_code=500, detail=f"Click tracking error: {str(e)}")
+        event_id = events.track_event({
+            "user_id": user_id,
+            "event_type": "click",
+            "content": req.product_name
+        })
+        return {"status": "ok", "message": "Click recorded", "event_id": event_id}
     
     @app.get("/api/b2b/recommendations")
     async def b2b_get_recommendations(
         user_id: str = Depends(get_current_user_id)
     ):
         """B2B: Get personalized supplier recommendations"""
-        try:
-            from app.core.personalization import get_user_preference_text
-            from app.core.qdrant_personalization import query_personalized_products
-            
-            # Get user preferences from their interaction history
-            preference_text = await get_user_preference_text(user_id)
-            
-            if not preference_text:
-                return {
-                    "recommended_products": [],
-                    "reason": "No search history yet. Start searching to get personalized recommendations!"
-                }
-            
-            # Query personalized products based on user preferences
-            products = query_personalized_products(preference_text, top_k=10)
-            
-            # Add additional fields for frontend compatibility
-            for product in products:
-                if not product.get('description'):
-                    product['description'] = f"Recommended based on your interest in {product.get('category', 'similar products')}"
-                if not product.get('phone'):
-                    product['phone'] = None
-                if not product.get('email'):
-                    product['email'] = None
-                if not product.get('city'):
-                    product['city'] = None
-            
+        from app.core.personalization import get_user_preference_text
+        from app.core.qdrant_personalization import query_personalized_products
+        
+        # Get user preferences from their interaction history
+        preference_text = await get_user_preference_text(user_id)
+        
+        if not preference_text:
             return {
-                "recommended_products": products,
-                "reason": "Based on your search history and clicked suppliers",
-                "total_count": len(products)
+                "recommended_products": [],
+                "reason": "No search history yet. Start searching to get personalized recommendations!"
             }
-            
-        except Exception as e:
-            logger.error(f"[B2B] Recommendations error: {e}")
-            raise HTTPException(status_code=500, detail=f"Recommendations error: {str(e)}")
+        
+        # Query personalized products based on user preferences
+        products = query_personalized_products(preference_text, top_k=10)
+        
+        # Add additional fields for frontend compatibility
+        products = [_b2b_with_defaults(product) for product in products]
+        
+        return {
+            "recommended_products": products,
+            "reason": "Based on your search history and clicked suppliers",
+            "total_count": len(products)
+        }
     
     # Include B2B auth routes
     app.include_router(auth.router, prefix="/api/b2b", tags=["B2B Auth"])
@@ -795,192 +906,228 @@ if B2B_AVAILABLE:
 # ==================== USERSHOP ENDPOINTS ====================
 # Prefix: /api/usershop
 
-@app.post("/api/usershop/recommend", response_model=UsershopRecommendationResponse)
+def require_usershop():
+    """503 until the Usershop collection is initialized (and its CSVs loaded)"""
+    if SERVICE_STATUS["usershop"] != "active":
+        raise HTTPException(status_code=503, detail="Usershop service not initialized")
+
+def require_usershop_started():
+    """503 only while the startup load runs: load/admin routes stay open after a
+    failed startup so products can still be (re)loaded"""
+    if SERVICE_STATUS["usershop"] == "initializing":
+        raise HTTPException(status_code=503, detail="Usershop service is still initializing")
+
+def _usershop_loaded():
+    """A successful manual load recovers from a failed startup load"""
+    if SERVICE_STATUS["usershop"] == "failed":
+        logger.info("✅ [USERSHOP] Products loaded manually, service is now active")
+        _set_service_status("usershop", "active")
+
+USERSHOP_DEPS = [Depends(require_usershop)]
+USERSHOP_ADMIN_DEPS = [Depends(require_usershop_started)]
+
+async def _compute_usershop_recommendations(request: RecommendationRequest, payload: dict, cache_key: tuple):
+    """Vector search + filtering + AI recommendations, stored in the recommendation cache"""
+    logger.info("[USERSHOP] New search: %s", payload)
+    
+    # Create search query
+    search_query = advanced_llm_service.create_search_query(payload)
+    
+    # Vector search (100 products)
+    search_limit = 100
+    similar_products = await usershop_db.search_similar_products(search_query, limit=search_limit)
+    
+    if not similar_products:
+        raise HTTPException(status_code=404, detail="No products found")
+    
+    total_found = len(similar_products)
+    
+    # Advanced filtering and scoring
+    best_products = advanced_llm_service.select_best_products(
+        similar_products, 
+        payload, 
+        limit=request.limit
+    )
+    
+    if not best_products:
+        raise HTTPException(status_code=404, detail="No products match price criteria")
+    
+    total_after_filter = len(best_products)
+    target_product = best_products[0]
+    
+    # Generate recommendations with AI
+    recommendations = await advanced_llm_service.generate_recommendations(
+        target_product, 
+        best_products[1:],
+        payload,
+        total_found,
+        total_after_filter
+    )
+    
+    logger.info(f"[USERSHOP] Recommendations generated: 1 main + {len(recommendations.recommendations)} similar")
+    
+    _recommendation_cache[cache_key] = (time.monotonic() + RECOMMENDATION_CACHE_TTL_SECONDS, recommendations)
+    _recommendation_cache.move_to_end(cache_key)
+    if len(_recommendation_cache) > RECOMMENDATION_CACHE_SIZE:
+        _recommendation_cache.popitem(last=False)
+    return recommendations
+
+@app.post("/api/usershop/recommend", response_model=UsershopRecommendationResponse, dependencies=USERSHOP_DEPS)
 async def usershop_get_recommendations(request: RecommendationRequest):
     """Usershop: Get ultra-precise product recommendations"""
-    try:
-        logger.info(f"[USERSHOP] New search: {request.dict()}")
-        
-        # Create search query
-        search_query = advanced_llm_service.create_search_query(request.dict())
-        
-        # Vector search (100 products)
-        search_limit = 100
-        similar_products = await usershop_db.search_similar_products(search_query, limit=search_limit)
-        
-        if not similar_products:
-            raise HTTPException(status_code=404, detail="No products found")
-        
-        total_found = len(similar_products)
-        
-        # Advanced filtering and scoring
-        best_products = advanced_llm_service.select_best_products(
-            similar_products, 
-            request.dict(), 
-            limit=request.limit
-        )
-        
-        if not best_products:
-            raise HTTPException(status_code=404, detail="No products match price criteria")
-        
-        total_after_filter = len(best_products)
-        target_product = best_products[0]
-        
-        # Generate recommendations with AI
-        recommendations = await advanced_llm_service.generate_recommendations(
-            target_product, 
-            best_products[1:],
-            request.dict(),
-            total_found,
-            total_after_filter
-        )
-        
-        logger.info(f"[USERSHOP] Recommendations generated: 1 main + {len(recommendations.recommendations)} similar")
-        return recommendations
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"[USERSHOP] Recommendation error: {e}")
-        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+    # Serialized once; reused for the cache key, logs, query building and scoring
+    payload = request.model_dump()
+    cache_key = _recommendation_cache_key(payload)
+    cached = _recommendation_cache.get(cache_key)
+    if cached is not None and cached[0] > time.monotonic():
+        _recommendation_cache.move_to_end(cache_key)
+        logger.info("[USERSHOP] Cache hit: %s", payload)
+        return cached[1]
+    
+    # Identical requests arriving before the first one is cached share its run
+    return await _single_flight(
+        ("usershop_recommend",) + cache_key,
+        lambda: _compute_usershop_recommendations(request, payload, cache_key)
+    )
 
-@app.post("/api/usershop/compare", response_model=ComparisonResponse)
+@app.post("/api/usershop/compare", response_model=ComparisonResponse, dependencies=USERSHOP_DEPS)
 async def usershop_compare_products(request: ProductComparisonRequest):
     """Usershop: Compare two products with AI analysis"""
-    try:
-        logger.info(f"[USERSHOP] Comparison: {request.product_id_1} vs {request.product_id_2}")
-        
-        product_1 = await usershop_db.get_product_by_id(request.product_id_1)
-        product_2 = await usershop_db.get_product_by_id(request.product_id_2)
-        
-        if not product_1:
-            raise HTTPException(status_code=404, detail=f"Product 1 not found: {request.product_id_1}")
-        
-        if not product_2:
-            raise HTTPException(status_code=404, detail=f"Product 2 not found: {request.product_id_2}")
-        
-        comparison_data = await advanced_llm_service.compare_products(product_1, product_2)
-        response = ComparisonResponse(**comparison_data)
-        
-        logger.info(f"[USERSHOP] Comparison generated: {response.final_recommendation}")
-        return response
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"[USERSHOP] Comparison error: {e}")
-        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+    logger.info(f"[USERSHOP] Comparison: {request.product_id_1} vs {request.product_id_2}")
+    
+    # Both lookups hit Qdrant independently: fetch them concurrently
+    product_1, product_2 = await asyncio.gather(
+        usershop_db.get_product_by_id(request.product_id_1),
+        usershop_db.get_product_by_id(request.product_id_2)
+    )
+    
+    if not product_1:
+        raise HTTPException(status_code=404, detail=f"Product 1 not found: {request.product_id_1}")
+    
+    if not product_2:
+        raise HTTPException(status_code=404, detail=f"Product 2 not found: {request.product_id_2}")
+    
+    comparison_data = await advanced_llm_service.compare_products(product_1, product_2)
+    response = ComparisonResponse(**comparison_data)
+    
+    logger.info(f"[USERSHOP] Comparison generated: {response.final_recommendation}")
+    return response
 
-@app.get("/api/usershop/product/{product_id}")
+@app.get("/api/usershop/product/{product_id}", dependencies=USERSHOP_DEPS)
 async def usershop_get_product(product_id: str):
     """Usershop: Get product details by ID"""
-    try:
-        product = await usershop_db.get_product_by_id(product_id)
-        if not product:
-            raise HTTPException(status_code=404, detail="Product not found")
-        return product
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"[USERSHOP] Get product error: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+    product = await usershop_db.get_product_by_id(product_id)
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return product
 
-@app.post("/api/usershop/search")
+@app.post("/api/usershop/search", dependencies=USERSHOP_DEPS)
 async def usershop_search_products(request: ProductSearchRequest):
     """Usershop: Search products by text query"""
-    try:
-        products = await usershop_db.search_similar_products(request.query, request.limit)
-        return {"query": request.query, "results": products, "count": len(products)}
-    except Exception as e:
-        logger.error(f"[USERSHOP] Search error: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+    products = await usershop_db.search_similar_products(request.query, request.limit)
+    return {"query": request.query, "results": products, "count": len(products)}
 
-@app.post("/api/usershop/add-products")
+@app.post("/api/usershop/add-products", dependencies=USERSHOP_ADMIN_DEPS)
 async def usershop_add_products(file: UploadFile = File(...)):
     """Usershop: Upload CSV file with products"""
+    if not file.filename.endswith('.csv'):
+        raise HTTPException(status_code=400, detail="File must be CSV")
+    
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.csv') as tmp_file:
+        # Copy the upload chunk by chunk instead of holding it whole in memory
+        while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+            tmp_file.write(chunk)
+        tmp_file_path = tmp_file.name
+    
     try:
-        if not file.filename.endswith('.csv'):
-            raise HTTPException(status_code=400, detail="File must be CSV")
+        if not await asyncio.to_thread(data_loader.validate_csv_format, tmp_file_path):
+            raise HTTPException(
+                status_code=400, 
+                detail="Invalid CSV format. Required columns: url, name, category, brand, img, description, price"
+            )
         
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.csv') as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
+        load_stats = {"total_rows": 0, "valid_products": 0, "invalid_rows": 0, "duplicates_removed": 0, "steps": []}
+        upload_stats = {"total": 0, "success": 0, "failed": 0, "steps": []}
+        batches = data_loader.iter_product_batches(tmp_file_path, load_stats)
         
+        # Pipeline: the next CSV chunk is parsed in a worker thread while the
+        # current one is embedded and uploaded (one upload at a time, with HNSW
+        # indexing paused once for the whole file)
+        pending = asyncio.ensure_future(asyncio.to_thread(next, batches, None))
         try:
-            if not data_loader.validate_csv_format(tmp_file_path):
-                raise HTTPException(
-                    status_code=400, 
-                    detail="Invalid CSV format. Required columns: url, name, category, brand, img, description, price"
-                )
-            
-            products, load_stats = data_loader.load_products_from_csv(tmp_file_path)
-            
-            if not products:
-                raise HTTPException(status_code=400, detail="No valid products found in CSV")
-            
-            upload_stats = await usershop_db.add_products(products)
-            
-            return {
-                "message": f"{len(products)} products added successfully",
-                "count": len(products),
-                "loading_stats": load_stats,
-                "upload_stats": upload_stats,
-                "all_steps": load_stats["steps"] + upload_stats["steps"]
-            }
+            async with usershop_db.bulk_load():
+                while (products := await pending) is not None:
+                    pending = asyncio.ensure_future(asyncio.to_thread(next, batches, None))
+                    load_stats["valid_products"] += len(products)
+                    batch_stats = await usershop_db.add_products(products)
+                    for key in ("total", "success", "failed"):
+                        upload_stats[key] += batch_stats[key]
+                    upload_stats["steps"].extend(batch_stats["steps"])
         finally:
-            os.unlink(tmp_file_path)
-            
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"[USERSHOP] Add products error: {e}")
-        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
-
-@app.post("/api/usershop/load-from-directory")
-async def usershop_load_directory(directory: str = "data"):
-    """Usershop: Load all CSV files from directory"""
-    try:
-        logger.info(f"[USERSHOP] Loading products from '{directory}'...")
-        
-        products, load_stats = data_loader.load_all_csv_from_directory(directory)
+            # Wait for the parser thread, then close the CSV reader so the temp
+            # file can be removed (Windows refuses to unlink an open file)
+            await asyncio.gather(pending, return_exceptions=True)
+            batches.close()
+            if upload_stats["success"]:
+                _recommendation_cache.clear()
+                _usershop_loaded()
         
-        if not products:
-            raise HTTPException(status_code=404, detail=f"No products found in '{directory}'")
+        if not load_stats["valid_products"]:
+            raise HTTPException(status_code=400, detail="No valid products found in CSV")
         
-        upload_stats = await usershop_db.add_products(products)
-        collection_info = usershop_db.get_collection_info()
+        load_stats["steps"] += [
+            f"✅ {load_stats['total_rows']} lignes lues, colonnes requises présentes",
+            f"✅ {load_stats['invalid_rows']} lignes invalides supprimées",
+            f"✅ {load_stats['duplicates_removed']} doublons supprimés",
+            f"✅ {load_stats['valid_products']} produits créés avec succès"
+        ]
         
         return {
-            "message": f"✅ {len(products)} products loaded from {load_stats['files_processed']} file(s)",
-            "total_products": len(products),
-            "files_processed": load_stats['files_processed'],
-            "collection_info": collection_info,
+            "message": f"{load_stats['valid_products']} products added successfully",
+            "count": load_stats["valid_products"],
             "loading_stats": load_stats,
             "upload_stats": upload_stats,
             "all_steps": load_stats["steps"] + upload_stats["steps"]
         }
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"[USERSHOP] Load directory error: {e}")
-        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+    finally:
+        os.unlink(tmp_file_path)
 
-@app.get("/api/usershop/stats")
+@app.post("/api/usershop/load-from-directory", dependencies=USERSHOP_ADMIN_DEPS)
+async def usershop_load_directory(directory: str = "data"):
+    """Usershop: Load all CSV files from directory"""
+    logger.info(f"[USERSHOP] Loading products from '{directory}'...")
+    
+    products, load_stats = data_loader.load_all_csv_from_directory(directory)
+    
+    if not products:
+        raise HTTPException(status_code=404, detail=f"No products found in '{directory}'")
+    
+    upload_stats = await usershop_db.add_products(products)
+    _recommendation_cache.clear()
+    _usershop_loaded()
+    collection_info = usershop_db.get_collection_info()
+    
+    return {
+        "message": f"✅ {len(products)} products loaded from {load_stats['files_processed']} file(s)",
+        "total_products": len(products),
+        "files_processed": load_stats['files_processed'],
+        "collection_info": collection_info,
+        "loading_stats": load_stats,
+        "upload_stats": upload_stats,
+        "all_steps": load_stats["steps"] + upload_stats["steps"]
+    }
+
+@app.get("/api/usershop/stats", dependencies=USERSHOP_ADMIN_DEPS)
 async def usershop_get_stats():
     """Usershop: Get database statistics"""
-    try:
-        collection_info = usershop_db.get_collection_info()
-        return {
-            "status": "ok",
-            "service": "usershop",
-            "collection": collection_info,
-            "embedding_model": usershop_settings.EMBEDDING_MODEL,
-            "llm_model": usershop_settings.GROQ_MODEL
-        }
-    except Exception as e:
-        logger.error(f"[USERSHOP] Stats error: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+    collection_info = usershop_db.get_collection_info()
+    return {
+        "status": "ok",
+        "service": "usershop",
+        "collection": collection_info,
+        "embedding_model": usershop_settings.EMBEDDING_MODEL,
+        "llm_model": usershop_settings.GROQ_MODEL
+    }
 
 # ==================== SHOPGPT ENDPOINTS ====================
 # Prefix: /api/shopping (matches frontend calls)
@@ -13,6 +13,7 @@ from app.core.config import settings
 from app.models.schemas import Product
 from qdrant_client.models import Filter, FieldCondition
 from PIL import Image
+from concurrent.futures import ThreadPoolExecutor
 import io
 
 def main():
@@ -38,7 +39,7 @@ def main():
     print(f"   Found {len(aziza_products)} Aziza products")
     
     # Filter only products with images
-    products_with_images = [p for p in aziza_products if p.get('image_blob')]  # Changed from image_data to image_blob
+    products_with_images = [p for p in aziza_products if p.get('image_path') or p.get('image_blob')]
     print(f"   Products with images: {len(products_with_images)}")
     
     if not products_with_images:
@@ -48,47 +49,96 @@ def main():
     # Step 3: Load to Qdrant with IMAGE embeddings
     print("\n[STEP 3] Loading to Qdrant with IMAGE embeddings...")
     
-    batch_size = 10
-    total_loaded = 0
+    # Build Product objects up front so image preparation can run ahead
+    products_to_load = []
     failed = 0
-    
-    for i in range(0, len(products_with_images), batch_size):
-        batch = products_with_images[i:i+batch_size]
-        batch_num = i // batch_size + 1
-        total_batches = (len(products_with_images) + batch_size - 1) // batch_size
+    for product_dict in products_with_images:
+        try:
+            # Create Product object
+            product = Product(
+                id=str(product_dict["id"]),
+                name=product_dict["name"],
+                description=product_dict.get("description", ""),
+                category=product_dict.get("category", "unknown"),
+                price=product_dict["price"],
+                market=product_dict["market"],
+                image_path=product_dict.get("image_path"),
+                specs=product_dict.get("specs", {}),
+                brand=product_dict.get("brand")
+            )
+            # Image file (or legacy BLOB) bytes, read in the prefetch thread
+            products_to_load.append((product, product_dict))
         
+        except Exception as e:
+            print(f"      [ERROR] Error: {str(e)[:50]}")
+            failed += 1
+    
+    # One SigLIP forward pass per batch (amortizes per-call model overhead);
+    # the next batch is decoded/preprocessed on a CPU thread meanwhile
+    batch_size = 64
+    total_loaded = 0
+    batches = [products_to_load[i:i+batch_size] for i in range(0, len(products_to_load), batch_size)]
+    total_batches = len(batches)
+    
+    def prepare(batch):
+        """
+        Read image bytes and preprocess the batch (runs in the prefetch thread).
+        Products whose image is missing or unreadable are left out here, so
+        they can't fail the rest of the batch.
+        """
+        kept, images, skipped = [], [], []
+        for product, product_dict in batch:
+            try:
+                image_bytes = product_db.get_product_image_bytes(product_dict)
+            except Exception:
+                image_bytes = None
+            if image_bytes:
+                kept.append(product)
+                images.append(image_bytes)
+            else:
+                skipped.append(product)
+        try:
+            inputs = siglip_service.prepare_images_batch(images) if images else None
+        except Exception as e:
+            inputs = e  # Re-raised in the main loop, which falls back per image
+        return kept, images, skipped, inputs
+    
+    executor = ThreadPoolExecutor(max_workers=1)
+    pending = executor.submit(prepare, batches[0]) if batches else None
+    
+    for batch_num, batch in enumerate(batches, 1):
         print(f"\n   [BATCH] Batch {batch_num}/{total_batches} ({len(batch)} products)...")
         
-        products_to_insert = []
+        kept, images, skipped, inputs = pending.result()
+        if batch_num < total_batches:
+            pending = executor.submit(prepare, batches[batch_num])
+        
+        for product in skipped:
+            print(f"      [ERROR] No image for {product.name[:50]}")
+        failed += len(skipped)
+        
+        products_to_insert = kept
         embeddings_to_insert = []
         
-        for product_dict in batch:
+        # Generate IMAGE embeddings for the whole batch at once
+        if kept:
             try:
-                # Create Product object
-                product = Product(
-                    id=str(product_dict["id"]),
-                    name=product_dict["name"],
-                    description=product_dict.get("description", ""),
-                    category=product_dict.get("category", "unknown"),
-                    price=product_dict["price"],
-                    market=product_dict["market"],
-                    image_path=product_dict.get("image_path"),
-                    specs=product_dict.get("specs", {}),
-                    brand=product_dict.get("brand")
-                )
-                
-                # Generate IMAGE embedding
-                # image_blob is already bytes, pass it directly
-                embedding = siglip_service.embed_image(product_dict["image_blob"])
-                
-                products_to_insert.append(product)
-                embeddings_to_insert.append(embedding)
-                
-                print(f"      [OK] {product.name[:50]}")
-            
+                if isinstance(inputs, Exception):
+                    raise inputs
+                embeddings_to_insert = siglip_service.embed_prepared_batch(inputs)
+                print(f"      [OK] Embedded {len(embeddings_to_insert)} images")
             except Exception as e:
-                print(f"      [ERROR] Error: {str(e)[:50]}")
-                failed += 1
+                # One undecodable image fails the whole batch: retry one by one
+                print(f"      [WARNING] Batch embedding failed ({str(e)[:50]}), falling back to per-image")
+                products_to_insert = []
+                embeddings_to_insert = []
+                for product, image_bytes in zip(kept, images):
+                    try:
+                        embeddings_to_insert.append(siglip_service.embed_image(image_bytes))
+                        products_to_insert.append(product)
+                    except Exception as img_error:
+                        print(f"      [ERROR] {product.name[:50]}: {str(img_error)[:50]}")
+                        failed += 1
         
         # Insert batch
         if products_to_insert:
@@ -104,6 +154,8 @@ def main():
                 print(f"      [ERROR] Batch insert failed: {e}")
                 failed += len(products_to_insert)
     
+    executor.shutdown()
+    
     print(f"\n   [OK] Load complete!")
     print(f"      Total loaded: {total_loaded}")
     print(f"      Failed: {failed}")
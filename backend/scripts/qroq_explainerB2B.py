@@ -1,11 +1,19 @@
 from groq import Groq
 import os
+import threading
+from collections import OrderedDict
 from typing import Dict
 
+# Explications GROQ déjà générées (mêmes requête, quantité et fournisseur)
+EXPLANATION_CACHE_SIZE = 4096
+
 class GroqExplainer:
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.client = None
+        # LRU partagé entre les threads des endpoints
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
         
         # Tenter d'initialiser GROQ si la clé est valide
         if api_key and api_key.strip():
@@ -21,6 +29,14 @@ class GroqExplainer:
         # Si GROQ est disponible, l'utiliser
         if self.client:
             try:
+                # Dans le try : un fournisseur incomplet passe au fallback simple
+                cache_key = self._cache_key(best_supplier, query, quantity)
+                with self._cache_lock:
+                    cached = self._cache.get(cache_key)
+                    if cached is not None:
+                        self._cache.move_to_end(cache_key)
+                        return cached
+                
                 prompt = f"""Tu es un assistant d'achat en Tunisie.
 
 Requête utilisateur : "{query}"
@@ -42,13 +58,32 @@ Explique en 2-3 phrases courtes pourquoi ce fournisseur est le meilleur choix (p
                     max_tokens=150
                 )
                 
-                return response.choices[0].message.content.strip()
+                explanation = response.choices[0].message.content.strip()
+                with self._cache_lock:
+                    self._cache[cache_key] = explanation
+                    if len(self._cache) > EXPLANATION_CACHE_SIZE:
+                        self._cache.popitem(last=False)
+                return explanation
             except Exception as e:
                 print(f"⚠️ Erreur GROQ : {e}")
         
         # Fallback : explication simple sans IA
         return self._generate_simple_explanation(best_supplier, query, quantity)
     
+    @staticmethod
+    def _cache_key(best_supplier: Dict, query: str, quantity: int) -> tuple:
+        """Clé canonique : tout ce qui entre dans le prompt"""
+        return (
+            " ".join(query.lower().split()),
+            quantity,
+            best_supplier['supplier_name'],
+            best_supplier['city'],
+            best_supplier['product_name'],
+            best_supplier['brand'],
+            best_supplier['unit_price'],
+            best_supplier['total_price']
+        )
+    
     def _generate_simple_explanation(self, best_supplier: Dict, query: str, quantity: int) -> str:
         """Génère une explication simple sans IA"""
         return (
@@ -5,7 +5,6 @@ Uses YOUR cluster directly.
 """
 import sys
 from pathlib import Path
-import io
 import gc
 
 sys.path.append(str(Path(__file__).parent))
@@ -40,7 +39,7 @@ def load_retail_markets():
     cursor = product_db.conn.cursor()
     cursor.execute("""
         SELECT * FROM products 
-        WHERE image_blob IS NOT NULL
+        WHERE image_path IS NOT NULL OR image_blob IS NOT NULL
         ORDER BY updated_at DESC
     """)
     db_products = [dict(row) for row in cursor.fetchall()]
@@ -80,7 +79,7 @@ def load_retail_markets():
         print(f"   Products {batch_start+1}-{batch_end} of {len(db_products)}")
         
         products = []
-        embeddings = []
+        images = []
         
         for db_prod in batch_products_data:
             try:
@@ -97,23 +96,33 @@ def load_retail_markets():
                     brand=db_prod.get('brand')
                 )
                 
-                # Get image and create embedding
-                image = product_db.get_product_image(db_prod['product_id'])
-                if image:
-                    img_byte_arr = io.BytesIO()
-                    image.save(img_byte_arr, format='PNG')
-                    img_bytes = img_byte_arr.getvalue()
-                    
-                    # Generate visual embedding
-                    embedding = siglip_service.embed_image(img_bytes, preprocess=True)
-                    
+                # Get image (embedded below with the rest of the batch)
+                img_bytes = product_db.get_product_image_bytes(db_prod)
+                if img_bytes:
                     products.append(product)
-                    embeddings.append(embedding)
+                    images.append(img_bytes)
                     
             except Exception as e:
                 print(f"   ⚠️ Failed to process {db_prod['name']}: {e}")
                 continue
         
+        # Generate visual embeddings: one processor call + one forward pass per batch
+        embeddings = []
+        if products:
+            try:
+                embeddings = siglip_service.embed_images_batch(images, preprocess=True)
+            except Exception as e:
+                # A single unreadable image fails the whole batch: retry one by one
+                print(f"   ⚠️ Batch embedding failed ({e}), falling back to per-image")
+                kept = []
+                for product, img_bytes in zip(products, images):
+                    try:
+                        embeddings.append(siglip_service.embed_image(img_bytes, preprocess=True))
+                        kept.append(product)
+                    except Exception as img_error:
+                        print(f"   ⚠️ Failed to process {product.name}: {img_error}")
+                products = kept
+        
         # Insert batch into Qdrant
         if products:
             qdrant_service.batch_insert_products(
@@ -126,6 +135,7 @@ def load_retail_markets():
         
         # Clear memory
         del products
+        del images
         del embeddings
         gc.collect()
     
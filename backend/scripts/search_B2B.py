@@ -1,27 +1,87 @@
 from typing import List, Dict
+from collections import OrderedDict
+from qdrant_client.models import QueryRequest
+import numpy as np
+import threading
+
+# Query vectors kept per normalized query text (float16 bytes: half the RAM of float32)
+QUERY_CACHE_SIZE = 8192
 
 class SemanticSearchAgent:
     def __init__(self, embedding_agent):
         self.embedding_agent = embedding_agent
         self.qdrant_client = embedding_agent.qdrant_client
         self.collection_name = embedding_agent.collection_name
+        self._query_cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def search(self, query: str, top_k: int = 5) -> List[Dict]:
         """Semantic search for relevant products"""
-        # Embed the query
-        query_embedding = list(self.embedding_agent.embedding_model.embed([query]))[0]
+        return self.search_batch([query], top_k=top_k)[0]
+
+    def search_batch(self, queries: List[str], top_k: int = 5) -> List[List[Dict]]:
+        """
+        Semantic search for several queries (e.g. reformulations) at once:
+        one FastEmbed call for all query vectors and one batched Qdrant request.
+        Returns one result list per query, in input order.
+        """
+        query_embeddings = self._embed_queries(queries)
 
-        response = self.qdrant_client.query_points(
+        responses = self.qdrant_client.query_batch_points(
             collection_name=self.collection_name,
-            query=query_embedding.tolist(),
-            with_payload=True,
-            limit=top_k
+            requests=[
+                QueryRequest(query=embedding.tolist(), with_payload=True, limit=top_k)
+                for embedding in query_embeddings
+            ]
         )
 
-        # response is a list of tuples: (score, points_list)
+        return [self._to_results(response.points) for response in responses]
+
+    def _embed_queries(self, queries: List[str]) -> List[np.ndarray]:
+        """
+        Query vectors through an LRU keyed on the normalized text; all cache
+        misses are embedded together in one FastEmbed pass.
+        (bge-small is an uncased model, so lowercasing doesn't change the vector.)
+        """
+        keys = [query.strip().lower() for query in queries]
+
+        # Hits are copied out while the lock is held: another thread's trim can
+        # evict them as soon as it is released
+        found: Dict[str, bytes] = {}
+        with self._query_cache_lock:
+            for key in dict.fromkeys(keys):
+                cached = self._query_cache.get(key)
+                if cached is not None:
+                    self._query_cache.move_to_end(key)
+                    found[key] = cached
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        self.cache_misses += len(missing)
+        self.cache_hits += len(keys) - len(missing)
+
+        if missing:
+            # Embedded outside the lock (the FastEmbed generator runs the model lazily)
+            computed = {
+                key: embedding.astype(np.float16).tobytes()
+                for key, embedding in zip(missing, self.embedding_agent.embedding_model.embed(missing))
+            }
+            found.update(computed)
+            with self._query_cache_lock:
+                for key, vector in computed.items():
+                    self._query_cache[key] = vector
+                    self._query_cache.move_to_end(key)
+                while len(self._query_cache) > QUERY_CACHE_SIZE:
+                    self._query_cache.popitem(last=False)
+
+        vectors = [np.frombuffer(found[key], dtype=np.float16).astype(np.float32) for key in keys]
+        return vectors
+
+    @staticmethod
+    def _to_results(points) -> List[Dict]:
         results: List[Dict] = []
 
-        for hit in response.points:
+        for hit in points:
             payload = hit.payload or {}
             results.append({
                 "product_name": payload.get("product_name"),
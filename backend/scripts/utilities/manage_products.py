@@ -49,7 +49,7 @@ def list_products(market=None, limit=10):
             print(f"  Brand: {prod['brand']}")
         if prod['promo']:
             print(f"  Promo: {prod['promo']}")
-        print(f"  Has image: {prod['image_blob'] is not None}")
+        print(f"  Has image: {prod['image_path'] is not None or prod['image_blob'] is not None}")
         print()
 
 def clear_market(market):
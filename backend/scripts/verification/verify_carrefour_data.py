@@ -40,7 +40,7 @@ def verify_carrefour_data():
         print(f"  Average: {sum(prices)/len(prices):.2f} TND")
     
     # Products with images
-    with_images = sum(1 for p in products if p.get('image_blob'))
+    with_images = sum(1 for p in products if p.get('image_path') or p.get('image_blob'))
     print(f"\nImages:")
     print(f"  Products with images: {with_images}/{len(products)} ({with_images/len(products)*100:.1f}%)")
     
@@ -67,7 +67,7 @@ def verify_carrefour_data():
     print("-"*70)
     
     for i, product in enumerate(products[:10], 1):
-        has_image = "✓" if product.get('image_blob') else "✗"
+        has_image = "✓" if product.get('image_path') or product.get('image_blob') else "✗"
         print(f"\n{i}. {product['name']}")
         print(f"   Price: {product['price']:.2f} TND")
         print(f"   Image: {has_image}")
@@ -2,7 +2,7 @@
 Service Alibaba - Scraping B2B
 """
 
-import httpx
+from services.http_client import get_http_client
 from typing import List, Optional
 from models import Product
 import uuid
@@ -63,121 +63,121 @@ class AlibabaService:
                 if self.debug:
                     print(f"   📄 Page {page}...")
                 
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    response = await client.get(self.scraperapi_url, params=params)
-                    
-                    if self.debug:
-                        print(f"   📡 Status: {response.status_code}")
-                    
-                    if response.status_code != 200:
-                        continue
-                    
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Trouver les conteneurs de produits Alibaba
-                    product_containers = soup.find_all("div", class_="search-card-info__wrapper")
-                    
-                    if self.debug:
-                        print(f"   🔍 {len(product_containers)} items trouvés sur page {page}")
-                    
-                    if not product_containers:
+                client = get_http_client()
+                response = await client.get(self.scraperapi_url, params=params)
+                
+                if self.debug:
+                    print(f"   📡 Status: {response.status_code}")
+                
+                if response.status_code != 200:
+                    continue
+                
+                soup = BeautifulSoup(response.text, 'html.parser')
+                
+                # Trouver les conteneurs de produits Alibaba
+                product_containers = soup.find_all("div", class_="search-card-info__wrapper")
+                
+                if self.debug:
+                    print(f"   🔍 {len(product_containers)} items trouvés sur page {page}")
+                
+                if not product_containers:
+                    break
+                
+                for container in product_containers:
+                    if len(products) >= max_results:
                         break
                     
-                    for container in product_containers:
-                        if len(products) >= max_results:
-                            break
+                    try:
+                        # Nom et URL du produit
+                        product_link = container.select_one(".search-card-e-title a")
+                        if not product_link:
+                            continue
                         
-                        try:
-                            # Nom et URL du produit
-                            product_link = container.select_one(".search-card-e-title a")
-                            if not product_link:
-                                continue
-                            
-                            product_name_span = product_link.select_one("span")
-                            product_name = product_name_span.get_text(strip=True) if product_name_span else product_link.get_text(strip=True)
-                            
-                            if not product_name or len(product_name) < 5:
-                                continue
-                            
-                            # URL du produit
-                            href = product_link.get("href", "")
-                            if href.startswith("//"):
-                                product_url = "https:" + href
-                            elif href.startswith("/"):
-                                product_url = "https://www.alibaba.com" + href
-                            else:
-                                product_url = href
-                            
-                            # Prix (plusieurs méthodes)
-                            price = 0.0
-                            price_element = container.select_one(".search-card-e-price-main")
-                            if price_element:
-                                price_text = price_element.get_text(" ", strip=True)
-                                price = self._clean_price(price_text)
-                            
-                            if price == 0.0:
-                                price_alt = container.select_one(".search-card-e-price")
-                                if price_alt:
-                                    price = self._clean_price(price_alt.get_text(" ", strip=True))
-                            
-                            # Description
-                            description = product_name
-                            description_element = container.select_one(".search-card-e-sell-point")
-                            if description_element:
-                                desc_text = description_element.get_text(" ", strip=True)
-                                if desc_text:
-                                    description = f"{product_name} - {desc_text[:100]}"
-                            
-                            # MOQ (Minimum Order Quantity)
-                            moq = None
-                            moq_element = container.select_one(".search-card-m-sale-features__item")
-                            if moq_element:
-                                moq = moq_element.get_text(" ", strip=True)
-                            
-                            # Rating
-                            rating = None
-                            rating_element = container.select_one(".search-card-e-review strong")
-                            if rating_element:
-                                try:
-                                    rating = float(rating_element.get_text(strip=True))
-                                except:
-                                    pass
+                        product_name_span = product_link.select_one("span")
+                        product_name = product_name_span.get_text(strip=True) if product_name_span else product_link.get_text(strip=True)
+                        
+                        if not product_name or len(product_name) < 5:
+                            continue
+                        
+                        # URL du produit
+                        href = product_link.get("href", "")
+                        if href.startswith("//"):
+                            product_url = "https:" + href
+                        elif href.startswith("/"):
+                            product_url = "https://www.alibaba.com" + href
+                        else:
+                            product_url = href
+                        
+                        # Prix (plusieurs méthodes)
+                        price = 0.0
+                        price_element = container.select_one(".search-card-e-price-main")
+                        if price_element:
+                            price_text = price_element.get_text(" ", strip=True)
+                            price = self._clean_price(price_text)
+                        
+                        if price == 0.0:
+                            price_alt = container.select_one(".search-card-e-price")
+                            if price_alt:
+                                price = self._clean_price(price_alt.get_text(" ", strip=True))
+                        
+                        # Description
+                        description = product_name
+                        description_element = container.select_one(".search-card-e-sell-point")
+                        if description_element:
+                            desc_text = description_element.get_text(" ", strip=True)
+                            if desc_text:
+                                description = f"{product_name} - {desc_text[:100]}"
+                        
+                        # MOQ (Minimum Order Quantity)
+                        moq = None
+                        moq_element = container.select_one(".search-card-m-sale-features__item")
+                        if moq_element:
+                            moq = moq_element.get_text(" ", strip=True)
+                        
+                        # Rating
+                        rating = None
+                        rating_element = container.select_one(".search-card-e-review strong")
+                        if rating_element:
+                            try:
+                                rating = float(rating_element.get_text(strip=True))
+                            except:
+                                pass
+                        
+                        # Image URL (méthodes multiples)
+                        image_url = self._extract_image(container)
+                        
+                        # Filtre qualité Alibaba (accepte sans prix - B2B)
+                        if len(product_name) > 10:
+                            product = Product(
+                                id=str(uuid.uuid4()),
+                                name=product_name,
+                                description=description,
+                                price=price,
+                                url=product_url,
+                                image_url=image_url,
+                                rating=rating,
+                                category="product",
+                                metadata={
+                                    "source": "alibaba",
+                                    "moq": moq,
+                                    "real_product": True,
+                                    "type": "B2B"
+                                }
+                            )
                             
-                            # Image URL (méthodes multiples)
-                            image_url = self._extract_image(container)
+                            products.append(product)
                             
-                            # Filtre qualité Alibaba (accepte sans prix - B2B)
-                            if len(product_name) > 10:
-                                product = Product(
-                                    id=str(uuid.uuid4()),
-                                    name=product_name,
-                                    description=description,
-                                    price=price,
-                                    url=product_url,
-                                    image_url=image_url,
-                                    rating=rating,
-                                    category="product",
-                                    metadata={
-                                        "source": "alibaba",
-                                        "moq": moq,
-                                        "real_product": True,
-                                        "type": "B2B"
-                                    }
-                                )
-                                
-                                products.append(product)
-                                
-                                if self.debug:
-                                    print(f"   ✅ [{len(products)}] {product_name[:50]}... - ${price:.2f}")
-                                    
-                        except Exception as e:
                             if self.debug:
-                                print(f"   ⚠️ Erreur item: {e}")
-                            continue
+                                print(f"   ✅ [{len(products)}] {product_name[:50]}... - ${price:.2f}")
+                                
+                    except Exception as e:
+                        if self.debug:
+                            print(f"   ⚠️ Erreur item: {e}")
+                        continue
+                
+                if len(products) >= max_results:
+                    break
                     
-                    if len(products) >= max_results:
-                        break
-                        
             except Exception as e:
                 if self.debug:
                     print(f"   ❌ Erreur page {page}: {repr(e)}")
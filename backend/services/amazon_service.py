@@ -2,7 +2,7 @@
 Service Amazon - Scraping B2C
 """
 
-import httpx
+from services.http_client import get_http_client
 from typing import List, Optional
 from models import Product
 import uuid
@@ -52,110 +52,110 @@ class AmazonService:
             if self.debug:
                 print(f"🛒 Amazon: Recherche '{search_query}'")
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(self.scraperapi_url, params=params)
-                
-                if self.debug:
-                    print(f"   📡 Status: {response.status_code}")
-                
-                if response.status_code != 200:
-                    return []
-                
-                soup = BeautifulSoup(response.text, 'html.parser')
-                products = []
-                
-                items = soup.find_all('div', {'data-asin': True})
-                items = [i for i in items if i.get('data-asin') and len(i.get('data-asin')) > 5]
-                
-                if self.debug:
-                    print(f"   🔍 {len(items)} items trouvés")
-                
-                for item in items[:max_results + 10]:
-                    try:
-                        asin = item.get('data-asin', '').strip()
-                        if not asin or len(asin) < 5:
-                            continue
-                        
-                        # Titre
-                        title_elem = item.find('h2')
-                        if not title_elem:
-                            continue
-                        title = title_elem.get_text(strip=True)
-                        
-                        if not title or len(title) < 5:
-                            continue
-                        
-                        # Prix
-                        price = 0.0
-                        price_whole = item.find('span', class_='a-price-whole')
-                        if price_whole:
-                            price = self._clean_price(price_whole.get_text())
-                        
-                        if price == 0.0:
-                            price_offscreen = item.find('span', class_='a-offscreen')
-                            if price_offscreen:
-                                price = self._clean_price(price_offscreen.get_text())
-                        
-                        if price == 0.0:
-                            price_span = item.find('span', class_='a-price')
-                            if price_span:
-                                price = self._clean_price(price_span.get_text())
+            client = get_http_client()
+            response = await client.get(self.scraperapi_url, params=params)
+            
+            if self.debug:
+                print(f"   📡 Status: {response.status_code}")
+            
+            if response.status_code != 200:
+                return []
+            
+            soup = BeautifulSoup(response.text, 'html.parser')
+            products = []
+            
+            items = soup.find_all('div', {'data-asin': True})
+            items = [i for i in items if i.get('data-asin') and len(i.get('data-asin')) > 5]
+            
+            if self.debug:
+                print(f"   🔍 {len(items)} items trouvés")
+            
+            for item in items[:max_results + 10]:
+                try:
+                    asin = item.get('data-asin', '').strip()
+                    if not asin or len(asin) < 5:
+                        continue
+                    
+                    # Titre
+                    title_elem = item.find('h2')
+                    if not title_elem:
+                        continue
+                    title = title_elem.get_text(strip=True)
+                    
+                    if not title or len(title) < 5:
+                        continue
+                    
+                    # Prix
+                    price = 0.0
+                    price_whole = item.find('span', class_='a-price-whole')
+                    if price_whole:
+                        price = self._clean_price(price_whole.get_text())
+                    
+                    if price == 0.0:
+                        price_offscreen = item.find('span', class_='a-offscreen')
+                        if price_offscreen:
+                            price = self._clean_price(price_offscreen.get_text())
+                    
+                    if price == 0.0:
+                        price_span = item.find('span', class_='a-price')
+                        if price_span:
+                            price = self._clean_price(price_span.get_text())
+                    
+                    # Image
+                    image_url = ""
+                    img_elem = item.find('img', class_='s-image')
+                    if img_elem:
+                        image_url = img_elem.get('src', '')
+                    
+                    # Rating
+                    rating = None
+                    rating_elem = item.find('span', class_='a-icon-alt')
+                    if rating_elem:
+                        rating_text = rating_elem.get_text()
+                        match = re.search(r'(\d+\.?\d*)', rating_text)
+                        if match:
+                            try:
+                                rating = float(match.group(1))
+                            except:
+                                pass
+                    
+                    # Filtre qualité Amazon (exige un prix)
+                    if price > 0 and len(title) > 10:
+                        product = Product(
+                            id=str(uuid.uuid4()),
+                            name=title,
+                            description=f"{title} - Amazon Product",
+                            price=price,
+                            url=f"https://www.amazon.com/dp/{asin}",
+                            image_url=image_url,
+                            rating=rating,
+                            category="product",
+                            metadata={
+                                "source": "amazon",
+                                "asin": asin,
+                                "real_product": True,
+                                "type": "B2C"
+                            }
+                        )
                         
-                        # Image
-                        image_url = ""
-                        img_elem = item.find('img', class_='s-image')
-                        if img_elem:
-                            image_url = img_elem.get('src', '')
+                        products.append(product)
                         
-                        # Rating
-                        rating = None
-                        rating_elem = item.find('span', class_='a-icon-alt')
-                        if rating_elem:
-                            rating_text = rating_elem.get_text()
-                            match = re.search(r'(\d+\.?\d*)', rating_text)
-                            if match:
-                                try:
-                                    rating = float(match.group(1))
-                                except:
-                                    pass
+                        if self.debug:
+                            print(f"   ✅ [{len(products)}] {title[:50]}... - ${price:.2f}")
                         
-                        # Filtre qualité Amazon (exige un prix)
-                        if price > 0 and len(title) > 10:
-                            product = Product(
-                                id=str(uuid.uuid4()),
-                                name=title,
-                                description=f"{title} - Amazon Product",
-                                price=price,
-                                url=f"https://www.amazon.com/dp/{asin}",
-                                image_url=image_url,
-                                rating=rating,
-                                category="product",
-                                metadata={
-                                    "source": "amazon",
-                                    "asin": asin,
-                                    "real_product": True,
-                                    "type": "B2C"
-                                }
-                            )
-                            
-                            products.append(product)
-                            
-                            if self.debug:
-                                print(f"   ✅ [{len(products)}] {title[:50]}... - ${price:.2f}")
+                        if len(products) >= max_results:
+                            break
                             
-                            if len(products) >= max_results:
-                                break
-                                
-                    except Exception as e:
-                        if self.debug:
-                            print(f"   ⚠️ Erreur item: {e}")
-                        continue
-                
-                if self.debug:
-                    print(f"🛒 Amazon: {len(products)} produits B2C")
-                
-                return products
-                
+                except Exception as e:
+                    if self.debug:
+                        print(f"   ⚠️ Erreur item: {e}")
+                    continue
+            
+            if self.debug:
+                print(f"🛒 Amazon: {len(products)} produits B2C")
+            
+            return products
+            
         except Exception as e:
             if self.debug:
                 print(f"❌ Erreur Amazon: {repr(e)}")
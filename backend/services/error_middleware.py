@@ -0,0 +1,51 @@
+"""
+Middleware d'erreurs partagé - Erreur 500 commune aux applications FastAPI
+"""
+
+import logging
+from typing import Optional
+from fastapi.responses import ORJSONResponse
+
+# Message renvoyé au client ; le détail de l'exception reste dans les logs
+INTERNAL_ERROR_DETAIL = "Internal server error"
+
+
+class InternalErrorMiddleware:
+    """
+    Convertit toute exception non gérée en 500 JSON générique
+
+    À enregistrer AVANT CORSMiddleware (add_middleware empile vers l'extérieur) :
+    la réponse repasse alors par CORS et garde Access-Control-Allow-Origin,
+    contrairement à un @app.exception_handler(Exception) qui s'exécute dans
+    ServerErrorMiddleware, hors de la pile CORS.
+    """
+
+    def __init__(self, app, logger: Optional[logging.Logger] = None):
+        self.app = app
+        self.logger = logger or logging.getLogger(__name__)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            self.logger.error(
+                f"❌ Erreur {scope['method']} {scope['path']}: {type(exc).__name__}: {exc}",
+                exc_info=exc
+            )
+            # Réponse déjà partiellement envoyée : impossible d'en renvoyer une autre
+            if response_started:
+                raise
+            response = ORJSONResponse(status_code=500, content={"detail": INTERNAL_ERROR_DETAIL})
+            await response(scope, receive, send)
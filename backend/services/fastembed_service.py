@@ -6,9 +6,14 @@ FastEmbed est optimisé pour Qdrant et offre de meilleures performances.
 """
 
 from fastembed import TextEmbedding
+from pathlib import Path
 from typing import List
 import numpy as np
 
+# Modèles ONNX FastEmbed (bge-small = variante quantifiée INT8) gardés sur disque :
+# chargés localement au démarrage au lieu d'être re-téléchargés dans /tmp
+FASTEMBED_CACHE_DIR = Path(__file__).resolve().parent.parent / "cache" / "fastembed"
+
 
 class FastEmbedService:
     """Service pour générer des embeddings avec FastEmbed"""
@@ -23,7 +28,7 @@ class FastEmbedService:
         - BAAI/bge-base-en-v1.5 (768 dim) - Plus précis
         """
         print(f"🧠 Initialisation FastEmbed: {model_name}")
-        self.model = TextEmbedding(model_name=model_name)
+        self.model = TextEmbedding(model_name=model_name, cache_dir=str(FASTEMBED_CACHE_DIR))
         self.model_name = model_name
         
         # Déterminer la dimension du modèle
@@ -55,7 +60,8 @@ class FastEmbedService:
         Returns:
             Liste de vecteurs d'embeddings
         """
-        embeddings = list(self.model.embed(texts))
+        # Toute la requête en un seul batch : un appel tokenizer + une passe ONNX
+        embeddings = list(self.model.embed(texts, batch_size=max(len(texts), 1)))
         return [emb.tolist() for emb in embeddings]
     
     def create_product_text(self, name: str, description: str, category: str = "") -> str:
@@ -0,0 +1,28 @@
+"""
+Client HTTP partagé - Pool de connexions commun aux scrapers
+"""
+
+import httpx
+from typing import Optional
+
+# Connexions TCP/TLS réutilisées entre requêtes et entre sources (Amazon, Alibaba...)
+HTTP_TIMEOUT_SECONDS = 30.0
+HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Retourne le client httpx partagé (créé au premier appel)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(timeout=HTTP_TIMEOUT_SECONDS, limits=HTTP_LIMITS)
+    return _client
+
+
+async def close_http_client():
+    """Ferme le client partagé (arrêt de l'application)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -67,14 +67,80 @@ class MarketplaceService:
         Returns:
             Produit ajouté avec son ID
         """
+        product = self._build_product(name, description, price, image_url, category, metadata)
+        self.products.append(product)
         
+        if self._save_products():
+            if self.debug:
+                print(f"✅ Produit ajouté: {name} (${price})")
+            return {
+                "success": True,
+                "product": product,
+                "message": "Produit ajouté avec succès"
+            }
+        else:
+            return {
+                "success": False,
+                "error": "Erreur lors de la sauvegarde"
+            }
+    
+    def add_products(self, items: List[Dict]) -> Dict:
+        """
+        Ajoute plusieurs produits en une fois (une seule écriture du fichier JSON)
+        
+        Args:
+            items: Dicts avec les mêmes champs que add_product
+        
+        Returns:
+            Produits ajoutés avec leurs IDs
+        """
+        new_products = [
+            self._build_product(
+                item["name"],
+                item["description"],
+                item["price"],
+                item["image_url"],
+                item.get("category", "general"),
+                item.get("metadata")
+            )
+            for item in items
+        ]
+        self.products.extend(new_products)
+        
+        if self._save_products():
+            if self.debug:
+                print(f"✅ {len(new_products)} produits ajoutés")
+            return {
+                "success": True,
+                "products": new_products,
+                "total": len(new_products),
+                "message": "Produits ajoutés avec succès"
+            }
+        else:
+            # Ne pas garder en mémoire ce qui n'a pas été sauvegardé
+            del self.products[len(self.products) - len(new_products):]
+            return {
+                "success": False,
+                "error": "Erreur lors de la sauvegarde"
+            }
+    
+    def _build_product(
+        self,
+        name: str,
+        description: str,
+        price: float,
+        image_url: str,
+        category: str = "general",
+        metadata: Dict = None
+    ) -> Dict:
+        """Construit l'entrée produit (coût, bénéfice, marge, compteurs)"""
         # Calculer le coût et le bénéfice
         original_price = metadata.get('original_price', price) if metadata else price
         cost = float(original_price)
         profit = float(price) - cost
         profit_margin = (profit / cost * 100) if cost > 0 else 0
         
-        product = {
+        return {
             "id": str(uuid.uuid4()),
             "name": name,
             "description": description,
@@ -91,22 +157,6 @@ class MarketplaceService:
             "clicks": 0,  # Tracking des clics
             "views": 0    # Tracking des vues
         }
-        
-        self.products.append(product)
-        
-        if self._save_products():
-            if self.debug:
-                print(f"✅ Produit ajouté: {name} (${price})")
-            return {
-                "success": True,
-                "product": product,
-                "message": "Produit ajouté avec succès"
-            }
-        else:
-            return {
-                "success": False,
-                "error": "Erreur lors de la sauvegarde"
-            }
     
     def get_all_products(self) -> List[Dict]:
         """Récupère tous les produits de la marketplace"""
@@ -4,7 +4,8 @@ Qdrant Memory Service - Recherche vectorielle TEMPORAIRE en mémoire
 ⚠️ IMPORTANT - CONFORMITÉ AUDIT:
 - Qdrant fonctionne en mode :memory: UNIQUEMENT
 - AUCUNE donnée n'est persistée sur disque
-- Les collections sont créées à la volée et SUPPRIMÉES après usage
+- Une collection partagée en RAM : les points de chaque recherche sont
+  marqués par un req_id et SUPPRIMÉS après usage
 - Les produits scrapés ne sont JAMAIS stockés de façon permanente
 
 Ce service est conçu pour être auditable et conforme aux exigences
@@ -15,13 +16,25 @@ from qdrant_client import QdrantClient
 from qdrant_client.models import (
     Distance, 
     VectorParams, 
-    PointStruct,
-    ScoredPoint
+    ScoredPoint,
+    Batch,
+    HnswConfigDiff,
+    Filter,
+    FieldCondition,
+    MatchValue,
+    Range,
+    FilterSelector
 )
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from uuid import uuid4
 import time
 
+# Collection longue durée réutilisée par toutes les recherches temps réel
+SHARED_COLLECTION_NAME = "realtime_tmp"
+# Champs techniques ajoutés au payload (retirés des résultats)
+REQUEST_ID_FIELD = "req_id"
+INSERTED_AT_FIELD = "inserted_at"
+
 
 class QdrantMemoryService:
     """
@@ -70,17 +83,35 @@ class QdrantMemoryService:
             collection_name=collection_name,
             vectors_config=VectorParams(
                 size=vector_size,
-                distance=Distance.COSINE  # Similarité cosinus
-            )
+                distance=Distance.COSINE,  # Similarité cosinus
+                on_disk=False
+            ),
+            # Index léger : la collection ne vit que le temps d'une recherche
+            hnsw_config=HnswConfigDiff(m=16, ef_construct=64)
         )
         
         print(f"✅ Collection '{collection_name}' créée en mémoire")
     
+    def ensure_shared_collection(self, vector_size: int) -> str:
+        """
+        Crée (une seule fois) la collection partagée des recherches temps réel
+        
+        ⚠️ AUDIT: Toujours en RAM ; seuls les points d'une recherche y vivent,
+        le temps de cette recherche.
+        
+        Returns:
+            Nom de la collection partagée
+        """
+        if not self.client.collection_exists(SHARED_COLLECTION_NAME):
+            self.create_temporary_collection(SHARED_COLLECTION_NAME, vector_size)
+        return SHARED_COLLECTION_NAME
+    
     def insert_products_temporary(
         self,
         collection_name: str,
         products: List[Dict[str, Any]],
-        embeddings: List[List[float]]
+        embeddings: List[List[float]],
+        request_id: Optional[str] = None
     ) -> int:
         """
         Insère des produits TEMPORAIREMENT dans Qdrant
@@ -92,6 +123,7 @@ class QdrantMemoryService:
             collection_name: Nom de la collection temporaire
             products: Liste des produits (métadonnées)
             embeddings: Vecteurs d'embeddings correspondants
+            request_id: Identifiant de la recherche (collection partagée)
             
         Returns:
             Nombre de produits insérés
@@ -99,31 +131,35 @@ class QdrantMemoryService:
         print(f"💾 Insertion TEMPORAIRE de {len(products)} produits dans Qdrant")
         print(f"   ⚠️ AUDIT: Données en RAM uniquement, seront supprimées")
         
-        points = []
-        for product, embedding in zip(products, embeddings):
-            point_id = str(uuid4())
-            
-            points.append(PointStruct(
-                id=point_id,
-                vector=embedding,
-                payload=product  # Métadonnées du produit
-            ))
+        payloads = list(products)  # Métadonnées des produits
+        if request_id:
+            inserted_at = time.time()
+            payloads = [
+                {**product, REQUEST_ID_FIELD: request_id, INSERTED_AT_FIELD: inserted_at}
+                for product in products
+            ]
         
-        # Insertion batch dans Qdrant (en mémoire)
+        # Insertion batch dans Qdrant (en mémoire), format colonnes :
+        # ids / vecteurs / payloads sans un PointStruct par produit
         self.client.upsert(
             collection_name=collection_name,
-            points=points
+            points=Batch(
+                ids=[str(uuid4()) for _ in products],
+                vectors=list(embeddings),
+                payloads=payloads
+            )
         )
         
-        print(f"✅ {len(points)} produits insérés en mémoire")
-        return len(points)
+        print(f"✅ {len(products)} produits insérés en mémoire")
+        return len(products)
     
     def search_similar_products(
         self,
         collection_name: str,
         query_embedding: List[float],
         limit: int = 10,
-        score_threshold: float = 0.0
+        score_threshold: float = 0.0,
+        request_id: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Recherche sémantique dans Qdrant (en mémoire)
@@ -136,6 +172,7 @@ class QdrantMemoryService:
             query_embedding: Vecteur de la requête utilisateur
             limit: Nombre maximum de résultats
             score_threshold: Score minimum de similarité
+            request_id: Limite la recherche aux points de cette recherche
             
         Returns:
             Liste des produits les plus similaires avec scores
@@ -144,6 +181,7 @@ class QdrantMemoryService:
         print(f"   Top-{limit} résultats, seuil: {score_threshold}")
         
         start_time = time.time()
+        query_filter = self._request_filter(request_id) if request_id else None
         
         # Recherche vectorielle avec Qdrant
         try:
@@ -151,6 +189,7 @@ class QdrantMemoryService:
             results = self.client.query_points(
                 collection_name=collection_name,
                 query=query_embedding,
+                query_filter=query_filter,
                 limit=limit,
                 score_threshold=score_threshold
             ).points
@@ -159,15 +198,10 @@ class QdrantMemoryService:
             results = self.client.search(
                 collection_name=collection_name,
                 query_vector=query_embedding,
+                query_filter=query_filter,
                 limit=limit,
                 score_threshold=score_threshold
             )
-        results = self.client.search(
-            collection_name=collection_name,
-            query_vector=query_embedding,
-            limit=limit,
-            score_threshold=score_threshold
-        )
         
         search_time = (time.time() - start_time) * 1000
         print(f"✅ Recherche terminée en {search_time:.2f}ms")
@@ -176,14 +210,60 @@ class QdrantMemoryService:
         # Formater les résultats
         formatted_results = []
         for result in results:
+            product = {
+                key: value for key, value in result.payload.items()
+                if key not in (REQUEST_ID_FIELD, INSERTED_AT_FIELD)
+            }
             formatted_results.append({
                 "id": result.id,
                 "score": result.score,
-                "product": result.payload
+                "product": product
             })
         
         return formatted_results
     
+    def delete_request_points(
+        self,
+        collection_name: str,
+        request_id: str,
+        stale_after_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Supprime les points d'une recherche de la collection partagée
+        
+        ⚠️ AUDIT: Nettoyage explicite des données éphémères. Avec
+        stale_after_seconds, supprime aussi les points plus anciens
+        (recherches interrompues avant leur nettoyage).
+        
+        Args:
+            collection_name: Nom de la collection partagée
+            request_id: Identifiant de la recherche
+            stale_after_seconds: Âge max des points laissés par d'autres recherches
+        """
+        try:
+            self.client.delete(
+                collection_name=collection_name,
+                points_selector=FilterSelector(filter=self._request_filter(request_id))
+            )
+            if stale_after_seconds is not None:
+                self.client.delete(
+                    collection_name=collection_name,
+                    points_selector=FilterSelector(filter=Filter(must=[
+                        FieldCondition(
+                            key=INSERTED_AT_FIELD,
+                            range=Range(lt=time.time() - stale_after_seconds)
+                        )
+                    ]))
+                )
+            print(f"✅ Points de la recherche '{request_id}' supprimés de la mémoire")
+        except Exception as e:
+            print(f"⚠️ Erreur lors de la suppression: {e}")
+    
+    @staticmethod
+    def _request_filter(request_id: str) -> Filter:
+        """Filtre sur les points d'une recherche"""
+        return Filter(must=[FieldCondition(key=REQUEST_ID_FIELD, match=MatchValue(value=request_id))])
+    
     def delete_temporary_collection(self, collection_name: str) -> None:
         """
         Supprime la collection temporaire de la mémoire
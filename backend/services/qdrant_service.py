@@ -1,10 +1,24 @@
-from qdrant_client import QdrantClient
+from qdrant_client import QdrantClient, AsyncQdrantClient
 from qdrant_client.models import Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue, QueryRequest
+from qdrant_client.models import ScalarQuantization, ScalarQuantizationConfig, ScalarType, SearchParams, QuantizationSearchParams
 from typing import List, Optional, Dict, Any
 from uuid import uuid4
 from models import Product
 from config import get_settings
 
+# gRPC transport with a connection pool sized for concurrent FastAPI requests
+QDRANT_CLIENT_OPTIONS = dict(
+    prefer_grpc=True,
+    grpc_port=6334,
+    pool_size=64,
+    timeout=30
+)
+
+# Recherche sur les vecteurs int8 en RAM, puis re-score des meilleurs candidats en float32
+QUANTIZED_SEARCH_PARAMS = SearchParams(
+    quantization=QuantizationSearchParams(rescore=True, oversampling=2.0)
+)
+
 
 class QdrantService:
     """Service pour interagir avec Qdrant Cloud"""
@@ -13,7 +27,14 @@ class QdrantService:
         settings = get_settings()
         self.client = QdrantClient(
             url=settings.qdrant_url,
-            api_key=settings.qdrant_api_key
+            api_key=settings.qdrant_api_key,
+            **QDRANT_CLIENT_OPTIONS
+        )
+        # Async twin for async endpoints (e.g. /api/stats), same transport settings
+        self.async_client = AsyncQdrantClient(
+            url=settings.qdrant_url,
+            api_key=settings.qdrant_api_key,
+            **QDRANT_CLIENT_OPTIONS
         )
         self.collection_name = settings.qdrant_collection_b2bpremium
         self.vector_size = settings.embedding_dimension
@@ -28,10 +49,19 @@ class QdrantService:
                 collection_name=self.collection_name,
                 vectors_config=VectorParams(
                     size=self.vector_size,
-                    distance=Distance.COSINE
+                    distance=Distance.COSINE,
+                    on_disk=True
+                ),
+                # Copie int8 des vecteurs en RAM (4x plus petite), originaux sur disque
+                quantization_config=ScalarQuantization(
+                    scalar=ScalarQuantizationConfig(
+                        type=ScalarType.INT8,
+                        quantile=0.99,
+                        always_ram=True
+                    )
                 )
             )
-            print(f"✅ Collection '{self.collection_name}' créée")
+            print(f"✅ Collection '{self.collection_name}' créée (int8)")
         else:
             print(f"✅ Collection '{self.collection_name}' existe déjà")
     
@@ -122,7 +152,8 @@ class QdrantService:
                 collection_name=self.collection_name,
                 query=query_embedding,
                 limit=limit,
-                score_threshold=score_threshold
+                score_threshold=score_threshold,
+                search_params=QUANTIZED_SEARCH_PARAMS
             )
             
             return [
@@ -140,7 +171,8 @@ class QdrantService:
                     collection_name=self.collection_name,
                     query_vector=query_embedding,
                     limit=limit,
-                    score_threshold=score_threshold
+                    score_threshold=score_threshold,
+                    search_params=QUANTIZED_SEARCH_PARAMS
                 )
                 
                 return [
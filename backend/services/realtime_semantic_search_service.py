@@ -6,12 +6,12 @@ Real-Time Semantic Search Service - Pipeline Complet
 2. Embeddings avec FastEmbed (Qdrant-compatible)
 3. Qdrant en mode :memory: (éphémère)
 4. Recherche sémantique vectorielle
-5. Nettoyage explicite (suppression collection)
+5. Nettoyage explicite (suppression des points de la recherche)
 
 GARANTIES:
 - AUCUNE persistance disque
 - Données 100% temporaires (RAM uniquement)
-- Collections supprimées après chaque recherche
+- Points de chaque recherche isolés (req_id) et supprimés après usage
 - Produits scrapés jamais stockés de façon permanente
 """
 
@@ -34,9 +34,12 @@ class RealtimeSemanticSearchService:
     - Qdrant utilisé en mode :memory: uniquement
     - FastEmbed pour les embeddings
     - Aucune persistance des données scrapées
-    - Collections temporaires supprimées après usage
+    - Points temporaires supprimés après usage
     """
     
+    # Âge au-delà duquel des points oubliés (recherche interrompue) sont purgés
+    STALE_POINTS_SECONDS = 300
+    
     def __init__(self):
         """Initialise les services nécessaires"""
         print("🚀 Initialisation du pipeline de recherche sémantique")
@@ -48,6 +51,11 @@ class RealtimeSemanticSearchService:
         # Service Qdrant en mémoire (éphémère)
         self.qdrant_service = QdrantMemoryService()
         
+        # Collection partagée créée une seule fois (pas de create/drop par requête)
+        self.collection_name = self.qdrant_service.ensure_shared_collection(
+            self.fastembed_service.get_dimension()
+        )
+        
         # Service de scraping temps réel
         self.scraper_service = ProductScraperService()
         
@@ -74,10 +82,10 @@ class RealtimeSemanticSearchService:
         ÉTAPES:
         1. Scraping temps réel (données fraîches)
         2. Génération embeddings (FastEmbed)
-        3. Création collection temporaire (Qdrant :memory:)
+        3. Identifiant de recherche dans la collection partagée (Qdrant :memory:)
         4. Insertion temporaire dans Qdrant
-        5. Recherche sémantique vectorielle
-        6. Suppression collection (nettoyage)
+        5. Recherche sémantique vectorielle (filtrée sur la recherche)
+        6. Suppression des points (nettoyage)
         
         Args:
             user_query: Requête utilisateur
@@ -92,13 +100,14 @@ class RealtimeSemanticSearchService:
             Résultats de recherche avec scores de similarité
         """
         pipeline_start = time.time()
-        collection_name = f"temp_search_{uuid4().hex[:8]}"
+        collection_name = self.collection_name
+        request_id = uuid4().hex
         
         print("=" * 60)
         print("🔍 PIPELINE DE RECHERCHE SÉMANTIQUE EN TEMPS RÉEL")
         print("=" * 60)
         print(f"📝 Requête: '{user_query}'")
-        print(f"🗄️ Collection temporaire: '{collection_name}'")
+        print(f"🗄️ Collection partagée: '{collection_name}' (req_id {request_id})")
         print(f"⚠️ AUDIT: Données éphémères, seront supprimées")
         print()
         
@@ -180,13 +189,11 @@ class RealtimeSemanticSearchService:
             
             embedding_start = time.time()
             
-            # Embeddings des produits (batch)
-            product_embeddings = self.fastembed_service.generate_embeddings_batch(
-                product_texts
+            # Embeddings des produits + de la requête en un seul batch FastEmbed
+            embeddings = self.fastembed_service.generate_embeddings_batch(
+                product_texts + [user_query]
             )
-            
-            # Embedding de la requête
-            query_embedding = self.fastembed_service.generate_embedding(user_query)
+            product_embeddings, query_embedding = embeddings[:-1], embeddings[-1]
             
             embedding_time = time.time() - embedding_start
             
@@ -197,16 +204,12 @@ class RealtimeSemanticSearchService:
             print()
             
             # ============================================================
-            # ÉTAPE 4: CRÉATION COLLECTION TEMPORAIRE (Qdrant)
-            # ⚠️ AUDIT: Collection en :memory: uniquement
+            # ÉTAPE 4: COLLECTION PARTAGÉE (Qdrant)
+            # ⚠️ AUDIT: Collection en :memory: uniquement, points isolés par req_id
             # ============================================================
-            print("🗄️ ÉTAPE 4/6: Création collection temporaire (Qdrant)")
+            print("🗄️ ÉTAPE 4/6: Collection partagée (Qdrant)")
             print("-" * 60)
-            
-            self.qdrant_service.create_temporary_collection(
-                collection_name=collection_name,
-                vector_size=len(query_embedding)
-            )
+            print(f"✅ '{collection_name}' réutilisée, points marqués req_id={request_id}")
             print()
             
             # ============================================================
@@ -221,7 +224,8 @@ class RealtimeSemanticSearchService:
             inserted_count = self.qdrant_service.insert_products_temporary(
                 collection_name=collection_name,
                 products=normalized_products,
-                embeddings=product_embeddings
+                embeddings=product_embeddings,
+                request_id=request_id
             )
             
             insert_time = time.time() - insert_start
@@ -241,19 +245,26 @@ class RealtimeSemanticSearchService:
                 collection_name=collection_name,
                 query_embedding=query_embedding,
                 limit=len(normalized_products),  # Tous les produits
-                score_threshold=0.0
+                score_threshold=0.0,
+                request_id=request_id
             )
             
             print()
             
             # ============================================================
-            # NETTOYAGE: SUPPRESSION COLLECTION TEMPORAIRE
-            # ⚠️ AUDIT: Nettoyage explicite des données éphémères
+            # NETTOYAGE: SUPPRESSION DES POINTS DE LA RECHERCHE
+            # ⚠️ AUDIT: Nettoyage explicite des données éphémères, planifié
+            # juste après cette coroutine (hors du temps de réponse)
             # ============================================================
-            print("🗑️ NETTOYAGE: Suppression collection temporaire")
+            print("🗑️ NETTOYAGE: Suppression des points de la recherche (planifiée)")
             print("-" * 60)
             
-            self.qdrant_service.delete_temporary_collection(collection_name)
+            asyncio.get_running_loop().call_soon(
+                self.qdrant_service.delete_request_points,
+                collection_name,
+                request_id,
+                self.STALE_POINTS_SECONDS
+            )
             print()
             
             # ============================================================
@@ -267,7 +278,7 @@ class RealtimeSemanticSearchService:
             print(f"⏱️ Temps total: {pipeline_time:.2f}s")
             print(f"📊 Produits scrapés: {len(products)}")
             print(f"🎯 Résultats retournés: {len(search_results)}")
-            print(f"⚠️ AUDIT: Toutes les données temporaires ont été supprimées")
+            print(f"⚠️ AUDIT: Données temporaires supprimées dès la fin de la requête")
             print("=" * 60)
             print()
             
@@ -313,9 +324,10 @@ class RealtimeSemanticSearchService:
                 },
                 "audit_info": {
                     "qdrant_mode": "memory",
-                    "collection_deleted": True,
+                    "points_deleted": True,
                     "data_persisted": False,
-                    "temporary_collection_name": collection_name
+                    "temporary_collection_name": collection_name,
+                    "request_id": request_id
                 }
             }
             
@@ -323,10 +335,6 @@ class RealtimeSemanticSearchService:
             print(f"❌ ERREUR dans le pipeline: {e}")
             
             # Nettoyage en cas d'erreur
-            try:
-                self.qdrant_service.delete_temporary_collection(collection_name)
-                print(f"✅ Collection temporaire nettoyée après erreur")
-            except:
-                pass
+            self.qdrant_service.delete_request_points(collection_name, request_id)
             
             raise e
@@ -126,7 +126,9 @@ class RecommendationService:
             )
             for p in products
         ]
-        product_embeddings = self.embedding_service.generate_embeddings_batch(product_texts)
+        # La requête est encodée dans le même batch que les produits
+        embeddings = self.embedding_service.generate_embeddings_batch(product_texts + [search_query.query])
+        product_embeddings, query_embedding = embeddings[:-1], embeddings[-1]
         print(f"✅ {len(product_embeddings)} embeddings générés")
         print(f"📏 Dimension des vecteurs: {len(product_embeddings[0])}D")
         print(f"⚠️ AUDIT: FastEmbed utilisé (pas de Hugging Face)")
@@ -137,9 +139,7 @@ class RecommendationService:
         print(f"🔍 ÉTAPE 4/7: EMBEDDING DE LA REQUÊTE")
         print(f"{'='*70}")
         print(f"📝 Requête: '{search_query.query}'")
-        print(f"⏳ Génération de l'embedding...")
-        query_embedding = self.embedding_service.generate_embedding(search_query.query)
-        print(f"✅ Embedding de la requête généré ({len(query_embedding)}D)")
+        print(f"✅ Embedding de la requête généré avec les produits ({len(query_embedding)}D)")
         print(f"{'='*70}\n")
         
         # 5. Calculer la similarité directement 